@@ -0,0 +1,125 @@
+from functools import wraps
+from math import ceil
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import exception_handler
+from user_auth_app.authentication import CachedTokenAuthentication
+from base.api.renderers import dumps
+
+def json_response(data, status=status.HTTP_200_OK):
+    """
+    Renders `data` like the JSON renderer of the DRF views, so async views produce the same bytes.
+    """
+    return HttpResponse(dumps(data), status=status, content_type="application/json")
+
+
+async def authenticate(request):
+    """
+    Authenticates a plain Django request with the token authentication of the DRF views and sets
+    `request.user` and `request.auth`. Cache misses query the database, so the lookup runs in a worker thread.
+    Raises `NotAuthenticated` without credentials and `AuthenticationFailed` for invalid ones.
+    """
+    result = await sync_to_async(CachedTokenAuthentication().authenticate)(request)
+    if result is None:
+        raise exceptions.NotAuthenticated()
+    request.user, request.auth = result
+
+
+@sync_to_async
+def filter_queryset(view_class, request, **kwargs):
+    """
+    Builds the filtered queryset of a DRF list view for a plain Django request, so the async views accept
+    exactly the same query parameters. Filtering is lazy; no query is executed here.
+    Returns the DRF request and the queryset. Invalid filter values raise `ValidationError`.
+    """
+    drf_request = Request(request)
+    view = view_class(request=drf_request, args=(), kwargs=kwargs, format_kwarg=None)
+    return drf_request, view.filter_queryset(view.get_queryset())
+
+
+class AsyncPage:
+    def __init__(self, objects, get_data):
+        self.objects = objects
+        self.get_data = get_data
+
+
+async def paginate(paginator, queryset, request):
+    """
+    Async counterpart of `HybridPagination.paginate_queryset`. Page numbers are counted with `acount()` and the
+    page is fetched with async iteration; keyset pages are delegated to the sync paginator in a worker thread.
+    Returns None if the request is not paginated, otherwise an `AsyncPage` whose `get_data(results)` wraps the
+    serialized results like `get_paginated_response`.
+    """
+    if not paginator.paginate_by_default and not paginator.is_pagination_requested(request):
+        return None
+
+    if paginator.is_cursor_request(request):
+        objects = await sync_to_async(paginator.paginate_queryset)(queryset, request)
+        return AsyncPage(objects, lambda results: paginator.get_paginated_response(results).data)
+
+    page_size = paginator.get_page_size(request)
+    if not page_size:
+        return None
+
+    count = await queryset.acount()
+    num_pages = max(1, ceil(count / page_size))
+    page_number = request.query_params.get(paginator.page_query_param) or 1
+    if page_number in paginator.last_page_strings:
+        page_number = num_pages
+    try:
+        page_number = int(page_number)
+    except (TypeError, ValueError):
+        page_number = 0
+    if not 1 <= page_number <= num_pages:
+        raise exceptions.NotFound(paginator.invalid_page_message)
+
+    offset = (page_number - 1) * page_size
+    objects = [obj async for obj in queryset[offset : offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_link = None
+    if page_number < num_pages:
+        next_link = replace_query_param(url, paginator.page_query_param, page_number + 1)
+    previous_link = None
+    if page_number == 2:
+        previous_link = remove_query_param(url, paginator.page_query_param)
+    elif page_number > 2:
+        previous_link = replace_query_param(url, paginator.page_query_param, page_number - 1)
+
+    def get_data(results):
+        return {
+            "count": count,
+            "next": next_link,
+            "previous": previous_link,
+            "results": results,
+        }
+
+    return AsyncPage(objects, get_data)
+
+
+def api_errors(view):
+    """
+    Turns API exceptions and `Http404` raised inside an async view into the same JSON error responses
+    DRF's exception handler produces for the sync views.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        except Exception as exc:
+            if isinstance(exc, (exceptions.AuthenticationFailed, exceptions.NotAuthenticated)):
+                exc.auth_header = CachedTokenAuthentication().authenticate_header(request)
+            handled = exception_handler(exc, {"request": request})
+            if handled is None:
+                raise
+            response = json_response(handled.data, status=handled.status_code)
+            for header in ("WWW-Authenticate", "Retry-After"):
+                if header in handled:
+                    response[header] = handled[header]
+            return response
+
+    return wrapper
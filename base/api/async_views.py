@@ -0,0 +1,13 @@
+from asgiref.sync import sync_to_async
+from django.views.decorators.http import require_GET
+from base.counters import get_base_info
+from base.api.async_support import json_response
+
+
+@require_GET
+async def base_info(request):
+    """
+    Async variant of `GET /base-info/`. The counters come from the cache; rebuilding them after a cache miss
+    queries the database and runs in a worker thread.
+    """
+    return json_response(await sync_to_async(get_base_info)())
@@ -0,0 +1,77 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified handling to GET requests of generic views.
+    The validators come from one aggregate query over the (filtered) queryset: the number of rows and
+    the latest value of each of the `last_modified_fields`. When the client's validators still match,
+    a 304 is returned without loading or serializing any objects.
+    Lists only get an ETag: the latest modification time of the remaining rows does not change when a row
+    is deleted or leaves the filter, so `If-Modified-Since` alone could answer 304 for a changed list.
+    Views whose representation also depends on state without a timestamp column add it to the ETag via
+    `get_etag_state()`.
+    """
+
+    last_modified_fields = ("updated_at",)
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def is_detail_request(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return lookup_url_kwarg in self.kwargs
+
+    def get_etag_state(self):
+        """
+        Returns additional values the ETag depends on, e.g. a cache generation.
+        """
+        return ()
+
+    def get_validators(self, request):
+        """
+        Returns the ETag and the last modification time of the current GET request; the latter is None
+        for lists.
+        """
+        state = self.get_conditional_queryset().order_by().aggregate(
+            count=Count("pk"),
+            **{
+                f"last_modified_{index}": Max(field)
+                for index, field in enumerate(self.last_modified_fields)
+            },
+        )
+        timestamps = [state[f"last_modified_{index}"] for index in range(len(self.last_modified_fields))]
+        extra_state = [str(value) for value in self.get_etag_state()]
+        last_modified = max(filter(None, timestamps), default=None) if self.is_detail_request() else None
+        fingerprint = "|".join(
+            [
+                request.get_full_path(),
+                getattr(request, "accepted_media_type", "") or "",
+                str(state["count"]),
+                *(timestamp.isoformat() if timestamp else "" for timestamp in timestamps),
+                *extra_state,
+            ]
+        )
+        etag = quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+        return etag, last_modified
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
@@ -0,0 +1,162 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+READ_METHODS = ("GET", "HEAD")
+
+
+def parse_names(value):
+    return {name for name in (part.strip() for part in value.split(",")) if name}
+
+
+def get_requested_fields(request):
+    """
+    Returns the names from `?fields=` (None if the parameter is missing or empty) and from `?expand=`.
+    """
+    params = getattr(request, "query_params", request.GET)
+    return parse_names(params.get(FIELDS_PARAM, "")) or None, parse_names(params.get(EXPAND_PARAM, ""))
+
+
+def cursor_columns(pagination_class, ordering_fields=()):
+    """
+    The model fields the keyset pagination reads from each row of a page, whichever ordering is chosen.
+    """
+    columns = [field.lstrip("-") for field in getattr(pagination_class, "cursor_ordering", ())]
+    return list(dict.fromkeys([*columns, *ordering_fields, "id"]))
+
+
+def get_ordering_fields(view):
+    ordering_fields = getattr(view, "ordering_fields", None)
+    return ordering_fields if isinstance(ordering_fields, (list, tuple)) else ()
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets on GET requests:
+    - `?fields=id,title` returns only the listed top-level fields,
+    - the nested `expandable_fields` are left out as soon as `fields` is given, unless they are listed in
+      `fields` or `?expand=` (e.g. `?fields=id,title&expand=details`).
+    Without `fields` all fields are returned as before. Unknown names are rejected with 400.
+    Writes and serializers nested in another serializer always use all fields.
+    `method_columns` lists the model fields each `SerializerMethodField` reads, so `sparse_queryset` and
+    `ValuesSerializer` can load just those columns.
+    """
+
+    expandable_fields = ()
+    method_columns = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        root = self.parent if isinstance(self.parent, serializers.ListSerializer) else self
+        if request is None or request.method not in READ_METHODS or root.parent is not None:
+            return fields
+
+        requested, expand = get_requested_fields(request)
+        errors = {}
+        if requested and requested - set(fields):
+            errors[FIELDS_PARAM] = [f"Unbekannte Felder: {', '.join(sorted(requested - set(fields)))}."]
+        if expand - set(self.expandable_fields):
+            errors[EXPAND_PARAM] = [
+                f"Nicht einbettbar: {', '.join(sorted(expand - set(self.expandable_fields)))}. "
+                f"Möglich sind: {', '.join(self.expandable_fields) or '-'}."
+            ]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        if requested is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in requested | expand}
+
+
+def model_path(model, attrs):
+    """
+    Translates a field source (`["user", "pk"]`) into an ORM path (`"user__id"`), or returns None if it
+    does not consist of model fields only.
+    """
+    path = []
+    for attr in attrs:
+        if model is None:
+            return None
+        try:
+            field = model._meta.pk if attr == "pk" else model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        path.append(field.name)
+        model = field.related_model
+    return "__".join(path)
+
+
+def serializer_paths(serializer, model, prefix=()):
+    """
+    Returns the ORM paths the fields of `serializer` read and the sources of its `many=True` relations,
+    or None if a field cannot be traced to model fields.
+    """
+    method_columns = getattr(serializer, "method_columns", {})
+    paths, relations = [], []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            relations.append(field.source)
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in method_columns:
+                return None
+            sources = [(*prefix, *column.split("__")) for column in method_columns[name]]
+        elif isinstance(field, serializers.BaseSerializer):
+            nested = serializer_paths(field, model, (*prefix, *field.source_attrs))
+            if nested is None or nested[1]:
+                return None
+            sources = [path.split("__") for path in nested[0]]
+            sources.append((*prefix, *field.source_attrs))
+        else:
+            sources = [(*prefix, *field.source_attrs)]
+        for source in sources:
+            path = model_path(model, source)
+            if path is None:
+                return None
+            paths.append(path)
+    return paths, relations
+
+
+def sparse_queryset(queryset, serializer, extra_fields=()):
+    """
+    Restricts `queryset` to what the (sparse) fields of `serializer` read: `.only()` on the needed columns,
+    `select_related` on the relations they traverse, and no prefetch for relations that are not returned.
+    `extra_fields` are loaded as well (e.g. the ordering columns of the pagination).
+    The queryset is returned unchanged if a field cannot be traced to model fields.
+    """
+    result = serializer_paths(serializer, queryset.model)
+    if result is None:
+        return queryset
+    paths, relations = result
+    extra_paths = (model_path(queryset.model, field.split("__")) for field in extra_fields)
+    paths += [path for path in extra_paths if path]
+
+    joins = {path.rsplit("__", 1)[0] for path in paths if "__" in path}
+    prefetches = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if getattr(lookup, "prefetch_to", lookup).split("__")[0] in relations
+    ]
+    queryset = queryset.select_related(None).prefetch_related(None).prefetch_related(*prefetches)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    return queryset.only(*paths)
+
+
+class SparseQuerysetMixin:
+    """
+    Generic-view mixin that passes the queryset of GET requests with `?fields=` through `sparse_queryset`,
+    so unrequested fields cost neither serialization nor database work. The ordering columns of the
+    pagination are always loaded.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in READ_METHODS or get_requested_fields(self.request)[0] is None:
+            return queryset
+        extra_fields = cursor_columns(self.pagination_class, get_ordering_fields(self))
+        return sparse_queryset(queryset, self.get_serializer(), extra_fields)
@@ -0,0 +1,181 @@
+from base64 import b64decode, b64encode
+from functools import reduce
+from operator import or_
+from urllib import parse
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination: the cursor holds the values of all ordering columns of the last row of a page,
+    and the next page is fetched with `(col < value) OR (col = value AND id < last_id)`, the comparisons
+    flipped for ascending columns. Deep pages cost the same as the first one, and rows sharing a sort value
+    are neither repeated nor skipped, however many there are. An ordering chosen through the view's ordering
+    filter is honoured; `id` is appended as the final tie-breaker. The ordering columns must not be NULL.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering += ("-id" if ordering[0].startswith("-") else "id",)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        reverse, position = self.decode_cursor(request) or (False, None)
+
+        # Previous pages are read backwards from the first row of the current page.
+        ordering = [flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(seek(ordering, position))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        self.has_next = bool(self.page) and (position is not None if reverse else has_more)
+        self.has_previous = bool(self.page) and (has_more if reverse else position is not None)
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor((False, self.get_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor((True, self.get_position(self.page[0])))
+
+    def get_position(self, row):
+        fields = [field.lstrip("-") for field in self.ordering]
+        if isinstance(row, dict):
+            return [str(row[field]) for field in fields]
+        return [str(getattr(row, field)) for field in fields]
+
+    def decode_cursor(self, request):
+        """
+        Returns `(reverse, position)` of the request's cursor, or None without a cursor.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode("ascii")).decode("ascii"), keep_blank_values=True)
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+            position = tokens["p"]
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def encode_cursor(self, cursor):
+        reverse, position = cursor
+        tokens = {"p": position}
+        if reverse:
+            tokens["r"] = "1"
+        encoded = b64encode(parse.urlencode(tokens, doseq=True).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+def flip(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def seek(ordering, position):
+    """
+    Matches the rows that follow `position` in `ordering`:
+    `(a > x) OR (a = x AND b > y) OR …`, with `<` for descending columns.
+    """
+    conditions = []
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        conditions.append(equal & Q(**{f"{name}__{lookup}": value}))
+        equal &= Q(**{name: value})
+    return reduce(or_, conditions)
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset pagination when the client sends a `cursor`
+    parameter or `?pagination=cursor`. Existing clients keep using page numbers.
+    With `paginate_by_default = False` the results are only paginated when one of the pagination
+    parameters is present, which keeps plain list responses for clients that never asked for pages.
+    """
+
+    page_size = 6
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    pagination_query_param = "pagination"
+    cursor_query_param = "cursor"
+    cursor_ordering = ("-updated_at", "-id")
+    paginate_by_default = True
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def is_cursor_request(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.pagination_query_param) == "cursor"
+        )
+
+    def is_pagination_requested(self, request):
+        params = request.query_params
+        return (
+            self.page_query_param in params
+            or self.page_size_query_param in params
+            or self.pagination_query_param in params
+            or self.cursor_query_param in params
+        )
+
+    def get_cursor_paginator(self):
+        paginator = KeysetPagination()
+        paginator.page_size = self.page_size
+        paginator.page_size_query_param = self.page_size_query_param
+        paginator.max_page_size = self.max_page_size
+        paginator.cursor_query_param = self.cursor_query_param
+        paginator.ordering = self.cursor_ordering
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.paginate_by_default and not self.is_pagination_requested(request):
+            return None
+
+        if self.is_cursor_request(request):
+            self.cursor_paginator = self.get_cursor_paginator()
+            page = self.cursor_paginator.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.cursor_paginator.display_page_controls
+            return page
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
@@ -0,0 +1,22 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from base.api.renderers import orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    Drop-in replacement for DRF's `JSONParser` that decodes with orjson. Like DRF in strict mode, NaN and
+    Infinity are rejected. Request bodies in encodings other than UTF-8, and all bodies when orjson is not
+    installed, are parsed by DRF's implementation.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,49 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Datetimes in UTC end with "Z" like in DRF's encoder; dicts with int keys (e.g. stats per user ID) are allowed.
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+# Types orjson does not know (Decimal, lazy translations, timedelta, querysets, ...) go through DRF's encoder.
+default = JSONEncoder().default
+
+
+def dumps(data):
+    """
+    Encodes `data` to compact UTF-8 JSON bytes like DRF's `JSONRenderer` with its default settings. The output
+    is identical except for floats in exponent notation (`1e16` instead of `1e+16`, same value).
+    Uses orjson when it is installed and the standard library otherwise.
+    """
+    if orjson is None:
+        return JSONRenderer().render(data)
+    content = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+    # Like DRF, escape the line and paragraph separators that are not valid in JavaScript strings.
+    if b"\xe2\x80" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's `JSONRenderer` that encodes with orjson. Indented output (e.g. in the
+    browsable API) and non-default `COMPACT_JSON`/`UNICODE_JSON` settings use DRF's implementation,
+    as does everything when orjson is not installed.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or self.get_indent(accepted_media_type or "", renderer_context or {})
+            or not api_settings.COMPACT_JSON
+            or not api_settings.UNICODE_JSON
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,26 @@
+from rest_framework.response import Response
+from base.metrics import measure_serialize
+
+
+class SerializeTimingMixin:
+    """
+    Generic view mixin that reports the time spent building the response data of list and retrieve GETs
+    as `serialize` in the request metrics (see `base.metrics.RequestMetrics`). Lazy queries made while
+    serializing count towards both `serialize` and `db`.
+    """
+
+    def get_serialized_data(self, *args, **kwargs):
+        serializer = self.get_serializer(*args, **kwargs)
+        with measure_serialize():
+            return serializer.data
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serialized_data(page, many=True))
+        return Response(self.get_serialized_data(queryset, many=True))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_serialized_data(self.get_object()))
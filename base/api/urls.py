@@ -1,6 +1,9 @@
 from django.urls import path
-from .views import BaseInfoView
+from .views import BaseInfoView, RequestMetricsView
+from . import async_views
 
 urlpatterns = [
     path("base-info/", BaseInfoView.as_view(), name="base-info"),
+    path("async/base-info/", async_views.base_info, name="async-base-info"),
+    path("request-metrics/", RequestMetricsView.as_view(), name="request-metrics"),
 ]
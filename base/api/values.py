@@ -0,0 +1,165 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject, RelatedField
+from rest_framework.response import Response
+from base.api.fields import cursor_columns, get_ordering_fields
+from base.metrics import measure_serialize
+
+
+class Row(dict):
+    """
+    A `.values()` row with attribute access, passed to the methods of `SerializerMethodField`s.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class ValuesSerializer:
+    """
+    Read-only counterpart of `serializer_class` for list GETs. It reads `.values()` rows instead of model
+    instances and builds the same representation with the serializer's own fields:
+    - model fields and fields with a dotted `source` (e.g. `user.first_name`) become columns and are
+      rendered with the field's `to_representation`; files are wrapped in a `FieldFile`, related keys
+      in a `PKOnlyObject`,
+    - nested serializers on a foreign key (e.g. `user_details`) are read through JOINed columns,
+    - `SerializerMethodField`s get a `Row` with the columns listed in the serializer's `method_columns`
+      (see `SparseFieldsMixin`),
+    - reverse relations serialized with `many=True` (e.g. offer `details`) are loaded with one query per page
+      and serialized by the `ValuesSerializer` in `nested_many`, ordered by primary key.
+    """
+
+    serializer_class = None
+    nested_many = {}
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.serializer = self.serializer_class(context=self.context)
+        self.model = self.serializer.Meta.model
+        self.pk = self.model._meta.pk.attname
+        self.columns = [self.pk]
+        self.nested = {}
+        self.getters = [
+            (name, self.compile_field(name, field))
+            for name, field in self.serializer.fields.items()
+            if not field.write_only
+        ]
+
+    def add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+
+    def get_model_field(self, column):
+        model, model_field = self.model, None
+        for part in column.split("__"):
+            model_field = model._meta.get_field(part)
+            model = model_field.related_model
+        return model_field
+
+    def compile_field(self, name, field):
+        if isinstance(field, serializers.SerializerMethodField):
+            method_columns = getattr(self.serializer, "method_columns", {})
+            if name not in method_columns:
+                raise ImproperlyConfigured(
+                    f"{type(self.serializer).__name__}.method_columns needs an entry for '{name}'."
+                )
+            for column in method_columns[name]:
+                self.add_column(column)
+            return lambda row: field.to_representation(Row(row))
+
+        if isinstance(field, serializers.ListSerializer):
+            if name not in self.nested_many:
+                raise ImproperlyConfigured(f"{type(self).__name__}.nested_many needs an entry for '{name}'.")
+            self.nested[name] = (self.model._meta.get_field(field.source), self.nested_many[name](self.context))
+            return lambda row: row[("nested", name)]
+
+        source = "__".join(field.source_attrs)
+        if isinstance(field, serializers.BaseSerializer):
+            self.add_column(source)
+            children = [
+                (child_name, self.compile_column(f"{source}__{'__'.join(child.source_attrs)}", child))
+                for child_name, child in field.fields.items()
+                if not child.write_only
+            ]
+            return lambda row: (
+                None
+                if row[source] is None
+                else {child_name: getter(row) for child_name, getter in children}
+            )
+
+        return self.compile_column(source, field)
+
+    def compile_column(self, column, field):
+        self.add_column(column)
+        model_field = self.get_model_field(column)
+        if isinstance(field, RelatedField):
+            wrap = PKOnlyObject
+        elif isinstance(model_field, models.FileField):
+            def wrap(name):
+                return model_field.attr_class(None, model_field, name)
+        else:
+            def wrap(value):
+                return value
+
+        def getter(row):
+            value = row[column]
+            return None if value is None else field.to_representation(wrap(value))
+
+        return getter
+
+    def values(self, queryset, *extra_columns):
+        """
+        The rows for `to_representation`, with `extra_columns` (e.g. for the keyset pagination) in addition.
+        Prefetches of the queryset are dropped; `nested_many` replaces them.
+        """
+        return queryset.prefetch_related(None).values(*dict.fromkeys([*self.columns, *extra_columns]))
+
+    def load_nested(self, rows):
+        for name, (relation, child) in self.nested.items():
+            foreign_key = relation.field.attname
+            related = relation.related_model.objects.filter(
+                **{f"{relation.field.name}__in": [row[self.pk] for row in rows]}
+            )
+            related_rows = list(child.values(related.order_by("pk"), foreign_key))
+            groups = {}
+            for related, data in zip(related_rows, child.to_representation(related_rows)):
+                groups.setdefault(related[foreign_key], []).append(data)
+            for row in rows:
+                row[("nested", name)] = groups.get(row[self.pk], [])
+
+    def to_representation(self, rows):
+        """
+        Serializes a list of rows from `values()`, like `serializer_class(objects, many=True).data`.
+        """
+        rows = list(rows)
+        if self.nested and rows:
+            self.load_nested(rows)
+        return [{name: getter(row) for name, getter in self.getters} for row in rows]
+
+
+class ValuesListMixin:
+    """
+    Serves list GETs of a generic view through `values_serializer_class` instead of `serializer_class`,
+    with the same filtering and pagination. The ordering columns of the pagination are always selected.
+    Building the representation counts as `serialize` in the request metrics.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.values_serializer_class(context=self.get_serializer_context())
+        queryset = values_serializer.values(
+            self.filter_queryset(self.get_queryset()),
+            *cursor_columns(self.pagination_class, get_ordering_fields(self)),
+        )
+
+        page = self.paginate_queryset(queryset)
+        with measure_serialize():
+            data = values_serializer.to_representation(page if page is not None else queryset)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -1,10 +1,9 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from reviews.api.models import Review
-from django.db.models import Avg
-from offers.api.models import Offer
-from django.contrib.auth.models import User
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework import status
+from base.counters import get_base_info
+from base.metrics import registry
 
 
 class BaseInfoView(APIView):
@@ -12,20 +11,26 @@ class BaseInfoView(APIView):
     Handles GET requests to retrieve counts and averages from different models.
     Returns the total number of reviews, the average rating of reviews, the count of user profiles marked as 'business', 
     and the total number of offers. All values are returned in a JSON response.
+    The values are read from cached counters, which are kept up to date by signals (see `base.counters`).
     """ 
     permission_classes = [AllowAny]
 
     def get(self, request, *args, **kwargs):
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(Avg("rating"))["rating__avg"] or 0
-        business_profile_count = User.objects.filter(profile__type="business").count()
-        offer_count = Offer.objects.count()
+        return Response(get_base_info())
 
-        return Response(
-            {
-                "review_count": review_count,
-                "average_rating": round(average_rating, 1),
-                "business_profile_count": business_profile_count,
-                "offer_count": offer_count,
-            }
-        )
+
+class RequestMetricsView(APIView):
+    """
+    Admin-only view of the request metrics recorded by `RequestMetricsMiddleware`, aggregated per URL name
+    and sorted by the total time spent in each route. The numbers cover the process that answers the request.
+    - `GET`: Returns count, latency percentiles, queries, SQL and render time and the slowest query per route.
+    - `DELETE`: Resets the aggregated metrics.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(registry.snapshot())
+
+    def delete(self, request, *args, **kwargs):
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from offers.api.models import Offer
+from reviews.api.models import Review
+
+REVIEW_COUNT = "base-info:review_count"
+REVIEW_RATING_SUM = "base-info:review_rating_sum"
+BUSINESS_PROFILE_COUNT = "base-info:business_profile_count"
+OFFER_COUNT = "base-info:offer_count"
+
+COUNTER_KEYS = [REVIEW_COUNT, REVIEW_RATING_SUM, BUSINESS_PROFILE_COUNT, OFFER_COUNT]
+
+
+def get_timeout():
+    return getattr(settings, "BASE_INFO_COUNTER_TIMEOUT", None)
+
+
+def reconcile():
+    """
+    Recomputes all counters from the database and stores them in the cache.
+    """
+    reviews = Review.objects.aggregate(count=Count("id"), rating_sum=Sum("rating"))
+    counters = {
+        REVIEW_COUNT: reviews["count"],
+        REVIEW_RATING_SUM: reviews["rating_sum"] or 0,
+        BUSINESS_PROFILE_COUNT: User.objects.filter(profile__type="business").count(),
+        OFFER_COUNT: Offer.objects.count(),
+    }
+    cache.set_many(counters, timeout=get_timeout())
+    return counters
+
+
+def get_counters():
+    """
+    Returns the counters from the cache and rebuilds all of them if any one is missing.
+    """
+    counters = cache.get_many(COUNTER_KEYS)
+    if len(counters) != len(COUNTER_KEYS):
+        counters = reconcile()
+    return counters
+
+
+def get_base_info():
+    counters = get_counters()
+    review_count = counters[REVIEW_COUNT]
+    average_rating = counters[REVIEW_RATING_SUM] / review_count if review_count else 0
+    return {
+        "review_count": review_count,
+        "average_rating": round(average_rating, 1),
+        "business_profile_count": counters[BUSINESS_PROFILE_COUNT],
+        "offer_count": counters[OFFER_COUNT],
+    }
+
+
+def increment(key, delta):
+    """
+    Adjusts a counter once the current transaction commits. A missing key is left missing,
+    the next read rebuilds it from the database.
+    """
+    if not delta:
+        return
+
+    def apply():
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
@@ -0,0 +1,175 @@
+import re
+from io import BytesIO
+from pathlib import PurePosixPath
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+from tasks.queue import task
+
+DEFAULTS = {
+    "WIDTHS": (320, 640, 1024),
+    "FORMATS": ("webp", "jpeg"),
+    "QUALITY": 80,
+}
+
+# Pillow format name and file extension per variant format.
+FORMATS = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+
+def get_setting(name):
+    return getattr(settings, "IMAGE_VARIANTS", {}).get(name, DEFAULTS[name])
+
+
+def variant_name(name, width, format):
+    path = PurePosixPath(name)
+    return str(path.parent / "variants" / f"{path.stem}_{width}w.{FORMATS[format][1]}")
+
+
+def convert_for(image, format):
+    if format == "jpeg" and image.mode not in ("RGB", "L"):
+        return image.convert("RGB")
+    if format == "webp" and image.mode not in ("RGB", "RGBA"):
+        return image.convert("RGBA" if "A" in image.getbands() or image.mode == "P" else "RGB")
+    return image
+
+
+def render_variants(field_file):
+    """
+    Writes resized copies of an image for every configured width and format and returns their names as
+    `{"source": <original name>, "webp": {"320": <name>, ...}, "jpeg": {...}}`.
+    Images are never upscaled; widths above the original width collapse into one variant of the original size.
+    """
+    variants = {"source": field_file.name}
+    with field_file.open("rb") as file, Image.open(file) as original:
+        image = ImageOps.exif_transpose(original)
+        widths = sorted({min(width, image.width) for width in get_setting("WIDTHS")})
+        for format in get_setting("FORMATS"):
+            pil_format = FORMATS[format][0]
+            variants[format] = {}
+            for width in widths:
+                resized = image
+                if width < image.width:
+                    height = max(1, round(image.height * width / image.width))
+                    resized = image.resize((width, height), Image.Resampling.LANCZOS)
+                buffer = BytesIO()
+                convert_for(resized, format).save(buffer, pil_format, quality=get_setting("QUALITY"))
+
+                name = variant_name(field_file.name, width, format)
+                if default_storage.exists(name):
+                    default_storage.delete(name)
+                variants[format][str(width)] = default_storage.save(
+                    name, ContentFile(buffer.getvalue())
+                )
+    return variants
+
+
+def variant_files(variants):
+    return {
+        name
+        for format in FORMATS
+        for name in (variants or {}).get(format, {}).values()
+    }
+
+
+def stored_variant_files(name):
+    """
+    Returns the names of all variant files stored for the image `name`, whatever widths and formats
+    were configured when they were rendered.
+    """
+    path = PurePosixPath(name)
+    directory = str(path.parent / "variants")
+    if not default_storage.exists(directory):
+        return []
+    pattern = re.compile(rf"{re.escape(path.stem)}_\d+w(_[a-zA-Z0-9]{{7}})?\.\w+")
+    return [
+        f"{directory}/{filename}"
+        for filename in default_storage.listdir(directory)[1]
+        if pattern.fullmatch(filename)
+    ]
+
+
+def shared_variants(model, pk, name, variants_field):
+    """
+    Returns the variants another row already rendered for the same image, if all their files exist.
+    """
+    for variants in (
+        model.objects.filter(**{f"{variants_field}__source": name})
+        .exclude(pk=pk)
+        .values_list(variants_field, flat=True)[:5]
+    ):
+        if all(default_storage.exists(file) for file in variant_files(variants)):
+            return variants
+    return None
+
+
+@task()
+def build_variants(model_label, pk, field_name, variants_field):
+    """
+    Generates the variants of the current image of an instance and stores their names in `variants_field`.
+    Variants already rendered for the same image by another row are reused without rendering.
+    Nothing is stored if the image was replaced while the variants were rendered; the save of the new
+    image schedules its own run. Files of a previous image are removed by `base.media.release_files`.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+
+    field_file = getattr(instance, field_name)
+    name = field_file.name or ""
+    previous = getattr(instance, variants_field) or {}
+    if previous.get("source", "") == name:
+        return
+
+    variants = {}
+    if name:
+        variants = shared_variants(model, pk, name, variants_field) or render_variants(field_file)
+
+    current_name = model.objects.filter(pk=pk).values_list(field_name, flat=True).first()
+    if (current_name or "") != name:
+        return
+
+    setattr(instance, variants_field, variants)
+    update_fields = [variants_field]
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        update_fields.append("updated_at")
+    instance.save(update_fields=update_fields)
+
+
+def schedule_variants(instance, field_name, variants_field):
+    """
+    Queues the regeneration of the variants of an instance's image as a background task.
+    Does nothing if the variants are up to date.
+    """
+    name = getattr(instance, field_name).name or ""
+    if (getattr(instance, variants_field) or {}).get("source", "") == name:
+        return
+    build_variants.enqueue(instance._meta.label, instance.pk, field_name, variants_field)
+
+
+def variant_urls(variants, request=None, url=None):
+    """
+    Returns a srcset-style map of the variant URLs, e.g. `{"webp": {"320w": url, "640w": url}, "jpeg": {...}}`,
+    or None if no variants exist. URLs come from the storage and are absolute when a request is given,
+    like DRF's `ImageField`; `url` can map a file name to a URL instead.
+    """
+    formats = {}
+    for format in FORMATS:
+        names = (variants or {}).get(format)
+        if not names:
+            continue
+        formats[format] = {}
+        for width, name in sorted(names.items(), key=lambda item: int(item[0])):
+            if url is not None:
+                formats[format][f"{width}w"] = url(name)
+                continue
+            storage_url = default_storage.url(name)
+            formats[format][f"{width}w"] = (
+                request.build_absolute_uri(storage_url) if request else storage_url
+            )
+    return formats or None
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from base import images
+from base.media import IMAGE_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Generates missing or outdated thumbnails of offer and profile images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Regenerate the variants of every image."
+        )
+
+    def handle(self, *args, **options):
+        for model, (field_name, variants_field) in IMAGE_FIELDS.items():
+            built = 0
+            queryset = model.objects.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+            for instance in queryset.only("pk", field_name, variants_field).iterator():
+                variants = getattr(instance, variants_field) or {}
+                if not options["force"] and variants.get("source") == getattr(instance, field_name).name:
+                    continue
+                if options["force"]:
+                    model.objects.filter(pk=instance.pk).update(**{variants_field: {}})
+                images.build_variants(model._meta.label, instance.pk, field_name, variants_field)
+                built += 1
+            self.stdout.write(f"{model._meta.label}: {built} images processed")
+        self.stdout.write(self.style.SUCCESS("Image variants are up to date."))
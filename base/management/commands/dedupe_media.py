@@ -0,0 +1,90 @@
+from django.core.management.base import BaseCommand
+from base import images, media
+from base.storage import content_hash_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves offer and profile images to content-hash names, so duplicate uploads share one file, "
+        "and deletes image files and variants no row references. Run it while no task worker renders variants."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only report what would be changed."
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options["dry_run"]
+        renamed, merged, freed = self.rename_files()
+        orphans, orphan_bytes = self.delete_orphans()
+        prefix = "Would have" if self.dry_run else "Have"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix} renamed {renamed} files ({merged} duplicates), deleted {orphans} unreferenced "
+                f"files, freeing {freed + orphan_bytes} bytes."
+            )
+        )
+
+    def rename_files(self):
+        """
+        Points every row at the content-hash name of its image and deletes the old file once unreferenced.
+        The variants of renamed images are rendered again by the task worker.
+        """
+        renamed = merged = freed = 0
+        for model, (field_name, variants_field) in media.IMAGE_FIELDS.items():
+            for name in (
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True)
+                .distinct()
+            ):
+                if not content_hash_storage.exists(name):
+                    self.stderr.write(f"Missing file: {name}")
+                    continue
+                with content_hash_storage.open(name) as file:
+                    new_name = content_hash_storage.content_name(name, file)
+                    if new_name == name:
+                        continue
+                    duplicate = content_hash_storage.exists(new_name)
+                    renamed += 1
+                    merged += duplicate
+                    freed += content_hash_storage.size(name) if duplicate else 0
+                    if self.dry_run:
+                        continue
+                    content_hash_storage.save(name, file)
+
+                rows = model.objects.filter(**{field_name: name})
+                pks = list(rows.values_list("pk", flat=True))
+                rows.update(**{field_name: new_name, variants_field: {}})
+                for pk in pks:
+                    images.build_variants.enqueue(model._meta.label, pk, field_name, variants_field)
+                media.release_files([name])
+        return renamed, merged, freed
+
+    def delete_orphans(self):
+        referenced = media.referenced_files()
+        referenced_variants = media.referenced_variant_files()
+        deleted = freed = 0
+        for directory in media.upload_directories():
+            if not content_hash_storage.exists(directory):
+                continue
+            for filename in content_hash_storage.listdir(directory)[1]:
+                name = f"{directory}/{filename}"
+                if name not in referenced:
+                    deleted, freed = self.delete(name, deleted, freed)
+            variants_directory = f"{directory}/variants"
+            if not content_hash_storage.exists(variants_directory):
+                continue
+            for filename in content_hash_storage.listdir(variants_directory)[1]:
+                name = f"{variants_directory}/{filename}"
+                if name not in referenced_variants:
+                    deleted, freed = self.delete(name, deleted, freed)
+        return deleted, freed
+
+    def delete(self, name, deleted, freed):
+        self.stdout.write(f"Unreferenced: {name}")
+        size = content_hash_storage.size(name)
+        if not self.dry_run:
+            content_hash_storage.delete(name)
+        return deleted + 1, freed + size
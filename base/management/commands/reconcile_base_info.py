@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from base import counters
+
+
+class Command(BaseCommand):
+    help = "Recomputes the cached base-info counters from the database to correct any drift."
+
+    def handle(self, *args, **options):
+        for key, value in counters.reconcile().items():
+            self.stdout.write(f"{key}: {value}")
+        self.stdout.write(self.style.SUCCESS("Base info counters reconciled."))
@@ -0,0 +1,28 @@
+import sqlite3
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from base.replicas import get_setting
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the primary SQLite database into the replica files of DATABASE_REPLICAS, standing in for "
+        "replication when running with replicas locally."
+    )
+
+    def handle(self, *args, **options):
+        aliases = get_setting("ALIASES")
+        if not aliases:
+            raise CommandError("No replica is configured; set DATABASE_REPLICA_NAME.")
+
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != "sqlite" or any(connections[alias].vendor != "sqlite" for alias in aliases):
+            raise CommandError("Only SQLite databases can be copied; use the replication of your database.")
+
+        primary.ensure_connection()
+        for alias in aliases:
+            connections[alias].close()
+            with sqlite3.connect(connections[alias].settings_dict["NAME"]) as target:
+                primary.connection.backup(target)
+            target.close()
+            self.stdout.write(self.style.SUCCESS(f"Copied the primary database to '{alias}'."))
@@ -0,0 +1,107 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from offers.api.models import Offer
+from profiles.api.models import UserProfile
+from tasks.queue import enqueue, task
+from tasks.queue import get_setting as get_task_setting
+from . import images
+from .storage import content_hash_storage
+
+DEFAULTS = {
+    "RELEASE_GRACE_SECONDS": 10 * 60,
+}
+
+# Image fields stored in `content_hash_storage` and the JSON field holding the variants of each.
+IMAGE_FIELDS = {
+    Offer: ("image", "image_variants"),
+    UserProfile: ("file", "file_variants"),
+}
+
+
+def get_setting(name):
+    return getattr(settings, "MEDIA_CLEANUP", {}).get(name, DEFAULTS[name])
+
+
+def reference_count(name):
+    """
+    Number of offers and profiles pointing at the stored file `name`. Files are content-addressed and
+    shared between rows, so this is their reference count.
+    """
+    return sum(
+        model.objects.filter(**{field_name: name}).count()
+        for model, (field_name, _) in IMAGE_FIELDS.items()
+    )
+
+
+def referenced_files():
+    """
+    Names of all image files referenced by any row.
+    """
+    names = set()
+    for model, (field_name, _) in IMAGE_FIELDS.items():
+        names.update(
+            model.objects.exclude(**{field_name: ""})
+            .exclude(**{f"{field_name}__isnull": True})
+            .values_list(field_name, flat=True)
+            .distinct()
+        )
+    return names
+
+
+def referenced_variant_files():
+    names = set()
+    for model, (_, variants_field) in IMAGE_FIELDS.items():
+        for variants in model.objects.values_list(variants_field, flat=True).iterator():
+            names.update(images.variant_files(variants))
+    return names
+
+
+def upload_directories():
+    return sorted(
+        {
+            model._meta.get_field(field_name).upload_to.rstrip("/")
+            for model, (field_name, _) in IMAGE_FIELDS.items()
+        }
+    )
+
+
+def delete_file(name):
+    """
+    Deletes a stored image and all its variants. Returns the number of bytes freed.
+    """
+    freed = 0
+    for file in [name, *images.stored_variant_files(name)]:
+        if content_hash_storage.exists(file):
+            freed += content_hash_storage.size(file)
+            content_hash_storage.delete(file)
+    return freed
+
+
+def recently_saved(name):
+    """
+    Whether the file was saved within `MEDIA_CLEANUP["RELEASE_GRACE_SECONDS"]`. Saving content that is already
+    stored refreshes the modification time (see `ContentHashStorage.save`), so the row of a concurrent upload
+    of the same content may not be committed yet.
+    """
+    grace = timedelta(seconds=get_setting("RELEASE_GRACE_SECONDS"))
+    return content_hash_storage.get_modified_time(name) > timezone.now() - grace
+
+
+@task()
+def release_files(names):
+    """
+    Deletes the given image files and their variants once no offer or profile references them anymore.
+    Files saved within the grace period are checked again once it has passed; without a worker
+    (`TASK_QUEUE["EAGER"]`) they are left to `dedupe_media`.
+    """
+    pending = []
+    for name in names:
+        if not name or reference_count(name):
+            continue
+        if content_hash_storage.exists(name) and recently_saved(name):
+            pending.append(name)
+        else:
+            delete_file(name)
+    if pending and not get_task_setting("EAGER"):
+        enqueue(release_files.task_name, [pending], delay=get_setting("RELEASE_GRACE_SECONDS"))
@@ -0,0 +1,233 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.utils import timezone
+
+DEFAULTS = {
+    "SLOW_REQUEST_MS": 500,
+    "MAX_QUERIES": 50,
+    "SAMPLES": 1000,
+    "SERVER_TIMING": True,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "REQUEST_METRICS", {}).get(name, DEFAULTS[name])
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that counts the queries of a request, sums up their time and keeps the slowest one.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            if duration >= self.slowest_duration:
+                self.slowest_duration = duration
+                self.slowest_sql = sql
+
+
+# The metrics of the request being handled. Unlike the database connections, which differ between the event
+# loop and the worker threads of `sync_to_async`, context variables follow the request into those threads.
+current_metrics = ContextVar("current_metrics", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every connection (see `base.signals`) that passes the query to the recorder
+    of the current request, if any.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.queries(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def measure_serialize():
+    """
+    Counts the time of the enclosed block as serialization time of the current request, if any.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    metrics.start_serialize()
+    try:
+        yield
+    finally:
+        metrics.finish_serialize()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = QueryRecorder()
+        self.render_started = None
+        self.render_duration = 0.0
+        self.serialize_depth = 0
+        self.serialize_started = None
+        self.serialize_duration = 0.0
+        self.total_duration = None
+
+    def start_serialize(self):
+        """
+        Starts timing serializer output. Calls may nest; only the outermost one is timed, and the durations
+        of consecutive calls (e.g. the chunks of a streamed list) add up.
+        """
+        if self.serialize_depth == 0:
+            self.serialize_started = time.perf_counter()
+        self.serialize_depth += 1
+
+    def finish_serialize(self):
+        self.serialize_depth -= 1
+        if self.serialize_depth == 0:
+            self.serialize_duration += time.perf_counter() - self.serialize_started
+
+    def start_render(self):
+        self.render_started = time.perf_counter()
+
+    def finish_render(self, response=None):
+        if self.render_started is not None:
+            self.render_duration = time.perf_counter() - self.render_started
+
+    def finish(self):
+        self.total_duration = time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {
+            "queries": self.queries.count,
+            "sql_ms": round(self.queries.duration * 1000, 3),
+            "slowest_query_ms": round(self.queries.slowest_duration * 1000, 3),
+            "slowest_query": self.queries.slowest_sql,
+            "serialize_ms": round(self.serialize_duration * 1000, 3),
+            "render_ms": round(self.render_duration * 1000, 3),
+            "total_ms": round(self.total_duration * 1000, 3),
+        }
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                f'db;dur={self.queries.duration * 1000:.3f};desc="{self.queries.count} queries"',
+                f"db-slowest;dur={self.queries.slowest_duration * 1000:.3f}",
+                f"serialize;dur={self.serialize_duration * 1000:.3f}",
+                f"render;dur={self.render_duration * 1000:.3f}",
+                f"total;dur={self.total_duration * 1000:.3f}",
+            ]
+        )
+
+
+class RouteStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.sql_ms = 0.0
+        self.serialize_ms = 0.0
+        self.render_ms = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.slowest_query_ms = 0.0
+        self.slowest_query = None
+        self.samples = deque(maxlen=get_setting("SAMPLES"))
+
+    def add(self, metrics, status_code):
+        data = metrics.as_dict()
+        self.count += 1
+        self.errors += status_code >= 500
+        self.total_ms += data["total_ms"]
+        self.max_ms = max(self.max_ms, data["total_ms"])
+        self.sql_ms += data["sql_ms"]
+        self.serialize_ms += data["serialize_ms"]
+        self.render_ms += data["render_ms"]
+        self.queries += data["queries"]
+        self.max_queries = max(self.max_queries, data["queries"])
+        if data["slowest_query_ms"] >= self.slowest_query_ms and data["slowest_query"]:
+            self.slowest_query_ms = data["slowest_query_ms"]
+            self.slowest_query = data["slowest_query"]
+        self.samples.append(data["total_ms"])
+
+    def percentile(self, fraction):
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, round(fraction * (len(samples) - 1)))]
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": {
+                "mean": round(self.total_ms / self.count, 3),
+                "p50": self.percentile(0.5),
+                "p95": self.percentile(0.95),
+                "max": self.max_ms,
+            },
+            "queries": {"mean": round(self.queries / self.count, 2), "max": self.max_queries},
+            "sql_ms_mean": round(self.sql_ms / self.count, 3),
+            "serialize_ms_mean": round(self.serialize_ms / self.count, 3),
+            "render_ms_mean": round(self.render_ms / self.count, 3),
+            "slowest_query_ms": self.slowest_query_ms,
+            "slowest_query": self.slowest_query,
+        }
+
+
+class MetricsRegistry:
+    """
+    Aggregates request metrics per URL name in this process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+            self.since = timezone.now()
+
+    def record(self, url_name, metrics, status_code):
+        with self.lock:
+            stats = self.routes.get(url_name)
+            if stats is None:
+                stats = self.routes[url_name] = RouteStats()
+            stats.add(metrics, status_code)
+
+    def snapshot(self):
+        with self.lock:
+            routes = {name: stats.as_dict() for name, stats in self.routes.items()}
+            since = self.since
+        return {
+            "pid": os.getpid(),
+            "since": since,
+            "routes": dict(
+                sorted(
+                    routes.items(),
+                    key=lambda item: item[1]["total_ms"]["mean"] * item[1]["count"],
+                    reverse=True,
+                )
+            ),
+        }
+
+
+registry = MetricsRegistry()
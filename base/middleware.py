@@ -0,0 +1,160 @@
+import json
+import logging
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from base import replicas
+from base.metrics import RequestMetrics, current_metrics, get_setting, registry
+
+logger = logging.getLogger("base.metrics")
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the query count, SQL time, slowest query, serialize time, render time and total time of every
+    request. The values are sent as `Server-Timing` header, logged as one JSON line on the `base.metrics` logger
+    (WARNING for slow or chatty requests, INFO otherwise) and aggregated per URL name in `base.metrics.registry`.
+    Serialize time covers building the response data from serializers (see `base.metrics.measure_serialize`),
+    render time covers rendering the DRF response.
+    Runs natively under WSGI and ASGI, so async views are not pushed into a worker thread.
+    Streaming responses are measured until their body is exhausted: the `Server-Timing` header, sent before
+    the body, only covers the time to the first byte, while the log line and the registry include the queries
+    and time of the whole body.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = self.start(request)
+        with self.recording(metrics):
+            response = self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = self.start(request)
+        with self.recording(metrics):
+            response = await self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    def start(self, request):
+        request.metrics = RequestMetrics()
+        return request.metrics
+
+    @contextmanager
+    def recording(self, metrics):
+        token = current_metrics.set(metrics)
+        try:
+            yield
+        finally:
+            current_metrics.reset(token)
+
+    def finish(self, request, response, metrics):
+        metrics.finish()
+        if get_setting("SERVER_TIMING"):
+            response["Server-Timing"] = metrics.server_timing()
+
+        if response.streaming:
+            measure = self.measure_async_stream if response.is_async else self.measure_stream
+            response.streaming_content = measure(response.streaming_content, request, response, metrics)
+        else:
+            self.record(request, response, metrics)
+        return response
+
+    def measure_stream(self, content, request, response, metrics):
+        try:
+            with self.recording(metrics):
+                yield from content
+        finally:
+            metrics.finish()
+            self.record(request, response, metrics)
+
+    async def measure_async_stream(self, content, request, response, metrics):
+        try:
+            with self.recording(metrics):
+                async for chunk in content:
+                    yield chunk
+        finally:
+            metrics.finish()
+            self.record(request, response, metrics)
+
+    def record(self, request, response, metrics):
+        match = request.resolver_match
+        url_name = match.view_name if match else "<unresolved>"
+        registry.record(url_name, metrics, response.status_code)
+        self.log(request, response, url_name, metrics)
+
+    def process_template_response(self, request, response):
+        request.metrics.start_render()
+        response.add_post_render_callback(request.metrics.finish_render)
+        return response
+
+    def log(self, request, response, url_name, metrics):
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "url_name": url_name,
+            "status": response.status_code,
+            **metrics.as_dict(),
+        }
+        slow = (
+            record["total_ms"] >= get_setting("SLOW_REQUEST_MS")
+            or record["queries"] > get_setting("MAX_QUERIES")
+        )
+        level = logging.WARNING if slow else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps(record), extra={"metrics": record})
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets GET requests to the views of `DATABASE_REPLICAS["READ_APPS"]` read from a replica (see
+    `base.replicas.ReplicaRouter`). Successful writes of an authenticated user, and creating a user at the
+    registration, make the user sticky: their reads go to the primary for `STICKY_SECONDS`, so they see
+    their own changes despite replication lag. Runs natively under WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = replicas.current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas.current_request.reset(token)
+        return self.finish(request, response)
+
+    async def __acall__(self, request):
+        token = replicas.current_request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replicas.current_request.reset(token)
+        return self.finish(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.replica_allowed = (
+            request.method in replicas.READ_METHODS
+            and bool(replicas.get_setting("ALIASES"))
+            and replicas.is_read_view(view_func)
+        )
+
+    def finish(self, request, response):
+        if request.method not in replicas.READ_METHODS and response.status_code < 400:
+            user = replicas.authenticated_user(request)
+            replicas.mark_sticky(user.pk if user else None)
+        return response
@@ -0,0 +1,117 @@
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject
+
+DEFAULTS = {
+    "ALIASES": (),
+    "STICKY_SECONDS": 10,
+    "READ_APPS": ("offers", "profiles", "reviews", "base"),
+    "PRIMARY_APPS": ("authtoken",),
+}
+
+READ_METHODS = ("GET", "HEAD")
+STICKY_KEY_PREFIX = "replicas:sticky"
+
+# The request being handled; set by `ReplicaRoutingMiddleware`. The routing state lives on the request
+# itself, so it is shared by the threads a request runs in under ASGI.
+current_request = ContextVar("current_request", default=None)
+
+
+def get_setting(name):
+    return getattr(settings, "DATABASE_REPLICAS", {}).get(name, DEFAULTS[name])
+
+
+def is_read_view(view_func):
+    """
+    Whether the view belongs to one of the `READ_APPS`. Class-based views are matched by their class.
+    """
+    module = getattr(view_func, "view_class", view_func).__module__
+    return module.split(".")[0] in get_setting("READ_APPS")
+
+
+def sticky_key(user_id):
+    return f"{STICKY_KEY_PREFIX}:{user_id}"
+
+
+def mark_sticky(user_id):
+    """
+    Sends the reads of the user to the primary for `STICKY_SECONDS`, so they see their own writes even if
+    the replicas lag behind.
+    """
+    if user_id is not None and get_setting("ALIASES") and get_setting("STICKY_SECONDS"):
+        cache.set(sticky_key(user_id), True, timeout=get_setting("STICKY_SECONDS"))
+
+
+def is_sticky(user_id):
+    return bool(cache.get(sticky_key(user_id)))
+
+
+def authenticated_user(request):
+    """
+    The user the token authentication of the view resolved, or None for anonymous requests and before the
+    view has authenticated the request (`request.user` is still the lazy object of Django's middleware then).
+    """
+    user = request.__dict__.get("user")
+    if user is None or isinstance(user, SimpleLazyObject) or not user.is_authenticated:
+        return None
+    return user
+
+
+def note_write():
+    """
+    Sends the remaining reads of the current request to the primary; called for every saved or deleted row
+    (see `base.signals`).
+    """
+    request = current_request.get()
+    if request is not None:
+        request.replica_allowed = False
+
+
+def may_read_from_replica(request):
+    """
+    Whether a read of the request may go to a replica: it has to be a read of a `READ_APPS` view (see
+    `ReplicaRoutingMiddleware`) that has not written anything yet, by a user without recent writes.
+    The stickiness of the user is looked up once, as soon as the view has authenticated the request.
+    """
+    if not getattr(request, "replica_allowed", False):
+        return False
+    user = authenticated_user(request)
+    if user is None:
+        return True
+    if getattr(request, "replica_sticky", None) is None:
+        request.replica_sticky = is_sticky(user.pk)
+    return not request.replica_sticky
+
+
+class ReplicaRouter:
+    """
+    Sends reads to a random replica of `DATABASE_REPLICAS["ALIASES"]` while `may_read_from_replica` allows
+    it for the current request, and everything else to the primary (`default`):
+    - writes always go to the primary,
+    - reads inside a transaction on the primary stay on the primary,
+    - models of the `PRIMARY_APPS` are always read from the primary (e.g. tokens right after the login).
+    Without replica aliases the router has no effect.
+    """
+
+    def db_for_read(self, model, **hints):
+        aliases = get_setting("ALIASES")
+        request = current_request.get()
+        if (
+            not aliases
+            or request is None
+            or model._meta.app_label in get_setting("PRIMARY_APPS")
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or not may_read_from_replica(request)
+        ):
+            return None
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary.
+        return True
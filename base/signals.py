@@ -0,0 +1,142 @@
+from django.contrib.auth.models import User
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from offers.api.models import Offer
+from offers.signals import offers_bulk_created
+from profiles.api.models import UserProfile
+from reviews.api.models import Review
+from . import counters, images, replicas
+from .media import IMAGE_FIELDS, release_files
+from .metrics import install_query_recorder
+
+# Persisted values that post_save compares with the saved ones.
+PREVIOUS_VALUE_FIELDS = {
+    Review: ("rating",),
+    UserProfile: ("type", "file"),
+    Offer: ("image",),
+}
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_save, sender=UserProfile)
+@receiver(pre_save, sender=Offer)
+def remember_previous_values(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Stores the persisted rating, profile type or image on the instance in one query, so post_save can
+    apply the difference.
+    """
+    instance._previous_values = {}
+    fields = PREVIOUS_VALUE_FIELDS[sender]
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    instance._previous_values = sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.increment(counters.REVIEW_COUNT, 1)
+        counters.increment(counters.REVIEW_RATING_SUM, instance.rating)
+        return
+
+    previous_rating = getattr(instance, "_previous_values", {}).get("rating")
+    if previous_rating is not None:
+        counters.increment(counters.REVIEW_RATING_SUM, instance.rating - previous_rating)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    counters.increment(counters.REVIEW_COUNT, -1)
+    counters.increment(counters.REVIEW_RATING_SUM, -instance.rating)
+
+
+@receiver(post_save, sender=UserProfile)
+def count_saved_profile(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    was_business = not created and getattr(instance, "_previous_values", {}).get("type") == "business"
+    is_business = instance.type == "business"
+    counters.increment(counters.BUSINESS_PROFILE_COUNT, int(is_business) - int(was_business))
+
+
+@receiver(post_delete, sender=UserProfile)
+def count_deleted_profile(sender, instance, **kwargs):
+    if instance.type == "business":
+        counters.increment(counters.BUSINESS_PROFILE_COUNT, -1)
+
+
+@receiver(post_save, sender=Offer)
+def count_saved_offer(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.increment(counters.OFFER_COUNT, 1)
+
+
+@receiver(offers_bulk_created)
+def count_bulk_created_offers(sender, offers, **kwargs):
+    counters.increment(counters.OFFER_COUNT, len(offers))
+
+
+@receiver(post_delete, sender=Offer)
+def count_deleted_offer(sender, instance, **kwargs):
+    counters.increment(counters.OFFER_COUNT, -1)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_save, sender=UserProfile)
+def schedule_image_variants(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Queues the regeneration of the thumbnails whenever the image of an offer or profile changes,
+    and the release of the replaced image.
+    """
+    field_name, variants_field = IMAGE_FIELDS[sender]
+    if raw or (update_fields is not None and field_name not in update_fields):
+        return
+    previous = getattr(instance, "_previous_values", {}).get(field_name)
+    if previous and previous != getattr(instance, field_name).name:
+        release_files.enqueue([previous])
+    images.schedule_variants(instance, field_name, variants_field)
+
+
+@receiver(post_delete, sender=Offer)
+@receiver(post_delete, sender=UserProfile)
+def release_image(sender, instance, **kwargs):
+    """
+    Queues the deletion of the image and its variants, unless other rows still reference the file.
+    """
+    name = getattr(instance, IMAGE_FIELDS[sender][0]).name
+    if name:
+        release_files.enqueue([name])
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def read_own_writes(sender, raw=False, **kwargs):
+    """
+    Keeps the rest of the request on the primary once it has written a row, so it reads what it wrote.
+    """
+    if not raw:
+        replicas.note_write()
+
+
+@receiver(post_save, sender=User)
+def make_new_users_sticky(sender, instance, created, raw=False, **kwargs):
+    """
+    Sends the first reads of a newly registered user to the primary; the registration itself is anonymous,
+    so `ReplicaRoutingMiddleware` cannot mark the user.
+    """
+    if created and not raw:
+        replicas.mark_sticky(instance.pk)
+
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs):
+    """
+    Lets `RequestMetricsMiddleware` count the queries of every connection, including the ones opened in
+    worker threads.
+    """
+    install_query_recorder(connection)
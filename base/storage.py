@@ -0,0 +1,49 @@
+import hashlib
+import os
+import posixpath
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible(path="base.storage.ContentHashStorage")
+class ContentHashStorage(FileSystemStorage):
+    """
+    File system storage that names files by the SHA-256 of their content, e.g. `offers_images/<sha256>.jpg`.
+    Saving content that is already stored returns the existing name without writing anything, so repeated
+    uploads of the same file share one copy on disk; only its modification time is refreshed, which keeps
+    `base.media.release_files` from deleting it before the row of the upload commits. Whether a file is still
+    needed is derived from the rows referencing it (see `base.media`).
+    """
+
+    def __init__(self, **kwargs):
+        # Two uploads of the same content racing each other write identical bytes to the same name.
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
+
+    def content_name(self, name, content):
+        """
+        Returns `<directory of name>/<sha256 of content><lower-case extension of name>`.
+        """
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        directory, filename = posixpath.split(str(name).replace("\\", "/"))
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, f"{digest.hexdigest()}{extension}")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.content_name(name, content)
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+content_hash_storage = ContentHashStorage()
@@ -0,0 +1,13 @@
+import logging
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Keeps the request log lines of `base.metrics` out of the test output. Tests that check them use
+    `assertLogs`, which attaches its own handler.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        logging.getLogger("base.metrics").addHandler(logging.NullHandler())
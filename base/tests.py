@@ -1,3 +1,857 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from contextlib import contextmanager
+from unittest import mock, skipUnless
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from PIL import Image
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework.authtoken.models import Token
+from base import counters, images, replicas
+from base.api.views import BaseInfoView
+from base.api.parsers import FastJSONParser
+from base.api.renderers import FastJSONRenderer
+from base.images import build_variants
+from base.media import release_files
+from base.metrics import registry
+from base.storage import content_hash_storage
+from base.middleware import ReplicaRoutingMiddleware, RequestMetricsMiddleware
+from base.replicas import ReplicaRouter
+from benchmarks.run import build_requests, get_route_names, send
+from benchmarks.seed import seed
+from offers.api.models import Offer, OfferDetail
+from offers.api import async_views as offer_async_views
+from offers.api.serializers import OfferSerializer, OfferValuesSerializer
+from offers.api.views import OffersListCreateView
+from orders.api.models import Order
+from orders.api.serializers import OrderSerializer, OrderValuesSerializer
+from orders.api.views import OrderListCreateView
+from profiles.api.models import UserProfile
+from reviews.api.models import Review
+from reviews.api.serializers import ReviewSerializer, ReviewValuesSerializer
+from tasks.api.models import Task
+from tasks.queue import run_pending
 
-# Create your tests here.
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are checked against SQLite's EXPLAIN output.")
+class QueryPlanTests(TestCase):
+    """
+    Guards the hot filter and ordering paths against falling back to full table scans.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="business", password="secret")
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        table = queryset.model._meta.db_table
+        table_lines = [line for line in plan.splitlines() if f" {table}" in line]
+        self.assertTrue(table_lines, plan)
+        for line in table_lines:
+            self.assertIn("INDEX", line, f"Full table scan on {table}:\n{plan}")
+
+    def test_order_count_by_business_user_and_status(self):
+        self.assertUsesIndex(
+            Order.objects.filter(business_user=self.user, status="in_progress")
+        )
+
+    def test_order_list_of_customer_or_business_user(self):
+        self.assertUsesIndex(
+            Order.objects.filter(
+                Q(customer_user=self.user) | Q(business_user=self.user)
+            ).order_by("-created_at")
+        )
+
+    def test_offers_by_user_ordered_by_update(self):
+        self.assertUsesIndex(Offer.objects.filter(user_id=self.user.pk).order_by("-updated_at"))
+
+    def test_offers_by_min_price(self):
+        self.assertUsesIndex(Offer.objects.filter(min_price__gte=50).order_by("min_price"))
+
+    def test_offers_by_min_delivery_time(self):
+        self.assertUsesIndex(Offer.objects.filter(min_delivery_time__lte=5))
+
+    def test_offers_ordered_by_update(self):
+        self.assertUsesIndex(Offer.objects.order_by("-updated_at"))
+
+    def test_reviews_of_business_user_ordered_by_update(self):
+        self.assertUsesIndex(
+            Review.objects.filter(business_user_id=self.user.pk).order_by("updated_at")
+        )
+
+    def test_reviews_of_business_user_ordered_by_rating(self):
+        self.assertUsesIndex(
+            Review.objects.filter(business_user_id=self.user.pk).order_by("rating")
+        )
+
+    def test_profiles_by_type_and_location(self):
+        self.assertUsesIndex(
+            UserProfile.objects.filter(type="business", location="Berlin").order_by("id")
+        )
+
+    def test_profiles_by_location(self):
+        self.assertUsesIndex(UserProfile.objects.filter(location="Berlin").order_by("id"))
+
+
+class BaseInfoCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = User.objects.create_user(username="business", password="secret")
+        UserProfile.objects.create(user=cls.business, type="business")
+        cls.customer = User.objects.create_user(username="customer", password="secret")
+        UserProfile.objects.create(user=cls.customer, type="customer")
+        Review.objects.create(
+            business_user=cls.business, reviewer=cls.customer, rating=4, description="Gut"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_base_info(self):
+        response = self.client.get(reverse("base-info"))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cold_read_rebuilds_counters(self):
+        self.assertEqual(
+            self.get_base_info(),
+            {
+                "review_count": 1,
+                "average_rating": 4.0,
+                "business_profile_count": 1,
+                "offer_count": 0,
+            },
+        )
+
+    def test_warm_read_runs_no_queries(self):
+        self.get_base_info()
+        with self.assertNumQueries(0):
+            self.get_base_info()
+
+    def test_counters_follow_writes(self):
+        self.get_base_info()
+        other_customer = User.objects.create_user(username="other", password="secret")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review = Review.objects.create(
+                business_user=self.business, reviewer=other_customer, rating=1, description="Schlecht"
+            )
+            Offer.objects.create(user=self.business, title="Offer", min_price=10, min_delivery_time=1)
+            UserProfile.objects.create(user=other_customer, type="business")
+
+        info = self.get_base_info()
+        self.assertEqual(info["review_count"], 2)
+        self.assertEqual(info["average_rating"], 2.5)
+        self.assertEqual(info["offer_count"], 1)
+        self.assertEqual(info["business_profile_count"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review.rating = 5
+            review.save()
+            profile = self.customer.profile
+            profile.type = "business"
+            profile.save()
+
+        info = self.get_base_info()
+        self.assertEqual(info["average_rating"], 4.5)
+        self.assertEqual(info["business_profile_count"], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review.delete()
+            Offer.objects.all().delete()
+            other_customer.delete()
+
+        self.assertEqual(
+            self.get_base_info(),
+            {
+                "review_count": 1,
+                "average_rating": 4.0,
+                "business_profile_count": 2,
+                "offer_count": 0,
+            },
+        )
+
+    def test_async_view_matches_sync_view(self):
+        expected = self.client.get(reverse("base-info"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("async-base-info"))
+        self.assertEqual(response.content, expected.content)
+
+    def test_reconcile_command_corrects_drift(self):
+        self.get_base_info()
+        cache.set(counters.OFFER_COUNT, 42)
+        call_command("reconcile_base_info", stdout=StringIO())
+        self.assertEqual(self.get_base_info()["offer_count"], 0)
+
+
+class ConditionalGetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = User.objects.create_user(username="business", password="secret")
+        UserProfile.objects.create(user=cls.business, type="business")
+        cls.offer = Offer.objects.create(
+            user=cls.business, title="Offer", min_price=10, min_delivery_time=1
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.business)
+
+    def test_unchanged_offer_list_returns_304_without_serializing(self):
+        url = reverse("offer-list-create")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_changed_offer_invalidates_etag(self):
+        url = reverse("offer-detail", args=[self.offer.pk])
+        etag = self.client.get(url)["ETag"]
+
+        self.offer.title = "Changed"
+        self.offer.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_lists_revalidate_deletes_by_etag_only(self):
+        Offer.objects.create(user=self.business, title="Second", min_price=10, min_delivery_time=1)
+        url = reverse("offer-list-create")
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+
+        Offer.objects.filter(title="Second").delete()
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"], HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_edit_invalidates_offer_validators(self):
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Offer.objects.update(updated_at=an_hour_ago)
+        UserProfile.objects.update(updated_at=an_hour_ago)
+        list_url = reverse("offer-list-create")
+        detail_url = reverse("offer-detail", args=[self.offer.pk])
+        list_etag = self.client.get(list_url)["ETag"]
+        detail = self.client.get(detail_url)
+
+        response = self.client.patch(
+            reverse("userprofile-detail", args=[self.business.pk]), {"first_name": "Berta"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["user_details"]["first_name"], "Berta")
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["user_details"]["first_name"], "Berta")
+        response = self.client.get(detail_url, HTTP_IF_MODIFIED_SINCE=detail["Last-Modified"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_details_keep_last_modified(self):
+        url = reverse("offer-detail", args=[self.offer.pk])
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_query_parameters(self):
+        url = reverse("offer-list-create")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, {"min_price": 5}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_and_review_views(self):
+        for url in (
+            reverse("userprofile-detail", args=[self.business.pk]),
+            reverse("business-profiles-list"),
+            reverse("review-list-create"),
+        ):
+            etag = self.client.get(url)["ETag"]
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+
+    def test_missing_object_has_no_etag(self):
+        response = self.client.get(reverse("offer-details", args=[9999]))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+
+class BenchmarkSuiteTests(TestCase):
+    """
+    Keeps the benchmark suite runnable: every API route has a benchmark request that succeeds on seeded data.
+    """
+
+    def test_every_route_is_benchmarked_and_succeeds(self):
+        dataset = seed(business_users=2, customers=2, offers_per_business=4)
+        requests = build_requests(dataset)
+        self.assertEqual(get_route_names() - {request.route for request in requests}, set())
+
+        for request in requests:
+            response = send(self.client, dataset, request)
+            self.assertEqual(response.status_code, request.expected_status, request.key)
+
+
+class RequestMetricsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", password="secret", is_staff=True)
+        cls.business = User.objects.create_user(username="business", password="secret")
+        UserProfile.objects.create(user=cls.business, type="business")
+
+    def setUp(self):
+        registry.reset()
+
+    def test_server_timing_header_reports_queries(self):
+        response = self.client.get(reverse("order-count", args=[self.business.pk]))
+        timing = response["Server-Timing"]
+        self.assertIn('desc="1 queries"', timing)
+        for metric in ("db;", "db-slowest;", "serialize;", "render;", "total;"):
+            self.assertIn(metric, timing)
+
+    def test_serializer_output_is_measured(self):
+        Offer.objects.create(user=self.business, title="Offer", min_price=10, min_delivery_time=1)
+        self.client.force_authenticate(self.business)
+        to_representation = OfferValuesSerializer.to_representation
+
+        def slow_to_representation(serializer, rows):
+            time.sleep(0.02)
+            return to_representation(serializer, rows)
+
+        slow = mock.patch.object(
+            OfferValuesSerializer, "to_representation", autospec=True, side_effect=slow_to_representation
+        )
+        with slow, self.assertLogs("base.metrics", "INFO") as logs:
+            response = self.client.get(reverse("offer-list-create"), {"page_size": 10})
+        self.assertEqual(response.status_code, 200)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertGreaterEqual(record["serialize_ms"], 20)
+        self.assertLessEqual(record["serialize_ms"], record["total_ms"])
+        serialize = next(part for part in response["Server-Timing"].split(", ") if part.startswith("serialize;"))
+        self.assertGreaterEqual(float(serialize.split("dur=")[1]), 20)
+
+        with self.assertLogs("base.metrics", "INFO") as logs:
+            self.client.get(reverse("offer-detail", args=[Offer.objects.get().pk]))
+        self.assertGreater(json.loads(logs.records[0].getMessage())["serialize_ms"], 0)
+
+    def test_metrics_are_aggregated_per_url_name(self):
+        self.client.force_authenticate(self.business)
+        for _ in range(3):
+            self.client.get(reverse("order-count", args=[self.business.pk]))
+        self.client.get(reverse("order-stats", args=[self.business.pk]))
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse("request-metrics"))
+        routes = response.data["routes"]
+        self.assertEqual(routes["order-count"]["count"], 3)
+        self.assertEqual(routes["order-count"]["queries"]["max"], 1)
+        self.assertIn("SELECT", routes["order-stats"]["slowest_query"])
+
+        self.client.delete(reverse("request-metrics"))
+        self.assertNotIn("order-count", self.client.get(reverse("request-metrics")).data["routes"])
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.client.force_authenticate(self.business)
+        response = self.client.get(reverse("request-metrics"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_middleware_runs_natively_under_asgi(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(RequestMetricsMiddleware(get_response)))
+        self.assertFalse(iscoroutinefunction(RequestMetricsMiddleware(lambda request: HttpResponse())))
+
+    async def test_async_views_are_measured(self):
+        await Offer.objects.acreate(user=self.business, title="Offer", min_price=10, min_delivery_time=1)
+        response = await self.async_client.get(reverse("async-offer-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+
+    def test_streamed_bodies_are_measured(self):
+        customer = User.objects.create_user(username="customer", password="secret")
+        UserProfile.objects.create(user=customer, type="customer")
+        self.client.force_authenticate(customer)
+        response = self.client.get(reverse("order-create"), {"stream": "true"})
+        self.assertNotIn("order-create", registry.snapshot()["routes"])
+
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
+        route = registry.snapshot()["routes"]["order-create"]
+        self.assertEqual(route["count"], 1)
+        self.assertGreaterEqual(route["queries"]["max"], 1)
+        self.assertIn("orders_order", route["slowest_query"])
+
+    @override_settings(REQUEST_METRICS={"SLOW_REQUEST_MS": 0})
+    def test_slow_requests_are_logged_as_warning(self):
+        with self.assertLogs("base.metrics", "WARNING") as logs:
+            self.client.get(reverse("order-count", args=[self.business.pk]))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["url_name"], "order-count")
+        self.assertEqual(record["queries"], 1)
+
+
+def image_upload(name="bild.png", size=(1200, 800), color=(200, 40, 40, 255)):
+    buffer = BytesIO()
+    Image.new("RGBA", size, color).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class ImageVariantTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = User.objects.create_user(username="business", password="secret")
+        cls.profile = UserProfile.objects.create(user=cls.business, type="business")
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root, MEDIA_CLEANUP={"RELEASE_GRACE_SECONDS": 0})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+
+    def create_offer(self, image):
+        offer = Offer.objects.create(
+            user=self.business, title="Offer", image=image, min_price=10, min_delivery_time=1
+        )
+        run_pending()
+        return offer
+
+    def test_variants_are_rendered_per_width_and_format(self):
+        offer = self.create_offer(image_upload())
+        offer.refresh_from_db()
+
+        self.assertEqual(offer.image_variants["source"], offer.image.name)
+        for format in ("webp", "jpeg"):
+            self.assertEqual(list(offer.image_variants[format]), ["320", "640", "1024"])
+            for width, name in offer.image_variants[format].items():
+                with default_storage.open(name) as file, Image.open(file) as image:
+                    self.assertEqual(image.width, int(width))
+                    self.assertEqual(image.format, format.upper())
+
+    def test_small_images_are_not_upscaled(self):
+        offer = self.create_offer(image_upload(size=(200, 100)))
+        offer.refresh_from_db()
+        self.assertEqual(list(offer.image_variants["webp"]), ["200"])
+
+    def test_serializers_expose_srcset_map(self):
+        offer = self.create_offer(image_upload())
+        response = self.client.get(reverse("offer-detail", args=[offer.pk]))
+        srcset = response.data["image_srcset"]
+        self.assertEqual(list(srcset), ["webp", "jpeg"])
+        self.assertEqual(list(srcset["webp"]), ["320w", "640w", "1024w"])
+        self.assertTrue(srcset["jpeg"]["640w"].startswith("http://testserver/"))
+
+        self.profile.file = image_upload("profil.png")
+        self.profile.save()
+        run_pending()
+        self.client.force_authenticate(self.business)
+        response = self.client.get(reverse("business-profiles-list"))
+        srcset = response.data[0]["file_srcset"]
+        self.assertTrue(srcset["webp"]["320w"].startswith("media/profile_pics/variants/"))
+
+    def test_replacing_and_removing_the_image_cleans_up_variants(self):
+        offer = self.create_offer(image_upload())
+        offer.refresh_from_db()
+        old_files = list(offer.image_variants["jpeg"].values())
+
+        old_image = offer.image.name
+        offer.image = image_upload("neu.png", color=(40, 200, 40, 255))
+        offer.save()
+        run_pending()
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants["source"], offer.image.name)
+        self.assertNotEqual(offer.image.name, old_image)
+        self.assertFalse(default_storage.exists(old_image))
+        self.assertFalse(any(default_storage.exists(name) for name in old_files))
+
+        offer.image = None
+        offer.save()
+        run_pending()
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants, {})
+
+    def test_unrelated_saves_do_not_rerender(self):
+        offer = self.create_offer(image_upload())
+        offer.refresh_from_db()
+        offer.title = "Changed"
+        offer.save()
+        self.assertFalse(
+            Task.objects.filter(name=build_variants.task_name, status=Task.QUEUED).exists()
+        )
+
+    def test_deleting_the_offer_removes_variant_files(self):
+        offer = self.create_offer(image_upload())
+        offer.refresh_from_db()
+        files = list(offer.image_variants["webp"].values())
+        offer.delete()
+        self.assertTrue(all(default_storage.exists(name) for name in files))
+        run_pending()
+        self.assertFalse(any(default_storage.exists(name) for name in files))
+
+
+class ContentHashStorageTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = User.objects.create_user(username="business", password="secret")
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root, MEDIA_CLEANUP={"RELEASE_GRACE_SECONDS": 0})
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def create_offer(self, image=None):
+        return Offer.objects.create(
+            user=self.business, title="Offer", image=image, min_price=10, min_delivery_time=1
+        )
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.create_offer(image_upload("a.png"))
+        path = default_storage.path(first.image.name)
+        with open(path, "rb") as file:
+            content = file.read()
+        os.utime(path, (0, 0))
+        second = self.create_offer(image_upload("b.PNG"))
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertRegex(first.image.name, r"^offers_images/[0-9a-f]{64}\.png$")
+        self.assertEqual(default_storage.listdir("offers_images")[1], [first.image.name.split("/")[1]])
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), content)
+        self.assertGreater(os.stat(path).st_mtime, 0)
+
+    @override_settings(MEDIA_CLEANUP={"RELEASE_GRACE_SECONDS": 60})
+    def test_files_saved_while_being_released_are_kept(self):
+        offer = self.create_offer(image_upload())
+        run_pending()
+        name = offer.image.name
+        os.utime(default_storage.path(name), (0, 0))
+        offer.delete()
+
+        # An upload of the same content reuses the file, but its row is not committed before the release runs.
+        self.assertEqual(content_hash_storage.save("offers_images/upload.png", image_upload()), name)
+        self.assertEqual(run_pending(), 1)
+        self.assertTrue(default_storage.exists(name))
+        retry = Task.objects.get(name=release_files.task_name, status=Task.QUEUED)
+        self.assertEqual(retry.args, [[name]])
+
+        # Without a row referencing it after the grace period, the file is deleted.
+        os.utime(default_storage.path(name), (0, 0))
+        Task.objects.filter(pk=retry.pk).update(run_after=timezone.now())
+        self.assertEqual(run_pending(), 1)
+        self.assertFalse(default_storage.exists(name))
+
+    def test_files_are_deleted_with_their_last_reference(self):
+        first = self.create_offer(image_upload())
+        second = self.create_offer(image_upload())
+        run_pending()
+        second.refresh_from_db()
+        self.assertEqual(second.image_variants["source"], first.image.name)
+        variants = images.variant_files(second.image_variants)
+
+        first.delete()
+        run_pending()
+        self.assertTrue(default_storage.exists(second.image.name))
+        self.assertTrue(all(default_storage.exists(name) for name in variants))
+
+        second.delete()
+        run_pending()
+        self.assertFalse(default_storage.exists(second.image.name))
+        self.assertFalse(any(default_storage.exists(name) for name in variants))
+
+    def test_dedupe_command_merges_duplicates_and_removes_orphans(self):
+        content = image_upload().read()
+        legacy = [default_storage.save("offers_images/bild.png", ContentFile(content)) for _ in range(2)]
+        orphan = default_storage.save("offers_images/alt.png", ContentFile(b"orphan"))
+        orphan_variant = default_storage.save("offers_images/variants/alt_320w.jpg", ContentFile(b"x"))
+        offers = [self.create_offer() for _ in legacy]
+        for offer, name in zip(offers, legacy):
+            Offer.objects.filter(pk=offer.pk).update(image=name)
+
+        call_command("dedupe_media", "--dry-run", stdout=StringIO())
+        self.assertTrue(all(default_storage.exists(name) for name in [*legacy, orphan]))
+
+        call_command("dedupe_media", stdout=StringIO())
+        names = set(Offer.objects.values_list("image", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertEqual(default_storage.listdir("offers_images")[1], [names.pop().split("/")[1]])
+        self.assertFalse(default_storage.exists(orphan_variant))
+
+        run_pending()
+        self.assertTrue(all(offer.image_variants for offer in Offer.objects.all()))
+
+
+class FastJSONTests(APITestCase):
+    data = {
+        "price": Decimal("120.50"),
+        "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        "local": datetime(2024, 5, 1, 14, 30, tzinfo=dt_timezone(timedelta(hours=2))),
+        "naive": datetime(2024, 5, 1, 12, 30),
+        "day": date(2024, 5, 1),
+        "duration": timedelta(minutes=90),
+        "features": ["Logo", {"Größe": "XL", "count": 3}],
+        "label": gettext_lazy("Not found."),
+        "stats": {1: {"avg": 4.333333333333333}},
+        "separator": "a\u2028b\u2029c",
+        "nothing": None,
+    }
+
+    def test_renders_like_drf(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_falls_back_to_drf_for_indent_and_without_orjson(self):
+        context = {"indent": 4}
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, renderer_context=context),
+            JSONRenderer().render(self.data, renderer_context=context),
+        )
+        with mock.patch("base.api.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_parser_matches_drf(self):
+        body = '{"title": "Größe", "details": [{"price": 1.5, "features": []}]}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body))
+        )
+        for invalid in (b"{", b'{"price": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(BytesIO(invalid))
+
+    def test_api_responses_match_drf_renderer(self):
+        user = User.objects.create_user(username="business", password="secret")
+        UserProfile.objects.create(user=user, type="business")
+        Offer.objects.create(user=user, title="Größe ", min_price=Decimal("9.90"), min_delivery_time=3)
+        response = self.client.get(reverse("offer-list-create"))
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+        response = self.client.post(
+            reverse("login"), {"username": "business", "password": "secret"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+
+class ValuesSerializerTests(APITestCase):
+    """
+    The list GETs build their rows from `.values()`; the JSON must be byte-for-byte the same as with the
+    model serializers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = User.objects.create_user(username="business", first_name="Anna", password="secret")
+        UserProfile.objects.create(user=cls.business, type="business")
+        cls.customer = User.objects.create_user(username="customer", password="secret")
+        UserProfile.objects.create(user=cls.customer, type="customer")
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root, MEDIA_CLEANUP={"RELEASE_GRACE_SECONDS": 0})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+
+        with_image = Offer.objects.create(
+            user=self.business, title="Logo", image=image_upload(), min_price=10, min_delivery_time=1
+        )
+        Offer.objects.create(
+            user=self.business, title="Größe ", min_price=Decimal("9.90"), min_delivery_time=3
+        )
+        for offer_type, price in (("premium", "300.00"), ("basic", "99.90")):
+            OfferDetail.objects.create(
+                offer=with_image,
+                title=f"Logo {offer_type}",
+                revisions=-1,
+                delivery_time_in_days=2,
+                price=Decimal(price),
+                features=["Logo", {"Format": "SVG"}],
+                offer_type=offer_type,
+            )
+        run_pending()
+
+        Order.objects.create(
+            customer_user=self.customer,
+            business_user=self.business,
+            title="Logo",
+            delivery_time_in_days=2,
+            price=Decimal("99.90"),
+            features=["Logo"],
+            offer_type="basic",
+            status="in_progress",
+        )
+        Review.objects.create(
+            business_user=self.business, reviewer=self.customer, rating=4, description="Gut "
+        )
+
+    def expected_content(self, serializer_class, objects, request):
+        return JSONRenderer().render(
+            serializer_class(objects, many=True, context={"request": request}).data
+        )
+
+    def test_rows_serialize_like_model_serializers(self):
+        request = self.client.get("/").wsgi_request
+        for values_serializer_class, queryset in (
+            (OfferValuesSerializer, Offer.objects.with_related().order_by("id")),
+            (OrderValuesSerializer, Order.objects.order_by("id")),
+            (ReviewValuesSerializer, Review.objects.order_by("id")),
+        ):
+            with self.subTest(serializer=values_serializer_class.__name__):
+                values_serializer = values_serializer_class(context={"request": request})
+                rows = values_serializer.values(queryset)
+                self.assertEqual(
+                    JSONRenderer().render(values_serializer.to_representation(rows)),
+                    self.expected_content(values_serializer.serializer_class, queryset, request),
+                )
+
+    def test_list_endpoints_return_the_same_bytes(self):
+        self.client.force_authenticate(self.customer)
+        offers = Offer.objects.with_related()
+        for url, params, serializer_class, queryset in (
+            ("order-create", {}, OrderSerializer, Order.objects.order_by("-created_at")),
+            ("review-list-create", {}, ReviewSerializer, Review.objects.all()),
+            ("offer-list-create", {"ordering": "min_price"}, OfferSerializer, offers.order_by("min_price")),
+            ("offer-list-create", {"pagination": "cursor"}, OfferSerializer, offers.order_by("-updated_at")),
+        ):
+            with self.subTest(url=url, params=params):
+                response = self.client.get(reverse(url), params)
+                self.assertEqual(response.status_code, 200)
+                results = response.data["results"] if isinstance(response.data, dict) else response.data
+                self.assertEqual(
+                    JSONRenderer().render(results),
+                    self.expected_content(serializer_class, queryset, response.wsgi_request),
+                )
+
+        offer = next(offer for offer in response.data["results"] if offer["title"] == "Logo")
+        self.assertTrue(offer["image"].startswith("http://testserver/media/offers_images/"))
+        self.assertEqual(list(offer["image_srcset"]), ["webp", "jpeg"])
+        self.assertEqual([detail["offer_type"] for detail in offer["details"]], ["premium", "basic"])
+        self.assertEqual(offer["user_details"]["first_name"], "Anna")
+
+
+@override_settings(DATABASE_REPLICAS={"ALIASES": ["default"], "STICKY_SECONDS": 10})
+class ReplicaRoutingTests(APITransactionTestCase):
+    """
+    Sends requests through the whole middleware and DRF stack. The primary doubles as replica alias, so the
+    tests record which reads the router sends to a replica. Reads inside a transaction stay on the primary,
+    hence the transaction test case.
+    """
+
+    def setUp(self):
+        for username in ("anna", "ben"):
+            self.client.post(reverse("registration"), self.registration(username), format="json")
+        self.anna, self.ben = User.objects.order_by("id")
+        cache.clear()
+
+    def registration(self, username):
+        return {
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "secret-pass",
+            "repeated_password": "secret-pass",
+            "type": "customer",
+        }
+
+    @contextmanager
+    def recording_replica_reads(self):
+        """
+        Collects the labels of the models the router reads from a replica.
+        """
+        reads = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def recording_db_for_read(router, model, **hints):
+            alias = db_for_read(router, model, **hints)
+            if alias is not None:
+                reads.append(model._meta.label)
+            return alias
+
+        with mock.patch.object(ReplicaRouter, "db_for_read", recording_db_for_read):
+            yield reads
+
+    def replica_reads(self, method, url, user=None, **kwargs):
+        self.client.credentials(**({"HTTP_AUTHORIZATION": f"Token {user.auth_token.key}"} if user else {}))
+        with self.recording_replica_reads() as reads:
+            response = getattr(self.client, method)(url, format="json", **kwargs)
+        self.assertLess(response.status_code, 400)
+        self.assertIsNone(replicas.current_request.get())
+        return reads
+
+    def test_reads_of_read_apps_go_to_the_replica(self):
+        self.assertIn("offers.Offer", self.replica_reads("get", reverse("offer-list-create")))
+        self.assertIn("profiles.UserProfile", self.replica_reads("get", reverse("userprofile-list"), user=self.ben))
+        self.assertEqual(self.replica_reads("get", reverse("order-create"), user=self.anna), [])
+
+        reads = self.replica_reads("get", reverse("userprofile-detail", args=[self.ben.pk]), user=self.anna)
+        self.assertIn("profiles.UserProfile", reads)
+        self.assertNotIn("authtoken.Token", reads)
+
+    def test_async_views_read_from_the_replica(self):
+        with self.recording_replica_reads() as reads:
+            response = async_to_sync(self.async_client.get)(reverse("async-offer-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("offers.Offer", reads)
+
+    def test_registered_users_read_from_the_primary(self):
+        response = self.client.post(reverse("registration"), self.registration("clara"), format="json")
+        clara = User.objects.get(pk=response.data["user_id"])
+        url = reverse("userprofile-detail", args=[clara.pk])
+        self.assertEqual(self.replica_reads("get", url, user=clara), [])
+        self.assertIn("profiles.UserProfile", self.replica_reads("get", url, user=self.anna))
+
+    def test_writes_make_reads_of_the_user_sticky(self):
+        url = reverse("userprofile-detail", args=[self.anna.pk])
+        self.replica_reads("patch", url, user=self.anna, data={"location": "Berlin"})
+        self.assertEqual(self.replica_reads("get", url, user=self.anna), [])
+        self.assertIn("profiles.UserProfile", self.replica_reads("get", url, user=self.ben))
+
+        with override_settings(DATABASE_REPLICAS={"ALIASES": ["default"], "STICKY_SECONDS": 0}):
+            cache.clear()
+            self.replica_reads("patch", url, user=self.anna, data={"location": "Hamburg"})
+            self.assertIn("profiles.UserProfile", self.replica_reads("get", url, user=self.anna))
+
+    def test_writes_switch_the_request_to_the_primary(self):
+        request = RequestFactory().get("/")
+        request.replica_allowed = True
+        token = replicas.current_request.set(request)
+        self.addCleanup(replicas.current_request.reset, token)
+
+        self.assertEqual(ReplicaRouter().db_for_read(Offer), "default")
+        self.anna.profile.save()
+        self.assertIsNone(ReplicaRouter().db_for_read(Offer))
+
+    @override_settings(DATABASE_REPLICAS={"ALIASES": []})
+    def test_router_is_inactive_without_replicas(self):
+        self.assertEqual(self.replica_reads("get", reverse("offer-list-create")), [])
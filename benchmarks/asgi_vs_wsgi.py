@@ -0,0 +1,130 @@
+"""
+Compares the WSGI and the ASGI handler under the same number of concurrent clients. Each handler serves
+the same view code: every endpoint is measured once with its DRF view and once with its async view, both
+through WSGI and through ASGI, so the numbers of one view differ only in the handler.
+
+The WSGI side drives `django.test.Client` from a thread pool, one request per worker at a time; the ASGI
+side drives `django.test.AsyncClient` with `asyncio.gather` on one event loop. Both run against a throwaway
+test database seeded by `benchmarks.seed`. The cache of the DRF offer list (`OFFER_LIST_CACHE_TIMEOUT`) is
+disabled for the run, since the async offer list has none.
+
+Usage:
+    python -m benchmarks.asgi_vs_wsgi --requests 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "coderr_hub.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import AsyncClient, Client, override_settings  # noqa: E402
+from benchmarks.seed import seed, test_database  # noqa: E402
+
+
+def get_routes(business_user_id, offer_id):
+    """
+    Pairs of (DRF view URL, async view URL) for each benchmarked endpoint.
+    """
+    return {
+        "offer-list": ("/api/offers/?page_size=6", "/api/async/offers/?page_size=6"),
+        "offer-detail": (f"/api/offers/{offer_id}/", f"/api/async/offers/{offer_id}/"),
+        "base-info": ("/api/base-info/", "/api/async/base-info/"),
+        "order-count": (
+            f"/api/order-count/{business_user_id}/",
+            f"/api/async/order-count/{business_user_id}/",
+        ),
+        "order-stats": (
+            f"/api/order-stats/{business_user_id}/",
+            f"/api/async/order-stats/{business_user_id}/",
+        ),
+        "review-list": ("/api/reviews/", "/api/async/reviews/"),
+    }
+
+
+def summarize(latencies, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def run_wsgi(url, token, requests, concurrency):
+    headers = {"Authorization": f"Token {token}"}
+
+    def fetch(_):
+        client = Client()
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, (url, response.status_code)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(fetch, range(requests)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_asgi(url, token, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    client = AsyncClient()
+    headers = {"Authorization": f"Token {token}"}
+
+    async def fetch():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            assert response.status_code == 200, (url, response.status_code)
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(fetch() for _ in range(requests)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and handler.")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients.")
+    parser.add_argument("--business-users", type=int, default=10)
+    parser.add_argument("--offers-per-business", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    with test_database(), override_settings(OFFER_LIST_CACHE_TIMEOUT=0):
+        dataset = seed(
+            business_users=args.business_users, offers_per_business=args.offers_per_business
+        )
+        token = dataset.token(dataset.customer_ids[0])
+        routes = get_routes(dataset.business_ids[0], dataset.offer_ids[0])
+        results = {}
+        for name, urls in routes.items():
+            results[name] = {
+                view: {
+                    "wsgi": run_wsgi(url, token, args.requests, args.concurrency),
+                    "asgi": asyncio.run(run_asgi(url, token, args.requests, args.concurrency)),
+                }
+                for view, url in zip(("drf_view", "async_view"), urls)
+            }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compares the orjson-backed `FastJSONRenderer`/`FastJSONParser` with DRF's stdlib `JSONRenderer`/`JSONParser`.
+
+The payloads are the serialized data of real API responses (large offer, order and review lists) from a
+throwaway test database seeded by `benchmarks.seed`, so only the encoding and decoding are timed.
+Every payload is checked to render to the same bytes with both renderers.
+
+Usage:
+    python -m benchmarks.renderers --iterations 200 --offers-per-business 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from io import BytesIO
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "coderr_hub.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import Client  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from base.api.parsers import FastJSONParser  # noqa: E402
+from base.api.renderers import FastJSONRenderer, orjson  # noqa: E402
+from benchmarks.seed import seed, test_database  # noqa: E402
+
+
+def get_payloads(dataset):
+    """
+    The `data` of a few large list responses, keyed by name.
+    """
+    client = Client()
+    headers = {"Authorization": f"Token {dataset.token(dataset.customer_ids[0])}"}
+    urls = {
+        "offer-list": "/api/offers/?page_size=100",
+        "order-list": "/api/orders/",
+        "review-list": "/api/reviews/",
+        "business-profiles": "/api/profiles/business/",
+    }
+    payloads = {}
+    for name, url in urls.items():
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, (url, response.status_code)
+        payloads[name] = response.data
+    return payloads
+
+
+def time_per_call(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+def compare(payload, iterations):
+    stdlib, fast = JSONRenderer(), FastJSONRenderer()
+    content = stdlib.render(payload)
+    assert fast.render(payload) == content, "FastJSONRenderer output differs from JSONRenderer"
+
+    results = {"bytes": len(content)}
+    for operation, baseline, candidate in (
+        ("render", lambda: stdlib.render(payload), lambda: fast.render(payload)),
+        (
+            "parse",
+            lambda: JSONParser().parse(BytesIO(content)),
+            lambda: FastJSONParser().parse(BytesIO(content)),
+        ),
+    ):
+        baseline_time = time_per_call(baseline, iterations)
+        candidate_time = time_per_call(candidate, iterations)
+        results[operation] = {
+            "stdlib_ms": round(baseline_time * 1000, 3),
+            "orjson_ms": round(candidate_time * 1000, 3),
+            "speedup": round(baseline_time / candidate_time, 2),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per payload and implementation.")
+    parser.add_argument("--business-users", type=int, default=10)
+    parser.add_argument("--customers", type=int, default=10)
+    parser.add_argument("--offers-per-business", type=int, default=20)
+    parser.add_argument("--orders-per-customer", type=int, default=50)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    if orjson is None:
+        sys.exit("orjson is not installed; both implementations would use the standard library.")
+
+    with test_database():
+        dataset = seed(
+            business_users=args.business_users,
+            customers=args.customers,
+            offers_per_business=args.offers_per_business,
+            orders_per_customer=args.orders_per_customer,
+        )
+        payloads = get_payloads(dataset)
+
+    results = {name: compare(payload, args.iterations) for name, payload in payloads.items()}
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+Benchmarks every API route on a seeded throwaway database and writes the results as JSON.
+
+For each request the runner records latency percentiles, the number of SQL queries and the memory allocated
+while handling it (tracemalloc peak, measured in a separate pass so tracing does not skew the latencies).
+Writes run inside a transaction that is rolled back, so every iteration sees the same data.
+Routes of `coderr_hub.urls` without a request below make the run fail, so new endpoints cannot be forgotten.
+
+Usage:
+    python -m benchmarks.run --business-users 50 --output results.json
+    python -m benchmarks.run --output new.json --baseline results.json --max-regression 1.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "coderr_hub.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.urls import URLPattern, URLResolver, get_resolver, reverse  # noqa: E402
+from benchmarks.seed import PASSWORD, seed, test_database  # noqa: E402
+
+# URL names that are not part of the public API.
+IGNORED_ROUTES = {"logout", "request-metrics", "task-queue"}
+
+
+@dataclass
+class BenchmarkRequest:
+    route: str
+    method: str
+    path: str
+    user_id: int = None
+    data: dict = None
+    expected_status: int = 200
+    query: dict = field(default_factory=dict)
+
+    @property
+    def key(self):
+        return f"{self.method} {self.route}" + (f" {self.query_string}" if self.query else "")
+
+    @property
+    def query_string(self):
+        return "&".join(f"{name}={value}" for name, value in self.query.items())
+
+
+def get_route_names():
+    """
+    Collects the names of all routes below `/api/`.
+    """
+    names = set()
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, route)
+            elif isinstance(pattern, URLPattern) and pattern.name and route.startswith("api/"):
+                names.add(pattern.name)
+
+    walk(get_resolver().url_patterns, "")
+    return names - IGNORED_ROUTES
+
+
+def build_requests(dataset):
+    """
+    The benchmarked requests: every read route and the main writes, authenticated as a seeded user.
+    """
+    business = dataset.business_ids[0]
+    customer = dataset.customer_ids[0]
+    offer = dataset.offer_ids[0]
+    detail = dataset.offer_detail_ids[0]
+    order = dataset.order_ids[0]
+    review = dataset.review_ids[0]
+    stats_ids = ",".join(str(pk) for pk in dataset.business_ids[:20])
+    offer_payload = {
+        "title": "Benchmark Angebot",
+        "description": "Beschreibung",
+        "details": [
+            {
+                "title": offer_type,
+                "revisions": 1,
+                "delivery_time_in_days": 10 - index,
+                "price": 100 + index * 50,
+                "features": ["Feature"],
+                "offer_type": offer_type,
+            }
+            for index, offer_type in enumerate(("basic", "standard", "premium"))
+        ],
+    }
+
+    def request(route, method="GET", args=(), **kwargs):
+        return BenchmarkRequest(route, method, reverse(route, args=args), **kwargs)
+
+    return [
+        request(
+            "registration",
+            "POST",
+            data={
+                "username": "bench-new",
+                "email": "bench-new@example.com",
+                "password": PASSWORD,
+                "repeated_password": PASSWORD,
+                "type": "customer",
+            },
+            expected_status=201,
+        ),
+        request("login", "POST", data={"username": "bench-customer-0", "password": PASSWORD}),
+        request("userprofile-list", user_id=customer),
+        request("userprofile-detail", args=[business], user_id=customer),
+        request(
+            "userprofile-detail",
+            "PATCH",
+            args=[customer],
+            user_id=customer,
+            data={"location": "Berlin"},
+        ),
+        request("customer-profiles-list", user_id=business),
+        request("business-profiles-list", user_id=customer),
+        request("offer-list-create"),
+        request("offer-list-create", query={"page": 2, "ordering": "min_price"}),
+        request("offer-list-create", query={"search": "design"}),
+        request("offer-list-create", query={"pagination": "cursor", "page_size": 20}),
+        request(
+            "offer-list-create", "POST", user_id=business, data=offer_payload, expected_status=201
+        ),
+        request(
+            "offer-import",
+            "POST",
+            user_id=business,
+            data=[offer_payload] * 20,
+            expected_status=201,
+        ),
+        request("offer-detail", args=[offer]),
+        request(
+            "offer-detail",
+            "PATCH",
+            args=[offer],
+            user_id=dataset.business_ids[0],
+            data={"details": [{"offer_type": "basic", "price": 10}]},
+        ),
+        request("offer-details", args=[detail], user_id=customer),
+        request("async-offer-list"),
+        request("async-offer-detail", args=[offer]),
+        request("order-create", user_id=customer),
+        request("order-create", user_id=business, query={"page_size": 20}),
+        request(
+            "order-create",
+            "POST",
+            user_id=customer,
+            data={"offer_detail_id": detail},
+            expected_status=201,
+        ),
+        request("orders-detail", args=[order], user_id=customer),
+        request(
+            "orders-detail",
+            "PATCH",
+            args=[order],
+            user_id=business,
+            data={"status": "completed"},
+        ),
+        request("order-count", args=[business]),
+        request("completed-order-count", args=[business]),
+        request("order-stats", args=[business], user_id=business),
+        request("order-stats-batch", query={"business_user_ids": stats_ids}, user_id=business),
+        request("async-order-count", args=[business]),
+        request("async-completed-order-count", args=[business]),
+        request("async-order-stats", args=[business], user_id=business),
+        request("async-order-stats-batch", query={"business_user_ids": stats_ids}, user_id=business),
+        request("review-list-create", user_id=customer),
+        request(
+            "review-list-create",
+            user_id=customer,
+            query={"business_user_id": business, "page_size": 20},
+        ),
+        request(
+            "review-list-create",
+            "POST",
+            user_id=dataset.fresh_customer_id,
+            data={"business_user": business, "rating": 4, "description": "Benchmark"},
+            expected_status=201,
+        ),
+        request("review-detail", args=[review], user_id=customer),
+        request("async-review-list", user_id=customer),
+        request("base-info"),
+        request("async-base-info"),
+    ]
+
+
+def send(client, dataset, benchmark_request):
+    headers = {}
+    if benchmark_request.user_id is not None:
+        headers["Authorization"] = f"Token {dataset.token(benchmark_request.user_id)}"
+
+    method = getattr(client, benchmark_request.method.lower())
+    if benchmark_request.method == "GET":
+        return method(benchmark_request.path, benchmark_request.query, headers=headers)
+
+    with transaction.atomic():
+        response = method(
+            benchmark_request.path + (f"?{benchmark_request.query_string}" if benchmark_request.query else ""),
+            benchmark_request.data,
+            content_type="application/json",
+            headers=headers,
+        )
+        transaction.set_rollback(True)
+    return response
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def measure(client, dataset, benchmark_request, iterations, warmup, allocation_samples):
+    cache.clear()
+    started = time.perf_counter()
+    response = send(client, dataset, benchmark_request)
+    cold = time.perf_counter() - started
+
+    for _ in range(warmup):
+        send(client, dataset, benchmark_request)
+
+    latencies = []
+    query_counts = []
+    statuses = {response.status_code}
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = send(client, dataset, benchmark_request)
+            latencies.append(time.perf_counter() - started)
+        query_counts.append(len(queries))
+        statuses.add(response.status_code)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(allocation_samples):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            send(client, dataset, benchmark_request)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "method": benchmark_request.method,
+        "path": benchmark_request.path,
+        "query": benchmark_request.query,
+        "status": sorted(statuses),
+        "cold_ms": round(cold * 1000, 3),
+        "latency_ms": {
+            name: round(value * 1000, 3)
+            for name, value in (
+                ("min", min(latencies)),
+                ("p50", percentile(latencies, 0.5)),
+                ("p90", percentile(latencies, 0.9)),
+                ("p95", percentile(latencies, 0.95)),
+                ("p99", percentile(latencies, 0.99)),
+                ("max", max(latencies)),
+                ("mean", statistics.fmean(latencies)),
+            )
+        },
+        "queries": {
+            "min": min(query_counts),
+            "median": statistics.median(query_counts),
+            "max": max(query_counts),
+        },
+        "allocations_kib": {
+            "peak_median": round(statistics.median(peaks) / 1024, 1),
+            "peak_max": round(max(peaks) / 1024, 1),
+        },
+    }
+
+
+def compare(results, baseline, max_regression):
+    """
+    Returns the regressions against a previous run: slower p50 latency beyond `max_regression`
+    or more queries per request.
+    """
+    regressions = []
+    for key, result in results["routes"].items():
+        previous = baseline.get("routes", {}).get(key)
+        if not previous:
+            continue
+        if result["latency_ms"]["p50"] > previous["latency_ms"]["p50"] * max_regression:
+            regressions.append(
+                f"{key}: p50 {previous['latency_ms']['p50']} ms -> {result['latency_ms']['p50']} ms"
+            )
+        if result["queries"]["max"] > previous["queries"]["max"]:
+            regressions.append(
+                f"{key}: queries {previous['queries']['max']} -> {result['queries']['max']}"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--business-users", type=int, default=10)
+    parser.add_argument("--customers", type=int, default=10)
+    parser.add_argument("--offers-per-business", type=int, default=5)
+    parser.add_argument("--orders-per-customer", type=int, default=5)
+    parser.add_argument("--reviews-per-customer", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the dataset.")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--allocation-samples", type=int, default=3)
+    parser.add_argument("--route", action="append", help="Only benchmark these route names.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", help="Compare against the JSON results of a previous run.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=1.25,
+        help="Allowed p50 latency factor against the baseline.",
+    )
+    args = parser.parse_args(argv)
+
+    with test_database():
+        dataset = seed(
+            business_users=args.business_users,
+            customers=args.customers,
+            offers_per_business=args.offers_per_business,
+            orders_per_customer=args.orders_per_customer,
+            reviews_per_customer=args.reviews_per_customer,
+            random_seed=args.seed,
+        )
+        requests = build_requests(dataset)
+
+        missing = get_route_names() - {benchmark_request.route for benchmark_request in requests}
+        if missing and not args.route:
+            sys.exit(f"Routes without benchmark requests: {', '.join(sorted(missing))}")
+
+        client = Client()
+        routes = {}
+        failures = []
+        for benchmark_request in requests:
+            if args.route and benchmark_request.route not in args.route:
+                continue
+            result = measure(
+                client,
+                dataset,
+                benchmark_request,
+                args.iterations,
+                args.warmup,
+                args.allocation_samples,
+            )
+            routes[benchmark_request.key] = result
+            if result["status"] != [benchmark_request.expected_status]:
+                failures.append(f"{benchmark_request.key}: status {result['status']}")
+            sys.stderr.write(
+                f"{benchmark_request.key:70} p50 {result['latency_ms']['p50']:8.2f} ms"
+                f"  queries {result['queries']['max']:3}\n"
+            )
+
+    results = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "iterations": args.iterations,
+            "dataset": dataset.summary(),
+        },
+        "routes": routes,
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+    problems = failures
+    if args.baseline:
+        with open(args.baseline) as file:
+            problems += compare(results, json.load(file), args.max_regression)
+    if problems:
+        sys.exit("\n".join(problems))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Seeds a synthetic, reproducible dataset for the benchmarks: business users with offers of three details each,
+customers with orders and reviews, and one token per user. Rows are inserted with bulk inserts; the
+denormalized data that signals normally maintain (search terms, rating summaries, base-info counters) is
+rebuilt afterwards, and queued background tasks are run. Django has to be set up before this module is imported.
+"""
+
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.authtoken.models import Token
+from base import counters
+from offers.api.models import Offer, OfferDetail
+from offers.signals import offers_bulk_created
+from orders.api.models import Order
+from profiles.api.models import UserProfile
+from reviews.api.models import BusinessRatingSummary, Review
+from tasks.queue import run_pending
+
+PASSWORD = "benchmark"
+OFFER_TYPES = ("basic", "standard", "premium")
+WORDS = (
+    "logo design website django react api backend frontend "
+    "branding seo copywriting video illustration mobile app shop"
+).split()
+CITIES = ("Berlin", "Hamburg", "München", "Köln", "Frankfurt", "Stuttgart")
+
+
+@dataclass
+class Dataset:
+    business_ids: list = field(default_factory=list)
+    customer_ids: list = field(default_factory=list)
+    offer_ids: list = field(default_factory=list)
+    offer_detail_ids: list = field(default_factory=list)
+    order_ids: list = field(default_factory=list)
+    review_ids: list = field(default_factory=list)
+    tokens: dict = field(default_factory=dict)
+    # A customer without orders or reviews, so write benchmarks never hit a unique constraint.
+    fresh_customer_id: int = None
+
+    def token(self, user_id):
+        return self.tokens[user_id]
+
+    def summary(self):
+        return {
+            "business_users": len(self.business_ids),
+            "customers": len(self.customer_ids),
+            "offers": len(self.offer_ids),
+            "offer_details": len(self.offer_detail_ids),
+            "orders": len(self.order_ids),
+            "reviews": len(self.review_ids),
+        }
+
+
+@contextmanager
+def test_database():
+    """
+    Creates a throwaway test database for the duration of the block and removes it afterwards.
+    """
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def create_users(prefix, count, type, password_hash):
+    users = User.objects.bulk_create(
+        User(username=f"{prefix}-{index}", email=f"{prefix}-{index}@example.com", password=password_hash)
+        for index in range(count)
+    )
+    UserProfile.objects.bulk_create(
+        UserProfile(
+            user=user,
+            type=type,
+            location=CITIES[index % len(CITIES)],
+            description=f"{type} {index}",
+        )
+        for index, user in enumerate(users)
+    )
+    return users
+
+
+def seed(
+    business_users=10,
+    customers=10,
+    offers_per_business=5,
+    orders_per_customer=5,
+    reviews_per_customer=3,
+    random_seed=0,
+):
+    """
+    Inserts the dataset and returns a `Dataset` with the IDs of everything created.
+    """
+    rng = random.Random(random_seed)
+    password_hash = make_password(PASSWORD)
+    dataset = Dataset()
+
+    businesses = create_users("bench-business", business_users, "business", password_hash)
+    buyers = create_users("bench-customer", customers + 1, "customer", password_hash)
+    fresh_customer = buyers.pop()
+    dataset.business_ids = [user.pk for user in businesses]
+    dataset.customer_ids = [user.pk for user in buyers]
+    dataset.fresh_customer_id = fresh_customer.pk
+
+    tokens = Token.objects.bulk_create(
+        Token(key=Token.generate_key(), user=user) for user in businesses + buyers + [fresh_customer]
+    )
+    dataset.tokens = {token.user_id: token.key for token in tokens}
+
+    offers = []
+    details = []
+    for business in businesses:
+        for _ in range(offers_per_business):
+            prices = sorted(rng.randint(20, 500) for _ in OFFER_TYPES)
+            delivery_times = sorted((rng.randint(1, 30) for _ in OFFER_TYPES), reverse=True)
+            offer = Offer(
+                user=business,
+                title=" ".join(rng.sample(WORDS, 3)).title(),
+                description=" ".join(rng.choices(WORDS, k=12)),
+                min_price=prices[0],
+                min_delivery_time=delivery_times[-1],
+            )
+            offers.append(offer)
+            details.extend(
+                OfferDetail(
+                    offer=offer,
+                    title=f"{offer.title} {offer_type}",
+                    revisions=rng.choice((-1, 1, 2, 3)),
+                    delivery_time_in_days=delivery_time,
+                    price=price,
+                    features=rng.sample(WORDS, 3),
+                    offer_type=offer_type,
+                )
+                for offer_type, price, delivery_time in zip(OFFER_TYPES, prices, delivery_times)
+            )
+    Offer.objects.bulk_create(offers)
+    OfferDetail.objects.bulk_create(details)
+    offers_bulk_created.send(sender=Offer, offers=offers)
+    dataset.offer_ids = [offer.pk for offer in offers]
+    dataset.offer_detail_ids = [detail.pk for detail in details]
+
+    orders = []
+    for customer in buyers:
+        for detail in rng.sample(details, min(orders_per_customer, len(details))):
+            orders.append(
+                Order(
+                    customer_user=customer,
+                    business_user=detail.offer.user,
+                    title=detail.offer.title,
+                    revisions=detail.revisions,
+                    delivery_time_in_days=detail.delivery_time_in_days,
+                    price=detail.price,
+                    features=detail.features,
+                    offer_type=detail.offer_type,
+                    status=rng.choice(("in_progress", "completed", "cancelled")),
+                )
+            )
+    dataset.order_ids = [order.pk for order in Order.objects.bulk_create(orders)]
+
+    reviews = []
+    for customer in buyers:
+        for business in rng.sample(businesses, min(reviews_per_customer, len(businesses))):
+            reviews.append(
+                Review(
+                    business_user=business,
+                    reviewer=customer,
+                    rating=rng.randint(1, 5),
+                    description=" ".join(rng.choices(WORDS, k=8)),
+                )
+            )
+    dataset.review_ids = [review.pk for review in Review.objects.bulk_create(reviews)]
+
+    BusinessRatingSummary.objects.refresh(dataset.business_ids)
+    run_pending()
+    cache.clear()
+    counters.reconcile()
+    return dataset
@@ -52,10 +52,13 @@ INSTALLED_APPS = [
     'django_filters',
     'reviews',
     'base',
+    'tasks',
     'django_extensions',
 ]
 
 MIDDLEWARE = [
+    'base.middleware.RequestMetricsMiddleware',
+    'base.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -97,6 +100,44 @@ DATABASES = {
     }
 }
 
+# Read replica (see base.replicas). Set DATABASE_REPLICA_NAME to a second SQLite file, e.g. one kept in sync with
+# `python manage.py sync_replica`, to serve the GET requests of READ_APPS from it. Tests use the primary instead.
+if os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DATABASE_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['base.replicas.ReplicaRouter']
+
+# A successful write of an authenticated user (or a registration) stores a per-user key in the cache that pins
+# the reads of that user to the primary for STICKY_SECONDS. Anonymous writes are not sticky.
+DATABASE_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'STICKY_SECONDS': 10,
+    'READ_APPS': ('offers', 'profiles', 'reviews', 'base'),
+    'PRIMARY_APPS': ('authtoken',),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Use a shared backend (e.g. Redis or Memcached) when running several worker processes,
+# otherwise every process keeps its own copy of the cached counters.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Seconds until the cached base-info counters are rebuilt from the database (None = never).
+BASE_INFO_COUNTER_TIMEOUT = 60 * 60
+
+# Seconds a serialized offer list page stays cached. Offer writes invalidate all pages immediately.
+OFFER_LIST_CACHE_TIMEOUT = 5 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -147,7 +188,67 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth_app.authentication.CachedTokenAuthentication',
+    ],
+    # orjson-backed JSON; both fall back to DRF's stdlib implementation when orjson is not installed.
+    'DEFAULT_RENDERER_CLASSES': [
+        'base.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'base.api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Keeps the request log lines of base.metrics out of the test output.
+TEST_RUNNER = 'base.test_runner.TestRunner'
+
+# Request instrumentation (see base.middleware.RequestMetricsMiddleware). Requests slower than SLOW_REQUEST_MS
+# or with more than MAX_QUERIES queries are logged as WARNING on the `base.metrics` logger, all others as INFO.
+# SAMPLES is the number of latencies kept per URL name for the percentiles of /api/request-metrics/.
+REQUEST_METRICS = {
+    'SLOW_REQUEST_MS': 500,
+    'MAX_QUERIES': 50,
+    'SAMPLES': 1000,
+    'SERVER_TIMING': True,
+}
+
+# Thumbnails of offer and profile images (see base.images): widths in pixels, formats and encoder quality.
+# Variants are rendered by the task worker (see TASK_QUEUE).
+IMAGE_VARIANTS = {
+    'WIDTHS': (320, 640, 1024),
+    'FORMATS': ('webp', 'jpeg'),
+    'QUALITY': 80,
+}
+
+# Unreferenced image files are deleted by the task worker (see base.media). Files saved within the grace period
+# are kept for now, since the row of an upload of the same content may not be committed yet.
+MEDIA_CLEANUP = {
+    'RELEASE_GRACE_SECONDS': 10 * 60,
+}
+
+# Database-backed background tasks (see tasks.queue), run by `python manage.py run_task_worker`.
+# Failed tasks are retried up to MAX_ATTEMPTS times, waiting RETRY_DELAY seconds and doubling up to
+# MAX_RETRY_DELAY. A task whose worker did not finish within LEASE seconds is picked up again.
+# Completed tasks are deleted after RETENTION seconds. EAGER = True runs tasks inline when they are queued.
+TASK_QUEUE = {
+    'EAGER': False,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 10,
+    'MAX_RETRY_DELAY': 60 * 60,
+    'LEASE': 5 * 60,
+    'BATCH_SIZE': 10,
+    'POLL_INTERVAL': 1,
+    'RETENTION': 24 * 60 * 60,
+}
+
+# Token authentication cache: seconds an entry lives in the per-process LRU (LOCAL_TTL) and in the
+# shared cache (SHARED_TTL). Token, user and profile changes in another process are seen after LOCAL_TTL.
+AUTH_TOKEN_CACHE = {
+    'LOCAL_TTL': 10,
+    'LOCAL_MAX_SIZE': 1024,
+    'SHARED_TTL': 300,
 }
 
@@ -29,4 +29,5 @@ urlpatterns = [
     path('api/', include('orders.api.urls')),
     path('api/', include('reviews.api.urls')),
     path('api/', include('base.api.urls')),
+    path('api/', include('tasks.api.urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
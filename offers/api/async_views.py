@@ -0,0 +1,42 @@
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.http import require_GET
+from base.api.async_support import api_errors, filter_queryset, json_response, paginate
+from base.metrics import measure_serialize
+from .models import Offer
+from .serializers import OfferSerializer
+from .views import OfferPagination, OffersListCreateView
+
+
+@require_GET
+@api_errors
+async def offer_list(request):
+    """
+    Async variant of `GET /offers/` with the same filters, ordering, search and pagination.
+    The page is counted with `acount()` and fetched with async iteration; details and users are
+    prefetched in the same pass and the page is serialized in memory.
+    """
+    drf_request, queryset = await filter_queryset(OffersListCreateView, request)
+    context = {"request": drf_request}
+
+    page = await paginate(OfferPagination(), queryset, drf_request)
+    if page is None:
+        offers = [offer async for offer in queryset]
+        with measure_serialize():
+            data = OfferSerializer(offers, many=True, context=context).data
+        return json_response(data)
+
+    with measure_serialize():
+        data = OfferSerializer(page.objects, many=True, context=context).data
+    return json_response(page.get_data(data))
+
+
+@require_GET
+@api_errors
+async def offer_detail(request, pk):
+    """
+    Async variant of `GET /offers/{pk}/`.
+    """
+    offer = await aget_object_or_404(Offer.objects.with_related(), pk=pk)
+    with measure_serialize():
+        data = OfferSerializer(offer, context={"request": request}).data
+    return json_response(data)
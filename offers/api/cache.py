@@ -0,0 +1,60 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+GENERATION_KEY = "offers:generation"
+
+
+def get_generation():
+    """
+    Returns the current generation of the offer data. A missing generation starts at the current time,
+    so entries cached before the key was evicted can never be served again.
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """
+    Invalidates all cached offer lists at once by moving to the next generation. The generation is bumped
+    again after the current transaction commits, so a page rendered from the old data while the
+    transaction was open is never served under the new generation.
+    """
+    _increment()
+    transaction.on_commit(_increment)
+
+
+def _increment():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def offer_list_cache_key(request):
+    """
+    Builds the cache key of an offer list request from the generation and the normalized query parameters.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    fingerprint = repr(
+        (
+            request.build_absolute_uri(request.path),
+            getattr(request, "accepted_media_type", ""),
+            params,
+        )
+    )
+    digest = hashlib.md5(fingerprint.encode()).hexdigest()
+    return f"offers:list:{get_generation()}:{digest}"
+
+
+def get_timeout():
+    return getattr(settings, "OFFER_LIST_CACHE_TIMEOUT", 300)
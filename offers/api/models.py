@@ -1,18 +1,65 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models import JSONField
+from django.db.models import Exists, JSONField, Min, OuterRef, Prefetch, Q, Subquery
+from django.utils import timezone
+from base.storage import content_hash_storage
+
+
+class OfferQuerySet(models.QuerySet):
+    def with_related(self):
+        """
+        Loads the offer owner in the same query and all offer details in one additional query,
+        so serializing any number of offers costs a fixed number of queries.
+        """
+        return self.select_related("user").prefetch_related(
+            Prefetch("details", queryset=OfferDetail.objects.order_by("id"))
+        )
+
+    def refresh_min_values(self, touch=True):
+        """
+        Recomputes `min_price` and `min_delivery_time` from the offer details in a single UPDATE statement.
+        Only offers whose values actually change are written; offers without any details are skipped,
+        so the columns are never set to NULL. With `touch`, the written offers also get a new `updated_at`.
+        """
+        details = OfferDetail.objects.filter(offer=OuterRef("pk")).order_by().values("offer")
+        min_price = Subquery(details.annotate(value=Min("price")).values("value"))
+        min_delivery_time = Subquery(details.annotate(value=Min("delivery_time_in_days")).values("value"))
+        values = {"min_price": min_price, "min_delivery_time": min_delivery_time}
+        if touch:
+            values["updated_at"] = timezone.now()
+        return (
+            self.filter(Exists(details))
+            .filter(~Q(min_price=min_price) | ~Q(min_delivery_time=min_delivery_time))
+            .update(**values)
+        )
 
 
 class Offer(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="offer")
     title = models.CharField(max_length=255)
-    image = models.ImageField(upload_to="offers_images/", blank=True, null=True)
+    image = models.ImageField(
+        upload_to="offers_images/", storage=content_hash_storage, blank=True, null=True
+    )
+    # Resized copies of `image`, maintained by `base.images` (see `render_variants` for the format).
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField(max_length=800, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     min_price = models.DecimalField(max_digits=5, decimal_places=2)
     min_delivery_time = models.PositiveIntegerField()
 
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-updated_at"], name="offer_user_updated_idx"),
+            models.Index(fields=["min_price", "-updated_at"], name="offer_min_price_idx"),
+            models.Index(
+                fields=["min_delivery_time", "-updated_at"], name="offer_min_delivery_idx"
+            ),
+            models.Index(fields=["-updated_at"], name="offer_updated_idx"),
+        ]
+
     def __str__(self):
         return f"{self.id} - {self.title}"
 
@@ -34,3 +81,21 @@ class OfferDetail(models.Model):
 
     def __str__(self):
         return f"{self.offer.title} - {self.offer_type}"
+
+
+class OfferSearchTerm(models.Model):
+    """
+    Inverted index entry: one normalized word of an offer's title or description and its weight.
+    Maintained on offer save and used by `offers.api.search.OfferSearchFilter`.
+    """
+
+    offer = models.ForeignKey(Offer, related_name="search_terms", on_delete=models.CASCADE)
+    term = models.CharField(max_length=50)
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ("offer", "term")
+        indexes = [models.Index(fields=["term", "offer"], name="offer_search_term_idx")]
+
+    def __str__(self):
+        return f"{self.term} ({self.weight}) - {self.offer_id}"
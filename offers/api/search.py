@@ -0,0 +1,89 @@
+import re
+from collections import Counter
+from django.db.models import Exists, OuterRef, Q, Subquery, Sum
+from rest_framework.filters import BaseFilterBackend
+from .models import OfferSearchTerm
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MAX_TERM_LENGTH = 50
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+
+
+def tokenize(text):
+    """
+    Splits a text into lower-case words; single characters are ignored.
+    """
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_PATTERN.findall((text or "").lower())
+        if len(token) > 1
+    ]
+
+
+def offer_terms(title, description):
+    """
+    Returns the weighted terms of an offer. Words in the title count more than words in the description.
+    """
+    weights = Counter()
+    for token in tokenize(title):
+        weights[token] += TITLE_WEIGHT
+    for token in tokenize(description):
+        weights[token] += DESCRIPTION_WEIGHT
+    return weights
+
+
+def index_offers(offers):
+    """
+    Replaces the search terms of the given offers with terms built from their current text.
+    """
+    offers = list(offers)
+    OfferSearchTerm.objects.filter(offer__in=offers).delete()
+    OfferSearchTerm.objects.bulk_create(
+        OfferSearchTerm(offer=offer, term=term, weight=weight)
+        for offer in offers
+        for term, weight in offer_terms(offer.title, offer.description).items()
+    )
+
+
+def term_prefix_q(token):
+    """
+    Matches all terms starting with `token` as a range, so the term index is used on every database.
+    """
+    return Q(term__gte=token, term__lt=token + "\uffff")
+
+
+class OfferSearchFilter(BaseFilterBackend):
+    """
+    Full-text search over the offer term index using the `search` query parameter.
+    Every word of the query has to match the beginning of a word in the title or description.
+    Results are ranked by the summed term weights unless an explicit ordering was requested.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        tokens = list(dict.fromkeys(tokenize(request.query_params.get(self.search_param, ""))))
+        if not tokens:
+            return queryset
+
+        for token in tokens:
+            queryset = queryset.filter(
+                Exists(OfferSearchTerm.objects.filter(term_prefix_q(token), offer=OuterRef("pk")))
+            )
+
+        any_token = Q()
+        for token in tokens:
+            any_token |= term_prefix_q(token)
+        rank = (
+            OfferSearchTerm.objects.filter(any_token, offer=OuterRef("pk"))
+            .order_by()
+            .values("offer")
+            .annotate(rank=Sum("weight"))
+            .values("rank")
+        )
+        queryset = queryset.annotate(search_rank=Subquery(rank))
+
+        if not queryset.query.order_by:
+            queryset = queryset.order_by("-search_rank", "-updated_at", "-id")
+        return queryset
@@ -1,12 +1,17 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
 from offers.api.models import Offer, OfferDetail
+from offers.signals import USER_DETAIL_FIELDS, offers_bulk_created
+from base.images import variant_urls
+from base.api.fields import SparseFieldsMixin
+from base.api.values import ValuesSerializer
 
 
 class UserDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ["first_name", "last_name", "username"]
+        fields = list(USER_DETAIL_FIELDS)
 
 
 class OfferDetailSerializer(serializers.ModelSerializer):
@@ -17,6 +22,7 @@ class OfferDetailSerializer(serializers.ModelSerializer):
     """
     
     url = serializers.SerializerMethodField(read_only=True)
+    method_columns = {"url": ("id",)}
 
     class Meta:
         model = OfferDetail
@@ -49,16 +55,44 @@ class OfferDetailSerializer(serializers.ModelSerializer):
         return value
 
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferListSerializer(serializers.ListSerializer):
+    """
+    Creates many offers at once: all offers and all of their details are inserted with one `bulk_create` each,
+    inside a single transaction.
+    """
+
+    def create(self, validated_data):
+        offers = []
+        details = []
+        with transaction.atomic():
+            for offer_data in validated_data:
+                details_data = offer_data.pop("details", [])
+                offer = Offer(**offer_data, **OfferSerializer.min_values(details_data))
+                offers.append(offer)
+                details.extend(OfferDetail(offer=offer, **detail_data) for detail_data in details_data)
+
+            Offer.objects.bulk_create(offers)
+            OfferDetail.objects.bulk_create(details)
+            offers_bulk_created.send(sender=Offer, offers=offers)
+
+        return offers
+
+
+class OfferSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializes the Offer model, incorporating detailed nested serialization for both offer details and user details. 
     It manages complex data interactions including custom method fields for user information and validation logic to ensure
     the integrity of offer types during creation. Additionally, this serializer handles the creation and updating of Offer instances 
     along with their related OfferDetail instances, ensuring data consistency and enforcing business rules during POST requests.
+    `min_price` and `min_delivery_time` are derived from the details and cannot be written directly.
+    GET requests accept `?fields=` and `?expand=` for `details` and `user_details` (see `SparseFieldsMixin`).
     """
     details = OfferDetailSerializer(many=True, required=False)
     user_details = UserDetailSerializer(source="user", read_only=True)
     user = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
+    expandable_fields = ("details", "user_details")
+    method_columns = {"user": ("user_id",), "image_srcset": ("image_variants",)}
 
     class Meta:
         model = Offer
@@ -67,6 +101,7 @@ class OfferSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "image",
+            "image_srcset",
             "description",
             "created_at",
             "updated_at",
@@ -75,12 +110,32 @@ class OfferSerializer(serializers.ModelSerializer):
             "min_delivery_time",
             "user_details",
         ]
+        read_only_fields = ["min_price", "min_delivery_time"]
+        list_serializer_class = OfferListSerializer
+
+    @staticmethod
+    def min_values(details):
+        """
+        Returns the denormalized minimum price and delivery time for the given details.
+        """
+        if not details:
+            return {}
+        return {
+            "min_price": min(detail["price"] for detail in details),
+            "min_delivery_time": min(detail["delivery_time_in_days"] for detail in details),
+        }
 
     def get_user(self, obj):
         """
         Returns the user ID associated with the offer.
         """
-        return obj.user.id  
+        return obj.user_id
+
+    def get_image_srcset(self, obj):
+        """
+        Returns the URLs of the resized image variants per format and width, or None before they exist.
+        """
+        return variant_urls(obj.image_variants, self.context.get("request"))
 
     def validate_details(self, value):
         """
@@ -97,39 +152,84 @@ class OfferSerializer(serializers.ModelSerializer):
                 )
         return value
 
+    def validate(self, data):
+        """
+        Ensures that new offers come with their details, from which the minimum price and delivery time are derived.
+        """
+        if self.instance is None and not data.get("details"):
+            raise serializers.ValidationError(
+                {"details": ["Ein Angebot benötigt Details (basic, standard, premium)."]}
+            )
+        return data
+
     def create(self, validated_data):
         """
         Creates a new Offer instance along with its associated OfferDetail instances from provided validated data.
+        The details are inserted with one `bulk_create`.
         """
         user = validated_data.pop("user", None)
         details_data = validated_data.pop("details", [])
 
-        offer = Offer.objects.create(user=user, **validated_data)
-
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
+        with transaction.atomic():
+            offer = Offer.objects.create(
+                user=user, **validated_data, **self.min_values(details_data)
+            )
+            OfferDetail.objects.bulk_create(
+                OfferDetail(offer=offer, **detail_data) for detail_data in details_data
+            )
 
         return offer
 
-
     def update(self, instance, validated_data):
         """
         Updates an existing Offer instance and its associated OfferDetail instances from provided validated data.
+        The existing details are fetched once, changed details are written with one `bulk_update` and the
+        minimum values are recomputed before the offer is saved.
         """
         details_data = validated_data.pop("details", None)
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic():
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+
+            if details_data:
+                details = {detail.offer_type: detail for detail in instance.details.all()}
+                changed_details = []
+                changed_fields = set()
+
+                for detail_data in details_data:
+                    detail_instance = details.get(detail_data.get("offer_type"))
+                    if detail_instance:
+                        for attr, value in detail_data.items():
+                            setattr(detail_instance, attr, value)
+                        changed_details.append(detail_instance)
+                        changed_fields.update(detail_data)
+
+                changed_fields.discard("offer_type")
+                if changed_details and changed_fields:
+                    OfferDetail.objects.bulk_update(changed_details, changed_fields)
+
+                for attr, value in self.min_values(
+                    [
+                        {"price": detail.price, "delivery_time_in_days": detail.delivery_time_in_days}
+                        for detail in details.values()
+                    ]
+                ).items():
+                    setattr(instance, attr, value)
+
+            instance.save()
 
-        if details_data:
-            for detail_data in details_data:
-                offer_type = detail_data.get("offer_type")
-                detail_instance = instance.details.filter(offer_type=offer_type).first()
+        return instance
 
-                if detail_instance:
-                    for attr, value in detail_data.items():
-                        setattr(detail_instance, attr, value)
-                    detail_instance.save()
 
-        return instance
+class OfferDetailValuesSerializer(ValuesSerializer):
+    serializer_class = OfferDetailSerializer
+
+
+class OfferValuesSerializer(ValuesSerializer):
+    """
+    Builds the `OfferSerializer` representation of the offer list from `.values()` rows.
+    """
+
+    serializer_class = OfferSerializer
+    nested_many = {"details": OfferDetailValuesSerializer}
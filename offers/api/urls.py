@@ -1,8 +1,12 @@
 from django.urls import path
-from .views import OffersListCreateView, OfferDetailView, OffersDetailView
+from .views import OffersListCreateView, OfferDetailView, OffersDetailView, OfferImportView
+from . import async_views
 
 urlpatterns = [
     path("offers/", OffersListCreateView.as_view(), name="offer-list-create"),
+    path("offers/import/", OfferImportView.as_view(), name="offer-import"),
     path("offers/<int:pk>/", OfferDetailView.as_view(), name="offer-detail"),
     path("offerdetails/<int:pk>/", OffersDetailView.as_view(), name="offer-details"),
+    path("async/offers/", async_views.offer_list, name="async-offer-list"),
+    path("async/offers/<int:pk>/", async_views.offer_detail, name="async-offer-detail"),
 ]
@@ -1,34 +1,56 @@
-from django.shortcuts import get_object_or_404
-from rest_framework.views import APIView
+from django.core.cache import cache
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
-from rest_framework.generics import GenericAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.filters import OrderingFilter
+from rest_framework.generics import (
+    GenericAPIView,
+    ListCreateAPIView,
+    RetrieveAPIView,
+    RetrieveUpdateDestroyAPIView,
+)
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Offer, OfferDetail
-from .serializers import OfferSerializer, OfferDetailSerializer
-from rest_framework.pagination import PageNumberPagination
+from .serializers import OfferSerializer, OfferDetailSerializer, OfferValuesSerializer
+from .search import OfferSearchFilter
+from .cache import get_generation, get_timeout, offer_list_cache_key
+from base.api.conditional import ConditionalGetMixin
+from base.api.fields import SparseQuerysetMixin
+from base.api.pagination import HybridPagination
+from base.api.timing import SerializeTimingMixin
+from base.api.values import ValuesListMixin
 from user_auth_app.permissions import IsBusinessUser
 
 
-class OfferPagination(PageNumberPagination):
+class OfferPagination(HybridPagination):
+    """
+    Paginates offers by page number, or by `(updated_at, id)` keyset with `?pagination=cursor`.
+    """
     page_size = 6
     page_size_query_param = "page_size"
+    cursor_ordering = ("-updated_at", "-id")
 
 
-class OffersListCreateView(GenericAPIView):
+class OffersListCreateView(ConditionalGetMixin, SparseQuerysetMixin, ValuesListMixin, ListCreateAPIView):
     """
     Lists offers and allows for the creation of new offers.
-    Supports filtering, sorting, and searching within the offers.
+    Supports filtering, sorting, and searching within the offers. Searching uses the offer term index
+    and ranks the results by relevance (see `OfferSearchFilter`).
     Uses the `OfferPagination` class for paginating the results.
+    GET responses carry an ETag and are answered with 304 if nothing changed. The ETag includes the offer
+    generation, which also moves when the embedded `user_details` of an owner change.
+    Serialized pages are cached per normalized query and invalidated by the offer generation counter
+    (see `offers.api.cache`); the representation does not depend on the requesting user.
+    Pages are built from `.values()` rows by `OfferValuesSerializer` instead of model instances.
+    `?fields=` and `?expand=` select the returned fields and the columns that are loaded.
     """
 
     permission_classes = [IsBusinessUser]
-    queryset = Offer.objects.all()
+    queryset = Offer.objects.with_related()
     serializer_class = OfferSerializer
+    values_serializer_class = OfferValuesSerializer
     pagination_class = OfferPagination
 
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, OfferSearchFilter]
 
     filterset_fields = {
         "user_id": ["exact"],
@@ -36,7 +58,6 @@ class OffersListCreateView(GenericAPIView):
         "min_delivery_time": ["lte"],
     }
 
-    search_fields = ["title", "description"]
     ordering_fields = ["updated_at", "min_price", "min_delivery_time"]
 
     def get_queryset(self):
@@ -52,25 +73,22 @@ class OffersListCreateView(GenericAPIView):
 
         return queryset
 
-    def get(self, request):
-        offers = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(offers)
+    def get_etag_state(self):
+        return (get_generation(),)
 
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+    def list(self, request, *args, **kwargs):
+        key = offer_list_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
 
-        serializer = self.get_serializer(offers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=get_timeout())
+        return response
 
     def post(self, request):
-        data = request.data.copy() 
-        details = data.get("details", [])
-        if details:
-            data["min_price"] = min(detail["price"] for detail in details)
-            data["min_delivery_time"] = min(detail["delivery_time_in_days"] for detail in details)
-
-        serializer = self.get_serializer(data=data)
+        serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
             serializer.save(user=request.user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -78,24 +96,60 @@ class OffersListCreateView(GenericAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class OfferDetailView(RetrieveUpdateDestroyAPIView):
+class OfferImportView(GenericAPIView):
+    """
+    Creates many offers of the authenticated business user in one request, e.g. for catalog migrations.
+    Expects a list of offers in the same format as `POST /offers/`. All offers are validated first and then
+    inserted in one transaction with bulk inserts; nothing is created if any offer is invalid.
+    """
+
+    permission_classes = [IsBusinessUser]
+    serializer_class = OfferSerializer
+    max_offers = 500
+
+    def post(self, request):
+        if not isinstance(request.data, list) or not 0 < len(request.data) <= self.max_offers:
+            return Response(
+                {"detail": f"Erwartet wird eine Liste mit 1 bis {self.max_offers} Angeboten."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        if serializer.is_valid():
+            offers = serializer.save(user=request.user)
+            return Response(
+                {"created": len(offers), "ids": [offer.pk for offer in offers]},
+                status=status.HTTP_201_CREATED,
+            )
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class OfferDetailView(ConditionalGetMixin, SparseQuerysetMixin, SerializeTimingMixin, RetrieveUpdateDestroyAPIView):
     """
     API endpoint for retrieving, updating, or deleting a single offer.
     Uses the `OfferSerializer` for serializing the offer data.
+    GET supports conditional requests via ETag and Last-Modified, and `?fields=` / `?expand=`. Both
+    validators also follow the embedded `user_details`: the ETag includes the offer generation and the
+    owner's profile counts as part of the offer.
     """
 
     permission_classes = [IsBusinessUser]
-    queryset = Offer.objects.all()
+    queryset = Offer.objects.with_related()
     serializer_class = OfferSerializer
+    last_modified_fields = ("updated_at", "user__profile__updated_at")
+
+    def get_etag_state(self):
+        return (get_generation(),)
 
 
-class OffersDetailView(APIView):
+class OffersDetailView(ConditionalGetMixin, SerializeTimingMixin, RetrieveAPIView):
     """
     API endpoint for retrieving the detailed information of a specific offer.
-    Fetches the corresponding offer using the `get_object_or_404` method to ensure it exists.
+    Responds with 404 if the offer detail does not exist. Supports conditional requests; an offer detail
+    counts as modified whenever its offer was updated.
     """
 
-    def get(self, request, pk):
-        offer_detail = get_object_or_404(OfferDetail, pk=pk)
-        serializer = OfferDetailSerializer(offer_detail, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    queryset = OfferDetail.objects.all()
+    serializer_class = OfferDetailSerializer
+    last_modified_fields = ("offer__updated_at",)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from offers.api.cache import bump_generation
+from offers.api.models import Offer
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes min_price and min_delivery_time of all offers from their details. "
+        "updated_at is left alone, so the feed order is unchanged."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--offer-id",
+            type=int,
+            action="append",
+            dest="offer_ids",
+            help="Only rebuild the given offer (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        offers = Offer.objects.all()
+        if options["offer_ids"]:
+            offers = offers.filter(pk__in=options["offer_ids"])
+
+        updated = offers.refresh_min_values(touch=False)
+        bump_generation()
+        self.stdout.write(self.style.SUCCESS(f"{updated} offers rebuilt."))
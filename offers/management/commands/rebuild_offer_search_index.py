@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from offers.api.models import Offer
+from offers.api.search import index_offers
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search term index of all offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of offers indexed per batch.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        offers = Offer.objects.only("id", "title", "description").order_by("pk")
+        batch = []
+        indexed = 0
+
+        for offer in offers.iterator(chunk_size=batch_size):
+            batch.append(offer)
+            if len(batch) >= batch_size:
+                index_offers(batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            index_offers(batch)
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"{indexed} offers indexed."))
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers", "0005_offerdetail_title"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                fields=["user", "-updated_at"], name="offer_user_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                fields=["min_price", "-updated_at"], name="offer_min_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(
+                fields=["min_delivery_time", "-updated_at"],
+                name="offer_min_delivery_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="offer",
+            index=models.Index(fields=["-updated_at"], name="offer_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:21
+
+import re
+from collections import Counter
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of the tokenizer in offers.api.search at the time of this migration, so later changes to
+# the search code do not change what this migration does.
+TOKEN_PATTERN = re.compile(r"\w+")
+MAX_TERM_LENGTH = 50
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+
+
+def tokenize(text):
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_PATTERN.findall((text or "").lower())
+        if len(token) > 1
+    ]
+
+
+def offer_terms(title, description):
+    weights = Counter()
+    for token in tokenize(title):
+        weights[token] += TITLE_WEIGHT
+    for token in tokenize(description):
+        weights[token] += DESCRIPTION_WEIGHT
+    return weights
+
+
+def build_search_index(apps, schema_editor):
+    Offer = apps.get_model("offers", "Offer")
+    OfferSearchTerm = apps.get_model("offers", "OfferSearchTerm")
+    OfferSearchTerm.objects.bulk_create(
+        OfferSearchTerm(offer_id=offer.pk, term=term, weight=weight)
+        for offer in Offer.objects.only("id", "title", "description").iterator()
+        for term, weight in offer_terms(offer.title, offer.description).items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers", "0006_offer_offer_user_updated_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OfferSearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=50)),
+                ("weight", models.PositiveIntegerField()),
+                (
+                    "offer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_terms",
+                        to="offers.offer",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["term", "offer"], name="offer_search_term_idx")
+                ],
+                "unique_together": {("offer", "term")},
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
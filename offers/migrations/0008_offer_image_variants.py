@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers", "0007_offersearchterm"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="offer",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:50
+
+import base.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers", "0008_offer_image_variants"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="offer",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=base.storage.ContentHashStorage(),
+                upload_to="offers_images/",
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from offers.api.models import Offer, OfferDetail
+from offers.api.cache import bump_generation
+from offers.api.search import index_offers
+
+# User fields embedded in offers as `user_details` (see `offers.api.serializers.UserDetailSerializer`).
+USER_DETAIL_FIELDS = ("first_name", "last_name", "username")
+
+# Sent with `offers` after offers were inserted with bulk_create, which does not send post_save.
+offers_bulk_created = Signal()
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_min_values(sender, instance, raw=False, **kwargs):
+    """
+    Keeps the denormalized `min_price` and `min_delivery_time` of the parent offer in sync
+    whenever one of its details is created, updated or deleted.
+    """
+    if raw:
+        return
+    Offer.objects.filter(pk=instance.offer_id).refresh_min_values()
+
+
+@receiver(post_save, sender=Offer)
+def index_offer_text(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Rebuilds the search terms of an offer whenever its title or description may have changed. This stays
+    inline rather than on the task queue, so new and edited offers are searchable right after the write.
+    """
+    if raw:
+        return
+    if update_fields is not None and not {"title", "description"} & set(update_fields):
+        return
+    index_offers([instance])
+
+
+@receiver(offers_bulk_created)
+def index_bulk_created_offers(sender, offers, **kwargs):
+    index_offers(offers)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+@receiver(offers_bulk_created)
+def invalidate_offer_lists(sender, **kwargs):
+    """
+    Any offer write invalidates every cached offer list by bumping the generation counter.
+    """
+    bump_generation()
+
+
+@receiver(post_save, sender=User)
+def invalidate_offer_lists_of_user(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Cached offer lists embed the name fields of the offer's user as `user_details`, so changing them
+    invalidates the lists as well. New users have no offers yet, and saves of other fields (e.g. `last_login`)
+    leave the lists untouched.
+    """
+    if raw or created:
+        return
+    if update_fields is not None and not set(USER_DETAIL_FIELDS) & set(update_fields):
+        return
+    bump_generation()
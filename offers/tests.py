@@ -1,3 +1,560 @@
-from django.test import TestCase
+from io import StringIO
+from datetime import timedelta
+from decimal import Decimal
+import tempfile
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from offers.api.models import Offer, OfferDetail, OfferSearchTerm
+from profiles.api.models import UserProfile
 
-# Create your tests here.
+
+def create_offer(user, title="Offer", prices=(100, 200, 300), delivery_times=(7, 5, 3)):
+    offer = Offer.objects.create(
+        user=user,
+        title=title,
+        description="Beschreibung",
+        min_price=min(prices),
+        min_delivery_time=min(delivery_times),
+    )
+    for offer_type, price, delivery_time in zip(
+        ("basic", "standard", "premium"), prices, delivery_times
+    ):
+        OfferDetail.objects.create(
+            offer=offer,
+            title=f"{title} {offer_type}",
+            revisions=1,
+            delivery_time_in_days=delivery_time,
+            price=price,
+            features=["Feature"],
+            offer_type=offer_type,
+        )
+    return offer
+
+
+def create_business_user(username="business"):
+    user = User.objects.create_user(username=username, password="secret")
+    UserProfile.objects.create(user=user, type="business")
+    return user
+
+
+class OfferListQueryCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        for index in range(30):
+            create_offer(cls.user, title=f"Offer {index}")
+
+    def setUp(self):
+        cache.clear()
+
+    def count_list_queries(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("offer-list-create"), {"page_size": page_size}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), page_size)
+        return len(queries)
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        self.assertEqual(self.count_list_queries(2), self.count_list_queries(30))
+
+    def test_list_uses_validator_count_offer_and_detail_queries_only(self):
+        self.assertEqual(self.count_list_queries(6), 4)
+
+    def test_detail_view_query_count(self):
+        offer = Offer.objects.first()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("offer-detail", args=[offer.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["details"]), 3)
+        self.assertEqual(response.data["user_details"]["username"], "business")
+
+
+class OfferListCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        cls.offer = create_offer(cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_list_is_served_from_cache(self):
+        url = reverse("offer-list-create")
+        first = self.client.get(url, {"page_size": 3, "min_price": 10})
+        with self.assertNumQueries(1):
+            second = self.client.get(url, {"min_price": 10, "page_size": 3})
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+
+    def test_offer_writes_invalidate_cached_lists(self):
+        url = reverse("offer-list-create")
+        self.client.get(url)
+
+        self.offer.title = "Changed"
+        self.offer.save()
+        self.assertEqual(self.client.get(url).data["results"][0]["title"], "Changed")
+
+        detail = self.offer.details.get(offer_type="basic")
+        detail.price = 5
+        detail.save()
+        self.assertEqual(self.client.get(url).data["results"][0]["min_price"], "5.00")
+
+        self.offer.delete()
+        self.assertEqual(self.client.get(url).data["count"], 0)
+
+    def test_user_changes_invalidate_cached_lists(self):
+        url = reverse("offer-list-create")
+        self.client.get(url)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.patch(
+            reverse("userprofile-detail", args=[self.user.pk]), {"first_name": "Berta"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(url).data["results"][0]["user_details"]["first_name"], "Berta")
+
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+    def test_works_with_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            backend = {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": directory,
+            }
+            with override_settings(CACHES={"default": backend}):
+                url = reverse("offer-list-create")
+                first = self.client.get(url)
+                with self.assertNumQueries(1):
+                    self.assertEqual(self.client.get(url).json(), first.json())
+
+                create_offer(self.user, title="Second")
+                self.assertEqual(self.client.get(url).data["count"], 2)
+
+
+class OfferMinValuesTests(APITestCase):
+    def setUp(self):
+        self.user = create_business_user()
+        self.offer = create_offer(self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_update_of_detail_price_refreshes_min_values(self):
+        response = self.client.patch(
+            reverse("offer-detail", args=[self.offer.pk]),
+            {"details": [{"offer_type": "basic", "price": 50, "delivery_time_in_days": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["min_price"], "50.00")
+        self.assertEqual(response.data["details"][0]["price"], "50.00")
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, Decimal("50.00"))
+        self.assertEqual(self.offer.min_delivery_time, 1)
+
+    def test_deleting_cheapest_detail_refreshes_min_values(self):
+        self.offer.details.get(offer_type="basic").delete()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, Decimal("200.00"))
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+    def test_deleting_offer_with_details(self):
+        self.offer.delete()
+        self.assertFalse(OfferDetail.objects.exists())
+
+    def test_rebuild_command_fixes_stale_values(self):
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=999, min_delivery_time=99)
+        call_command("rebuild_offer_min_values", stdout=StringIO())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, Decimal("100.00"))
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+    def test_rebuild_command_keeps_updated_at(self):
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=999, updated_at=an_hour_ago)
+        output = StringIO()
+        call_command("rebuild_offer_min_values", stdout=output)
+        self.assertIn("1 offers rebuilt.", output.getvalue())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, Decimal("100.00"))
+        self.assertEqual(self.offer.updated_at, an_hour_ago)
+
+    def test_unchanged_min_values_are_not_written(self):
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Offer.objects.filter(pk=self.offer.pk).update(updated_at=an_hour_ago)
+
+        detail = self.offer.details.get(offer_type="premium")
+        detail.price = 400
+        detail.save()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.updated_at, an_hour_ago)
+        self.assertEqual(Offer.objects.refresh_min_values(), 0)
+
+        detail = self.offer.details.get(offer_type="basic")
+        detail.price = 50
+        detail.save()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, Decimal("50.00"))
+        self.assertGreater(self.offer.updated_at, an_hour_ago)
+
+
+class OfferCursorPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        for index in range(15):
+            create_offer(cls.user, title=f"Offer {index}")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cursor_pages_walk_all_offers_newest_first(self):
+        url = reverse("offer-list-create")
+        params = {"pagination": "cursor", "page_size": 4}
+        seen = []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen.extend(offer["id"] for offer in response.data["results"])
+            url, params = response.data["next"], None
+
+        expected = list(
+            Offer.objects.order_by("-updated_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def walk(self, params):
+        url, ids = reverse("offer-list-create"), []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(offer["id"] for offer in response.data["results"])
+            self.assertLessEqual(len(ids), Offer.objects.count(), "the cursor walk does not end")
+            url, params = response.data["next"], None
+        return ids, response
+
+    def test_cursor_walk_over_more_than_a_thousand_ties(self):
+        Offer.objects.bulk_create(
+            Offer(user=self.user, title=f"Tie {index}", min_price=50, min_delivery_time=1)
+            for index in range(1100)
+        )
+        Offer.objects.update(updated_at=timezone.now())
+        for ordering, expected in (
+            (None, ("-updated_at", "-id")),
+            ("min_price", ("min_price", "id")),
+            ("-min_price", ("-min_price", "-id")),
+        ):
+            with self.subTest(ordering=ordering):
+                params = {"pagination": "cursor", "page_size": 100}
+                if ordering:
+                    params["ordering"] = ordering
+                ids, last_page = self.walk(params)
+                self.assertEqual(ids, list(Offer.objects.order_by(*expected).values_list("id", flat=True)))
+
+                url, pages = last_page.data["previous"], []
+                while url:
+                    response = self.client.get(url)
+                    pages.insert(0, [offer["id"] for offer in response.data["results"]])
+                    url = response.data["previous"]
+                self.assertEqual(sum(pages, []), ids[: len(ids) - len(last_page.data["results"])])
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("offer-list-create"), {"cursor": "bm9uc2Vuc2U="})
+        self.assertEqual(response.status_code, 404)
+
+    def test_deep_cursor_page_costs_the_same_as_the_first(self):
+        url = reverse("offer-list-create")
+        with CaptureQueriesContext(connection) as first_page_queries:
+            response = self.client.get(url, {"pagination": "cursor", "page_size": 2})
+        for _ in range(5):
+            response = self.client.get(response.data["next"])
+        with CaptureQueriesContext(connection) as deep_page_queries:
+            self.client.get(response.data["next"])
+
+        self.assertEqual(len(first_page_queries), 3)
+        self.assertEqual(len(deep_page_queries), 3)
+        self.assertNotIn("OFFSET", deep_page_queries[1]["sql"])
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get(reverse("offer-list-create"), {"page": 2})
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(len(response.data["results"]), 6)
+
+
+class OfferSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        cls.react = create_offer(cls.user, title="React Frontend")
+        cls.react.description = "Single page apps with Django backend"
+        cls.react.save()
+        cls.django = create_offer(cls.user, title="Django API")
+        cls.django.description = "REST backend"
+        cls.django.save()
+        cls.logo = create_offer(cls.user, title="Logo Design")
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, term, **params):
+        response = self.client.get(reverse("offer-list-create"), {"search": term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [offer["id"] for offer in response.data["results"]]
+
+    def test_matches_title_and_description_ranked_by_weight(self):
+        self.assertEqual(self.search("django"), [self.django.pk, self.react.pk])
+
+    def test_prefix_match_and_case_insensitivity(self):
+        self.assertEqual(self.search("REA"), [self.react.pk])
+
+    def test_all_words_have_to_match(self):
+        self.assertEqual(self.search("django backend"), [self.django.pk, self.react.pk])
+        self.assertEqual(self.search("django logo"), [])
+
+    def test_explicit_ordering_wins_over_rank(self):
+        self.assertEqual(
+            self.search("django", ordering="updated_at"), [self.react.pk, self.django.pk]
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        self.logo.title = "Vector Illustration"
+        self.logo.save()
+        self.assertEqual(self.search("logo"), [])
+        self.assertEqual(self.search("vector"), [self.logo.pk])
+
+        self.logo.delete()
+        self.assertFalse(OfferSearchTerm.objects.filter(offer_id=self.logo.pk).exists())
+
+    def test_rebuild_command(self):
+        OfferSearchTerm.objects.all().delete()
+        call_command("rebuild_offer_search_index", stdout=StringIO())
+        self.assertEqual(self.search("design"), [self.logo.pk])
+
+
+def offer_payload(title="Neues Angebot", base_price=100):
+    return {
+        "title": title,
+        "description": "Beschreibung",
+        "details": [
+            {
+                "title": offer_type,
+                "revisions": 1,
+                "delivery_time_in_days": 10 - index,
+                "price": base_price + index * 50,
+                "features": ["Feature"],
+                "offer_type": offer_type,
+            }
+            for index, offer_type in enumerate(("basic", "standard", "premium"))
+        ],
+    }
+
+
+class OfferWriteTests(APITestCase):
+    def setUp(self):
+        self.user = create_business_user()
+        self.client.force_authenticate(self.user)
+
+    def test_create_derives_min_values_from_details(self):
+        response = self.client.post(reverse("offer-list-create"), offer_payload(), format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["min_price"], "100.00")
+        self.assertEqual(response.data["min_delivery_time"], 8)
+        self.assertEqual(OfferDetail.objects.filter(offer_id=response.data["id"]).count(), 3)
+
+    def test_create_inserts_details_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse("offer-list-create"), offer_payload(), format="json")
+        detail_inserts = [
+            query for query in queries if query["sql"].startswith('INSERT INTO "offers_offerdetail"')
+        ]
+        self.assertEqual(len(detail_inserts), 1)
+
+    def test_create_without_details_is_rejected(self):
+        payload = offer_payload()
+        del payload["details"]
+        response = self.client.post(reverse("offer-list-create"), payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Offer.objects.exists())
+
+    def test_update_writes_details_with_one_query(self):
+        offer = create_offer(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                reverse("offer-detail", args=[offer.pk]),
+                {
+                    "details": [
+                        {"offer_type": "basic", "price": 80},
+                        {"offer_type": "premium", "delivery_time_in_days": 1},
+                    ]
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["min_price"], "80.00")
+        self.assertEqual(response.data["min_delivery_time"], 1)
+        detail_updates = [
+            query for query in queries if query["sql"].startswith('UPDATE "offers_offerdetail"')
+        ]
+        self.assertEqual(len(detail_updates), 1)
+
+    def test_import_creates_many_offers(self):
+        payload = [offer_payload(f"Angebot {index}", base_price=10 * (index + 1)) for index in range(5)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("offer-import"), payload, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(OfferDetail.objects.count(), 15)
+        self.assertEqual(
+            Offer.objects.get(title="Angebot 2").min_price, Decimal("30.00")
+        )
+        self.assertTrue(OfferSearchTerm.objects.filter(term="angebot").exists())
+        offer_inserts = [
+            query for query in queries if query["sql"].startswith('INSERT INTO "offers_offer"')
+        ]
+        self.assertEqual(len(offer_inserts), 1)
+
+    def test_import_is_all_or_nothing(self):
+        invalid = offer_payload()
+        invalid["details"] = invalid["details"][:2]
+        response = self.client.post(
+            reverse("offer-import"), [offer_payload(), invalid], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Offer.objects.exists())
+
+    def test_import_requires_a_list(self):
+        response = self.client.post(reverse("offer-import"), offer_payload(), format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class OfferSparseFieldsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        cls.offers = [create_offer(cls.user, title=f"Offer {index}") for index in range(4)]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_returns_requested_fields_only(self):
+        response = self.client.get(reverse("offer-list-create"), {"fields": "id,title,min_price,user"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data["results"][0]), ["id", "user", "title", "min_price"])
+
+        response = self.client.get(
+            reverse("offer-list-create"), {"fields": "id,title", "expand": "details,user_details"}
+        )
+        offer = response.data["results"][0]
+        self.assertEqual(list(offer), ["id", "title", "details", "user_details"])
+        self.assertEqual(len(offer["details"]), 3)
+
+        response = self.client.get(reverse("offer-list-create"), {"expand": "details"})
+        self.assertIn("image_srcset", response.data["results"][0])
+
+    def test_unrequested_details_are_not_queried(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("offer-list-create"), {"fields": "id,title"})
+        self.assertEqual(len(response.data["results"]), 4)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("offer-detail", args=[self.offers[0].pk]), {"fields": "id,title"})
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("description", queries[-1]["sql"])
+        self.assertNotIn("auth_user", queries[-1]["sql"])
+
+    def test_cursor_pages_with_sparse_fields(self):
+        response = self.client.get(
+            reverse("offer-list-create"),
+            {"fields": "title", "pagination": "cursor", "page_size": 2, "ordering": "min_price"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], [{"title": "Offer 0"}, {"title": "Offer 1"}])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"], [{"title": "Offer 2"}, {"title": "Offer 3"}])
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse("offer-list-create"), {"fields": "id,secret"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"fields": ["Unbekannte Felder: secret."]})
+
+        response = self.client.get(reverse("offer-detail", args=[self.offers[0].pk]), {"expand": "title"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("expand", response.data)
+
+    def test_async_views_accept_sparse_fields(self):
+        params = {"fields": "id,title", "expand": "details"}
+        expected = self.client.get(reverse("offer-list-create"), params)
+        response = self.client.get(reverse("async-offer-list"), params)
+        self.assertEqual(response.content, expected.content)
+
+    def test_writes_use_all_fields(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            f"{reverse('offer-list-create')}?fields=id", offer_payload(), format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["details"]), 3)
+
+
+class AsyncOfferViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        cls.offers = [create_offer(cls.user, title=f"Offer {index}") for index in range(8)]
+
+    def setUp(self):
+        cache.clear()
+
+    def assertSameResponse(self, sync_url, async_url, params=None):
+        expected = self.client.get(sync_url, params)
+        response = self.client.get(async_url, params)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(
+            response.content.replace(b"/api/async/", b"/api/"), expected.content
+        )
+        return response
+
+    def test_list_matches_sync_view(self):
+        sync_url, async_url = reverse("offer-list-create"), reverse("async-offer-list")
+        for params in (
+            {},
+            {"page": 2, "ordering": "-min_price"},
+            {"page": "last", "page_size": 3},
+            {"search": "offer", "creator_id": self.user.pk},
+            {"pagination": "cursor", "page_size": 5},
+            {"page": 99},
+            {"min_price": "abc"},
+        ):
+            self.assertSameResponse(sync_url, async_url, params)
+
+    def test_detail_matches_sync_view(self):
+        offer = self.offers[0]
+        self.assertSameResponse(
+            reverse("offer-detail", args=[offer.pk]), reverse("async-offer-detail", args=[offer.pk])
+        )
+        response = self.assertSameResponse(
+            reverse("offer-detail", args=[9999]), reverse("async-offer-detail", args=[9999])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_runs_count_offer_and_detail_queries_only(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("async-offer-list"), {"page_size": 4})
+        self.assertEqual(len(response.json()["results"]), 4)
+
+    def test_only_get_is_allowed(self):
+        response = self.client.post(reverse("async-offer-list"), {}, format="json")
+        self.assertEqual(response.status_code, 405)
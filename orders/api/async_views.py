@@ -0,0 +1,68 @@
+from django.http import Http404
+from django.views.decorators.http import require_GET
+from base.api.async_support import api_errors, authenticate, json_response
+from .views import (
+    format_order_stats,
+    order_stats_queryset,
+    parse_business_user_ids,
+    visible_order_stats,
+)
+
+
+async def aget_order_stats(business_user_ids):
+    """
+    Async variant of `get_order_stats`: the same aggregation query, fetched with async iteration.
+    """
+    stats = {}
+    async for row in order_stats_queryset(business_user_ids):
+        row = format_order_stats(row)
+        stats[row["business_user"]] = row
+    return stats
+
+
+async def aget_business_user_stats(pk):
+    stats = (await aget_order_stats([pk])).get(pk)
+    if not stats:
+        raise Http404("Business user not found.")
+    return stats
+
+
+@require_GET
+@api_errors
+async def order_count(request, pk):
+    """
+    Async variant of `GET /order-count/{pk}/`.
+    """
+    stats = await aget_business_user_stats(pk)
+    return json_response({"order_count": stats["in_progress_order_count"]})
+
+
+@require_GET
+@api_errors
+async def completed_order_count(request, pk):
+    """
+    Async variant of `GET /completed-order-count/{pk}/`.
+    """
+    stats = await aget_business_user_stats(pk)
+    return json_response({"completed_order_count": stats["completed_order_count"]})
+
+
+@require_GET
+@api_errors
+async def order_stats(request, pk=None):
+    """
+    Async variant of `GET /order-stats/{pk}/` and `GET /order-stats/?business_user_ids=…`.
+    """
+    await authenticate(request)
+    if pk is not None:
+        return json_response(visible_order_stats(await aget_business_user_stats(pk), request.user))
+
+    business_user_ids = parse_business_user_ids(request.GET.get("business_user_ids", ""))
+    stats = await aget_order_stats(business_user_ids)
+    return json_response(
+        [
+            visible_order_stats(stats[pk], request.user)
+            for pk in dict.fromkeys(business_user_ids)
+            if pk in stats
+        ]
+    )
@@ -0,0 +1,13 @@
+from django_filters import rest_framework as filters
+from .models import Order
+
+
+class OrderFilter(filters.FilterSet):
+    status = filters.ChoiceFilter(choices=Order.STATUS_CHOICES)
+    offer_type = filters.CharFilter(field_name="offer_type")
+    created_after = filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="gte")
+    created_before = filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="lt")
+
+    class Meta:
+        model = Order
+        fields = ["status", "offer_type", "created_after", "created_before"]
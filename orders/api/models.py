@@ -27,5 +27,16 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["business_user", "status"], name="order_business_status_idx"),
+            models.Index(
+                fields=["business_user", "-created_at"], name="order_business_created_idx"
+            ),
+            models.Index(
+                fields=["customer_user", "-created_at"], name="order_customer_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Order {self.id} - {self.title}"
@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from .models import Order
 from offers.api.models import OfferDetail
+from user_auth_app.permissions import get_user_type
+from base.api.fields import SparseFieldsMixin
+from base.api.values import ValuesSerializer
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     A serializer for the Order model that manages order serialization and various operational logics such as validation and order creation.
     It ensures that only authorized users can create orders and maintain data integrity throughout the order lifecycle.
@@ -46,10 +49,9 @@ class OrderSerializer(serializers.ModelSerializer):
         Validates the incoming data to ensure that only customers can create orders and that an 'offer_detail_id' is provided. Checks user role and existence of the specified offer detail.
         """
         request = self.context.get("request")
-        user = request.user
 
         if not self.instance:
-            if getattr(user.profile, "type", None) != "customer":
+            if get_user_type(request) != "customer":
                 raise serializers.ValidationError(
                     {"detail": "Nur Kunden können Bestellungen erstellen."}
                 )
@@ -104,3 +106,7 @@ class OrderSerializer(serializers.ModelSerializer):
                 {"detail": "Nur Status darf aktualisiert werden."}
             )
         return instance
+
+
+class OrderValuesSerializer(ValuesSerializer):
+    serializer_class = OrderSerializer
@@ -4,7 +4,9 @@ from .views import (
     OrderRetrieveUpdateDestroyView,
     OrderCountView,
     CompletedOrderCountView,
+    OrderStatsView,
 )
+from . import async_views
 
 urlpatterns = [
     path("orders/", OrderListCreateView.as_view(), name="order-create"),
@@ -19,4 +21,14 @@ urlpatterns = [
         CompletedOrderCountView.as_view(),
         name="completed-order-count",
     ),
+    path("order-stats/", OrderStatsView.as_view(), name="order-stats-batch"),
+    path("order-stats/<int:pk>/", OrderStatsView.as_view(), name="order-stats"),
+    path("async/order-count/<int:pk>/", async_views.order_count, name="async-order-count"),
+    path(
+        "async/completed-order-count/<int:pk>/",
+        async_views.completed_order_count,
+        name="async-completed-order-count",
+    ),
+    path("async/order-stats/", async_views.order_stats, name="async-order-stats-batch"),
+    path("async/order-stats/<int:pk>/", async_views.order_stats, name="async-order-stats"),
 ]
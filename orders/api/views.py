@@ -1,33 +1,94 @@
 from rest_framework.views import APIView
+from itertools import islice
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import ParseError
 from .models import Order, User
-from .serializers import OrderSerializer
-from django.db.models import Q
+from .serializers import OrderSerializer, OrderValuesSerializer
+from .filters import OrderFilter
+from django.db.models import Avg, Count, Q, Sum
+from rest_framework.fields import DecimalField
 from rest_framework.generics import RetrieveUpdateDestroyAPIView
-from user_auth_app.permissions import OrderPermission
+from user_auth_app.permissions import OrderPermission, get_user_type
 from user_auth_app.permissions import IsCustomerUser
+from base.api.fields import SparseQuerysetMixin, cursor_columns
+from base.api.pagination import HybridPagination
+from base.api.renderers import dumps
+from base.api.timing import SerializeTimingMixin
+from base.metrics import measure_serialize
+
+
+class OrderPagination(HybridPagination):
+    """
+    Paginates orders only when `page`, `page_size`, `pagination` or `cursor` is given.
+    The cursor mode is keyed on `(created_at, id)`.
+    """
+    page_size = 20
+    cursor_ordering = ("-created_at", "-id")
+    paginate_by_default = False
 
 
 class OrderListCreateView(APIView):
     """
     Allows authenticated users to list their orders and create new ones.
     - `GET`: Lists all of the user's orders, sorted by creation date in descending order.
+      Filterable by `status`, `offer_type`, `created_after` and `created_before` (see `OrderFilter`).
+      Paginated on request (see `OrderPagination`); `?stream=true` streams the whole list as a JSON array
+      while fetching the orders in chunks, so memory stays flat for users with many orders.
+      The list is built from `.values()` rows by `OrderValuesSerializer`; `?fields=` limits the returned
+      and selected fields.
     - `POST`: Enables the creation of a new order.
     """
    
     permission_classes = [IsCustomerUser]
+    stream_chunk_size = 500
 
     def get(self, request):
         user = request.user
         orders = Order.objects.filter(
             Q(customer_user=user) | Q(business_user=user)
-        ).order_by("-created_at")
+        ).order_by("-created_at", "-id")
+
+        filterset = OrderFilter(request.query_params, queryset=orders, request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        orders = filterset.qs
+
+        if request.query_params.get("stream") in ("1", "true"):
+            return StreamingHttpResponse(
+                self.stream_orders(orders), content_type="application/json"
+            )
 
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        values_serializer = OrderValuesSerializer(context={"request": request})
+        orders = values_serializer.values(orders, *cursor_columns(OrderPagination))
+
+        paginator = OrderPagination()
+        page = paginator.paginate_queryset(orders, request, view=self)
+        with measure_serialize():
+            data = values_serializer.to_representation(page if page is not None else orders)
+        if page is not None:
+            return paginator.get_paginated_response(data)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    def stream_orders(self, orders):
+        """
+        Yields the orders as the chunks of one JSON array, serializing one chunk of rows at a time.
+        """
+        values_serializer = OrderValuesSerializer(context={"request": self.request})
+        rows = values_serializer.values(orders).iterator(chunk_size=self.stream_chunk_size)
+        yield b"["
+        separator = b""
+        for chunk in iter(lambda: list(islice(rows, self.stream_chunk_size)), []):
+            with measure_serialize():
+                results = values_serializer.to_representation(chunk)
+            for data in results:
+                yield separator + dumps(data)
+                separator = b","
+        yield b"]"
 
     def post(self, request):
         serializer = OrderSerializer(data=request.data, context={"request": request})
@@ -37,10 +98,10 @@ class OrderListCreateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class OrderRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+class OrderRetrieveUpdateDestroyView(SparseQuerysetMixin, SerializeTimingMixin, RetrieveUpdateDestroyAPIView):
     """
     Allows authenticated users and specifically authorized users to edit or delete orders.
-    - `GET`: Retrieves details of a specific order.
+    - `GET`: Retrieves details of a specific order, limited to the fields in `?fields=` if given.
     - `PATCH`: Updates an order if the user is authorized.
     - `DELETE`: Deletes an order if the user is authorized.
     """  
@@ -50,9 +111,8 @@ class OrderRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
 
     def patch(self, request, *args, **kwargs):
         order = get_object_or_404(Order, pk=kwargs["pk"])
-        user = request.user
 
-        if getattr(user.profile, "type", None) != "business":
+        if get_user_type(request) != "business":
             return Response(
                 {"detail": "Nur Anbieter können Bestellungen ändern."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -86,6 +146,112 @@ class OrderRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         )
 
 
+MAX_STATS_BATCH_SIZE = 100
+
+revenue_field = DecimalField(max_digits=12, decimal_places=2)
+
+
+def order_stats_queryset(business_user_ids):
+    """
+    One row per existing business user with the order statistics computed by conditional aggregation.
+    """
+    return (
+        User.objects.filter(pk__in=business_user_ids)
+        .values("pk")
+        .annotate(
+            order_count=Count("business"),
+            in_progress_order_count=Count("business", filter=Q(business__status="in_progress")),
+            completed_order_count=Count("business", filter=Q(business__status="completed")),
+            cancelled_order_count=Count("business", filter=Q(business__status="cancelled")),
+            completed_revenue=Sum("business__price", filter=Q(business__status="completed")),
+            in_progress_revenue=Sum("business__price", filter=Q(business__status="in_progress")),
+            average_delivery_time=Avg("business__delivery_time_in_days"),
+        )
+    )
+
+
+def format_order_stats(row):
+    row["business_user"] = row.pop("pk")
+    row["completed_revenue"] = revenue_field.to_representation(row["completed_revenue"] or 0)
+    row["in_progress_revenue"] = revenue_field.to_representation(row["in_progress_revenue"] or 0)
+    if row["average_delivery_time"] is not None:
+        row["average_delivery_time"] = round(row["average_delivery_time"], 1)
+    return row
+
+
+def get_order_stats(business_user_ids):
+    """
+    Collects the order statistics of the given business users with one conditional-aggregation query.
+    Returns a dict keyed by user ID; IDs without a matching user are missing from the result.
+    """
+    stats = {}
+    for row in order_stats_queryset(business_user_ids):
+        row = format_order_stats(row)
+        stats[row["business_user"]] = row
+    return stats
+
+
+REVENUE_FIELDS = ("completed_revenue", "in_progress_revenue")
+
+
+def visible_order_stats(stats, user):
+    """
+    Removes the revenue from the statistics unless `user` is the business user they belong to or staff.
+    """
+    if user.is_staff or stats["business_user"] == user.pk:
+        return stats
+    return {key: value for key, value in stats.items() if key not in REVENUE_FIELDS}
+
+
+def parse_business_user_ids(value):
+    """
+    Parses the comma-separated `business_user_ids` parameter. Raises `ParseError` (400) for invalid input.
+    """
+    try:
+        business_user_ids = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise ParseError("business_user_ids muss eine kommagetrennte Liste von IDs sein.")
+
+    if not business_user_ids or len(business_user_ids) > MAX_STATS_BATCH_SIZE:
+        raise ParseError(f"Es sind 1 bis {MAX_STATS_BATCH_SIZE} business_user_ids erlaubt.")
+    return business_user_ids
+
+
+class OrderStatsView(APIView):
+    """
+    Returns order statistics for business users: counts per status, revenue totals and the average delivery time.
+    - `GET /order-stats/{pk}/`: Statistics of a single business user.
+    - `GET /order-stats/?business_user_ids=1,2,3`: Statistics of several business users as a list.
+    Requires authentication. The revenue totals are only returned to the business user themself and to staff.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        business_user_id = kwargs.get("pk")
+        if business_user_id is not None:
+            stats = get_order_stats([business_user_id]).get(business_user_id)
+            if not stats:
+                return Response(
+                    {"detail": "Business user not found."}, status=status.HTTP_404_NOT_FOUND
+                )
+            return Response(visible_order_stats(stats, request.user), status=status.HTTP_200_OK)
+
+        business_user_ids = parse_business_user_ids(
+            request.query_params.get("business_user_ids", "")
+        )
+
+        stats = get_order_stats(business_user_ids)
+        return Response(
+            [
+                visible_order_stats(stats[pk], request.user)
+                for pk in dict.fromkeys(business_user_ids)
+                if pk in stats
+            ],
+            status=status.HTTP_200_OK,
+        )
+
+
 class OrderCountView(APIView):
     """
     Returns the number of orders in progress for a specific business user.
@@ -97,15 +263,15 @@ class OrderCountView(APIView):
     def get(self, request, *args, **kwargs):
         business_user_id = kwargs.get("pk")
 
-        business_user = User.objects.filter(pk=business_user_id).first()
-        if not business_user:
+        stats = get_order_stats([business_user_id]).get(business_user_id)
+        if not stats:
             return Response(
                 {"detail": "Business user not found."}, status=status.HTTP_404_NOT_FOUND
             )
 
-        orders = Order.objects.filter(business_user=business_user, status="in_progress")
-        order_count = orders.count()
-        return Response({"order_count": order_count}, status=status.HTTP_200_OK)
+        return Response(
+            {"order_count": stats["in_progress_order_count"]}, status=status.HTTP_200_OK
+        )
 
 
 class CompletedOrderCountView(APIView):
@@ -118,14 +284,13 @@ class CompletedOrderCountView(APIView):
     def get(self, request, *args, **kwargs):
         business_user_id = kwargs.get("pk")
 
-        business_user = User.objects.filter(pk=business_user_id).first()
-        if not business_user:
+        stats = get_order_stats([business_user_id]).get(business_user_id)
+        if not stats:
             return Response(
                 {"detail": "Business user not found."}, status=status.HTTP_404_NOT_FOUND
             )
 
-        orders = Order.objects.filter(business_user=business_user, status="completed")
-        order_count = orders.count()
         return Response(
-            {"completed_order_count": order_count}, status=status.HTTP_200_OK
+            {"completed_order_count": stats["completed_order_count"]},
+            status=status.HTTP_200_OK,
         )
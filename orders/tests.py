@@ -1,3 +1,248 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from orders.api.models import Order
+from profiles.api.models import UserProfile
 
-# Create your tests here.
+
+def create_user(username, type):
+    user = User.objects.create_user(username=username, password="secret")
+    UserProfile.objects.create(user=user, type=type)
+    return user
+
+
+def create_order(customer_user, business_user, status="in_progress", price=100, delivery_time=5):
+    return Order.objects.create(
+        customer_user=customer_user,
+        business_user=business_user,
+        title="Order",
+        delivery_time_in_days=delivery_time,
+        price=price,
+        features=["Feature"],
+        offer_type="basic",
+        status=status,
+    )
+
+
+class OrderStatsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = create_user("customer", "customer")
+        cls.business = create_user("business", "business")
+        cls.other_business = create_user("other", "business")
+        create_order(cls.customer, cls.business, "in_progress", price=100, delivery_time=2)
+        create_order(cls.customer, cls.business, "in_progress", price=50, delivery_time=4)
+        create_order(cls.customer, cls.business, "completed", price=200, delivery_time=6)
+        create_order(cls.customer, cls.business, "cancelled", price=80, delivery_time=8)
+
+    def setUp(self):
+        self.client.force_authenticate(self.business)
+
+    def test_stats_of_single_business_user_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("order-stats", args=[self.business.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {
+                "business_user": self.business.pk,
+                "order_count": 4,
+                "in_progress_order_count": 2,
+                "completed_order_count": 1,
+                "cancelled_order_count": 1,
+                "completed_revenue": "200.00",
+                "in_progress_revenue": "150.00",
+                "average_delivery_time": 5.0,
+            },
+        )
+
+    def test_stats_of_business_user_without_orders(self):
+        self.client.force_authenticate(self.other_business)
+        response = self.client.get(reverse("order-stats", args=[self.other_business.pk]))
+        self.assertEqual(response.data["order_count"], 0)
+        self.assertEqual(response.data["completed_revenue"], "0.00")
+        self.assertIsNone(response.data["average_delivery_time"])
+
+    def test_batch_stats(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("order-stats-batch"),
+                {"business_user_ids": f"{self.business.pk},{self.other_business.pk},9999"},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [stats["business_user"] for stats in response.data],
+            [self.business.pk, self.other_business.pk],
+        )
+
+    def test_stats_require_authentication(self):
+        self.client.force_authenticate(None)
+        for name, args in (("order-stats", [self.business.pk]), ("async-order-stats", [self.business.pk])):
+            response = self.client.get(reverse(name, args=args))
+            self.assertEqual(response.status_code, 401, name)
+
+    def test_revenue_is_only_visible_to_the_business_user_and_staff(self):
+        staff = User.objects.create_user(username="staff", password="secret", is_staff=True)
+        for user, sees_revenue in ((self.customer, False), (self.other_business, False), (staff, True)):
+            self.client.force_authenticate(user)
+            response = self.client.get(reverse("order-stats", args=[self.business.pk]))
+            self.assertEqual(response.data["order_count"], 4)
+            self.assertEqual("completed_revenue" in response.data, sees_revenue, user.username)
+            self.assertEqual("in_progress_revenue" in response.data, sees_revenue, user.username)
+
+        self.client.force_authenticate(self.business)
+        response = self.client.get(
+            reverse("order-stats-batch"),
+            {"business_user_ids": f"{self.business.pk},{self.other_business.pk}"},
+        )
+        self.assertEqual(
+            ["completed_revenue" in stats for stats in response.data], [True, False]
+        )
+
+    def test_batch_stats_rejects_invalid_ids(self):
+        response = self.client.get(reverse("order-stats-batch"), {"business_user_ids": "1,abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_business_user(self):
+        response = self.client.get(reverse("order-stats", args=[9999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_async_views_match_sync_views(self):
+        self.client.force_authenticate(None)
+        token = Token.objects.create(user=self.customer)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        for name, args, params in (
+            ("order-count", [self.business.pk], None),
+            ("completed-order-count", [self.business.pk], None),
+            ("order-stats", [self.business.pk], None),
+            ("order-stats", [self.customer.pk], None),
+            ("order-stats", [9999], None),
+            ("order-stats-batch", [], {"business_user_ids": f"{self.other_business.pk},{self.business.pk}"}),
+            ("order-stats-batch", [], {"business_user_ids": "1,abc"}),
+        ):
+            expected = self.client.get(reverse(name, args=args), params)
+            with self.assertNumQueries(1 if expected.status_code != 400 else 0):
+                response = self.client.get(reverse(f"async-{name}", args=args), params)
+            self.assertEqual(response.status_code, expected.status_code, name)
+            self.assertEqual(response.content, expected.content, name)
+
+    def test_count_views_are_served_from_stats(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("order-count", args=[self.business.pk]))
+        self.assertEqual(response.data, {"order_count": 2})
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("completed-order-count", args=[self.business.pk]))
+        self.assertEqual(response.data, {"completed_order_count": 1})
+
+        response = self.client.get(reverse("order-count", args=[9999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class OrderListPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = create_user("customer", "customer")
+        cls.business = create_user("business", "business")
+        for _ in range(5):
+            create_order(cls.customer, cls.business)
+
+    def setUp(self):
+        self.client.force_authenticate(self.customer)
+
+    def test_list_is_unpaginated_by_default(self):
+        response = self.client.get(reverse("order-create"))
+        self.assertEqual(len(response.data), 5)
+
+    def test_page_number_pagination_on_request(self):
+        response = self.client.get(reverse("order-create"), {"page_size": 2, "page": 3})
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_cursor_pagination_on_request(self):
+        response = self.client.get(reverse("order-create"), {"pagination": "cursor", "page_size": 3})
+        first_page = [order["id"] for order in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        second_page = [order["id"] for order in response.data["results"]]
+
+        expected = list(Order.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(first_page + second_page, expected)
+        self.assertIsNone(response.data["next"])
+
+    def test_sparse_fields(self):
+        response = self.client.get(
+            reverse("order-create"), {"fields": "id,status", "pagination": "cursor", "page_size": 3}
+        )
+        self.assertEqual(list(response.data["results"][0]), ["id", "status"])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 2)
+
+        order = Order.objects.first()
+        response = self.client.get(reverse("orders-detail", args=[order.pk]), {"fields": "price"})
+        self.assertEqual(response.data, {"price": "100.00"})
+
+        response = self.client.get(reverse("order-create"), {"expand": "customer_user"})
+        self.assertEqual(response.status_code, 400)
+
+
+class OrderListFilterAndStreamTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = create_user("customer", "customer")
+        cls.business = create_user("business", "business")
+        create_order(cls.customer, cls.business, "in_progress")
+        create_order(cls.customer, cls.business, "completed")
+        old_order = create_order(cls.customer, cls.business, "completed")
+        Order.objects.filter(pk=old_order.pk).update(
+            created_at=timezone.now() - timedelta(days=30), offer_type="premium"
+        )
+        cls.old_order = old_order
+
+    def setUp(self):
+        self.client.force_authenticate(self.business)
+
+    def test_filter_by_status(self):
+        response = self.client.get(reverse("order-create"), {"status": "completed"})
+        self.assertEqual(len(response.data), 2)
+
+    def test_filter_by_offer_type(self):
+        response = self.client.get(reverse("order-create"), {"offer_type": "premium"})
+        self.assertEqual([order["id"] for order in response.data], [self.old_order.pk])
+
+    def test_filter_by_date_range(self):
+        response = self.client.get(
+            reverse("order-create"),
+            {"created_before": (timezone.now() - timedelta(days=1)).isoformat()},
+        )
+        self.assertEqual([order["id"] for order in response.data], [self.old_order.pk])
+
+        response = self.client.get(
+            reverse("order-create"),
+            {"created_after": (timezone.now() - timedelta(days=1)).isoformat()},
+        )
+        self.assertEqual(len(response.data), 2)
+
+    def test_invalid_filter_value(self):
+        response = self.client.get(reverse("order-create"), {"status": "unknown"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_matches_regular_list(self):
+        regular = self.client.get(reverse("order-create"), {"status": "completed"})
+        streamed = self.client.get(
+            reverse("order-create"), {"status": "completed", "stream": "true"}
+        )
+
+        self.assertTrue(streamed.streaming)
+        body = b"".join(streamed.streaming_content)
+        self.assertEqual(json.loads(body), regular.json())
+
+    def test_stream_of_empty_list(self):
+        self.client.force_authenticate(create_user("nobody", "customer"))
+        streamed = self.client.get(reverse("order-create"), {"stream": "true"})
+        self.assertEqual(b"".join(streamed.streaming_content), b"[]")
@@ -0,0 +1,14 @@
+from django_filters import rest_framework as filters
+from .models import UserProfile
+
+
+class UserProfileFilter(filters.FilterSet):
+    """
+    Exact matches only, so both filters can use the profile indexes.
+    """
+    type = filters.ChoiceFilter(choices=UserProfile.TYPE_CHOICES)
+    location = filters.CharFilter(field_name="location")
+
+    class Meta:
+        model = UserProfile
+        fields = ["type", "location"]
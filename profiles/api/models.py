@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User
 from django.db import models
+from base.storage import content_hash_storage
 
 
 class UserProfile(models.Model):
@@ -10,11 +11,22 @@ class UserProfile(models.Model):
 
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
-    file = models.ImageField(upload_to="profile_pics/", blank=True, default="")
+    file = models.ImageField(
+        upload_to="profile_pics/", storage=content_hash_storage, blank=True, default=""
+    )
+    # Resized copies of `file`, maintained by `base.images` (see `render_variants` for the format).
+    file_variants = models.JSONField(default=dict, blank=True, editable=False)
     location = models.CharField(max_length=50, blank=True, default="")
     tel = models.CharField(max_length=50, blank=True, default="")
     description = models.TextField(blank=True, default="")
     working_hours = models.CharField(max_length=50, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["type", "location"], name="profile_type_location_idx"),
+            models.Index(fields=["location"], name="profile_location_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.type}"
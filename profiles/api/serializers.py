@@ -1,9 +1,25 @@
 from rest_framework import serializers
 from profiles.api.models import UserProfile
 from django.contrib.auth.models import User
+from reviews.api.models import BusinessRatingSummary
+from reviews.api.serializers import BusinessRatingSummarySerializer
+from base.images import variant_urls
+from base.api.fields import SparseFieldsMixin
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class FileSrcsetMixin:
+    """
+    Serializer mixin providing the `file_srcset` method field of the profile serializers.
+    """
+
+    def get_file_srcset(self, obj):
+        """
+        Returns the URLs of the resized profile picture variants per format and width, relative like `file`.
+        """
+        return variant_urls(obj.file_variants, url=lambda name: f"media/{name}")
+
+
+class UserProfileSerializer(FileSrcsetMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """
     A serializer for user profile data, linking directly to a User model and extending it with additional profile information.
     This serializer handles both the representation and update operations for UserProfile instances, ensuring data consistency and validating unique constraints like email addresses.
@@ -14,7 +30,9 @@ class UserProfileSerializer(serializers.ModelSerializer):
     last_name = serializers.CharField(source="user.last_name")
     email = serializers.EmailField(source="user.email")
     file = serializers.ImageField(required=False, allow_null=True)
+    file_srcset = serializers.SerializerMethodField()
     created_at = serializers.CharField(source="user.date_joined")
+    method_columns = {"file_srcset": ("file_variants",)}
 
     class Meta:
         model = UserProfile
@@ -26,6 +44,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "email",
             "type",
             "file",
+            "file_srcset",
             "location",
             "tel",
             "description",
@@ -38,6 +57,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
         Customizes the representation of the serialized data. Modifies the file field to include a media path if the file exists.
         """
         representation = super().to_representation(instance)
+        if "file" not in representation:
+            return representation
         if instance.file:
             representation['file'] = f"media/{instance.file.name}" 
         else:
@@ -73,24 +94,37 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return instance
 
 
-class UserProfileBusinessListSerializer(serializers.ModelSerializer):
+class UserProfileBusinessListSerializer(FileSrcsetMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """
     A serializer for business user profiles, tailored to list views that require specific fields like location, contact, and business type.
-    Includes user data and customizes file representation.
+    Includes user data, the precomputed rating summary and customizes file representation.
     """
     user = serializers.SerializerMethodField()
     file = serializers.ImageField(required=False, allow_null=True)
+    file_srcset = serializers.SerializerMethodField()
+    rating_summary = serializers.SerializerMethodField()
+    method_columns = {
+        "user": ("user__id", "user__username", "user__first_name", "user__last_name"),
+        "file_srcset": ("file_variants",),
+        "rating_summary": (
+            "user__rating_summary__review_count",
+            "user__rating_summary__average_rating",
+            *(f"user__rating_summary__rating_{rating}_count" for rating in BusinessRatingSummary.RATINGS),
+        ),
+    }
 
     class Meta:
         model = UserProfile
         fields = [
             "user",
             "file",
+            "file_srcset",
             "location",
             "tel",
             "description",
             "working_hours",
             "type",
+            "rating_summary",
         ]
 
     def get_user(self, obj):
@@ -103,12 +137,23 @@ class UserProfileBusinessListSerializer(serializers.ModelSerializer):
             "first_name": obj.user.first_name,
             "last_name": obj.user.last_name,
         }
+
+    def get_rating_summary(self, obj):
+        """
+        Returns review count, average rating and rating histogram without scanning the reviews.
+        """
+        summary = getattr(obj.user, "rating_summary", None)
+        if summary is None:
+            return BusinessRatingSummarySerializer.empty()
+        return BusinessRatingSummarySerializer(summary).data
     
     def to_representation(self, instance):
         """
         Modifies the default serialization to handle the media file path, ensuring it is correctly formatted or set to None if absent.
         """
         representation = super().to_representation(instance)
+        if "file" not in representation:
+            return representation
         if instance.file:
             representation['file'] = f"media/{instance.file.name}" 
         else:
@@ -116,21 +161,28 @@ class UserProfileBusinessListSerializer(serializers.ModelSerializer):
         return representation
 
 
-class UserProfileCustomerListSerializer(serializers.ModelSerializer):
+class UserProfileCustomerListSerializer(FileSrcsetMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """
     A serializer for customer user profiles focusing on providing user identification and uploaded file details,
     used primarily for listing and retrieving customer-specific data.
     """
     user = serializers.SerializerMethodField()
     file = serializers.ImageField(required=False, allow_null=True)
+    file_srcset = serializers.SerializerMethodField()
     uploaded_at = serializers.DateTimeField(source="user.date_joined", read_only=True)
+    method_columns = {
+        "user": ("user__id", "user__username", "user__first_name", "user__last_name"),
+        "file_srcset": ("file_variants",),
+    }
 
     class Meta:
         model = UserProfile
-        fields = ["user", "file", "uploaded_at", "type"]
+        fields = ["user", "file", "file_srcset", "uploaded_at", "type"]
 
     def to_representation(self, instance):
             representation = super().to_representation(instance)
+            if "file" not in representation:
+                return representation
             if instance.file:
                 representation['file'] = f"media/{instance.file.name}" 
             else:
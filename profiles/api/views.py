@@ -8,30 +8,62 @@ from .serializers import (
 )
 from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
+from base.api.conditional import ConditionalGetMixin
+from base.api.fields import SparseQuerysetMixin
+from base.api.pagination import HybridPagination
+from base.api.timing import SerializeTimingMixin
+from .filters import UserProfileFilter
 
 
-class UserProfileList(ListCreateAPIView):
+class ProfilePagination(HybridPagination):
+    """
+    Paginiert Profile nur, wenn `page`, `page_size`, `pagination` oder `cursor` angegeben ist.
+    Ohne diese Parameter bleibt die Antwort eine einfache Liste. Der Cursor-Modus ist nach `(updated_at, id)` geordnet.
+    """
+    page_size = 20
+    cursor_ordering = ("-updated_at", "-id")
+    paginate_by_default = False
+
+
+class ProfileListMixin(SparseQuerysetMixin, SerializeTimingMixin):
+    """
+    Gemeinsame Einstellungen der Profil-Listen: Paginierung auf Wunsch, Filter nach `type` und `location`
+    sowie `?fields=` für die gelieferten und geladenen Felder.
+    """
+    pagination_class = ProfilePagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = UserProfileFilter
+
+
+class UserProfileList(ConditionalGetMixin, ProfileListMixin, ListCreateAPIView):
     """
     API-Endpoint zur Auflistung aller Benutzerprofile oder zur Erstellung eines neuen Profils.
-    - `GET`: Listet alle Benutzerprofile auf.
+    - `GET`: Listet alle Benutzerprofile auf. Filterbar nach `type` und `location`, auf Wunsch paginiert
+      (siehe `ProfilePagination`). Der Benutzer wird per JOIN mitgeladen.
     - `POST`: Ermöglicht das Erstellen eines neuen Benutzerprofils.
     Verwendet `UserProfileSerializer` zur Serialisierung der Daten.
+    GET-Anfragen unterstützen ETag (304, wenn sich nichts geändert hat).
     """    
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.select_related("user").order_by("id")
     serializer_class = UserProfileSerializer
 
 
-class UserProfileDetail(RetrieveUpdateDestroyAPIView):
+class UserProfileDetail(ConditionalGetMixin, SerializeTimingMixin, RetrieveUpdateDestroyAPIView):
     """
     API-Endpoint für den Zugriff auf ein spezifisches Benutzerprofil und dessen Bearbeitung oder Löschung.
     - `GET`: Ruft ein spezifisches Benutzerprofil ab.
     - `PATCH`: Aktualisiert ein Benutzerprofil, wenn der authentifizierte Nutzer der Besitzer ist.
     - `DELETE`: Löscht ein Benutzerprofil, wenn der authentifizierte Nutzer der Besitzer ist.
     Nur authentifizierte Nutzer haben Zugriff auf diese Methoden.
+    GET-Anfragen unterstützen ETag und Last-Modified.
     """    
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_conditional_queryset(self):
+        return UserProfile.objects.filter(user_id=self.kwargs.get("pk"))
+
     def get_object(self):
         user = self.request.user
         user_id = self.kwargs.get("pk")
@@ -46,21 +78,30 @@ class UserProfileDetail(RetrieveUpdateDestroyAPIView):
         return profile
 
 
-class BusinessProfileList(ListAPIView):
+class BusinessProfileList(ConditionalGetMixin, ProfileListMixin, ListAPIView):
     """
     API-Endpoint zur Auflistung aller Geschäftsprofile.
-    - `GET`: Listet alle Profile auf, die als 'business' typisiert sind.
+    - `GET`: Listet alle Profile auf, die als 'business' typisiert sind. Filterbar nach `location`,
+      auf Wunsch paginiert (siehe `ProfilePagination`).
     Verwendet `UserProfileBusinessListSerializer` zur spezifischen Serialisierung von Geschäftsprofilen.
+    GET-Anfragen unterstützen ETag.
     """    
-    queryset = UserProfile.objects.filter(type="business")
+    queryset = (
+        UserProfile.objects.filter(type="business")
+        .select_related("user", "user__rating_summary")
+        .order_by("id")
+    )
+    last_modified_fields = ("updated_at", "user__rating_summary__updated_at")
     serializer_class = UserProfileBusinessListSerializer
 
 
-class CustomerProfileList(ListAPIView):
+class CustomerProfileList(ConditionalGetMixin, ProfileListMixin, ListAPIView):
     """
     API-Endpoint zur Auflistung aller Kundenprofile.
-    - `GET`: Listet alle Profile auf, die als 'customer' typisiert sind.
+    - `GET`: Listet alle Profile auf, die als 'customer' typisiert sind. Filterbar nach `location`,
+      auf Wunsch paginiert (siehe `ProfilePagination`).
     Verwendet `UserProfileCustomerListSerializer` zur spezifischen Serialisierung von Kundenprofilen.
+    GET-Anfragen unterstützen ETag.
     """    
-    queryset = UserProfile.objects.filter(type="customer")
+    queryset = UserProfile.objects.filter(type="customer").select_related("user").order_by("id")
     serializer_class = UserProfileCustomerListSerializer
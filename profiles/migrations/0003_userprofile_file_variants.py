@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0002_userprofile_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="file_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:50
+
+import base.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0003_userprofile_file_variants"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="userprofile",
+            name="file",
+            field=models.ImageField(
+                blank=True,
+                default="",
+                storage=base.storage.ContentHashStorage(),
+                upload_to="profile_pics/",
+            ),
+        ),
+    ]
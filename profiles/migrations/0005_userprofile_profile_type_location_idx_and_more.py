@@ -0,0 +1,25 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0004_alter_userprofile_file"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["type", "location"], name="profile_type_location_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(fields=["location"], name="profile_location_idx"),
+        ),
+    ]
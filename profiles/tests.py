@@ -1,3 +1,138 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from profiles.api.models import UserProfile
 
-# Create your tests here.
+CITIES = ("Berlin", "Hamburg", "München", "Köln")
+
+
+def create_profiles(count, prefix="user"):
+    users = User.objects.bulk_create(
+        User(username=f"{prefix}{index}", email=f"{prefix}{index}@example.com") for index in range(count)
+    )
+    UserProfile.objects.bulk_create(
+        UserProfile(
+            user=user,
+            type="business" if index % 2 else "customer",
+            location=CITIES[index % len(CITIES)],
+        )
+        for index, user in enumerate(users)
+    )
+
+
+class ProfileListTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_profiles(8)
+        cls.user = User.objects.get(username="user0")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_lists_stay_unpaginated_without_pagination_parameters(self):
+        response = self.client.get(reverse("userprofile-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([profile["username"] for profile in response.data][:2], ["user0", "user1"])
+        self.assertEqual(len(response.data), 8)
+
+    def test_pagination_on_request(self):
+        response = self.client.get(reverse("business-profiles-list"), {"page_size": 3})
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(reverse("customer-profiles-list"), {"pagination": "cursor", "page_size": 3})
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIn("cursor=", response.data["next"])
+
+    def test_filter_by_type_and_location(self):
+        response = self.client.get(reverse("userprofile-list"), {"type": "business", "location": "Hamburg"})
+        self.assertEqual([profile["username"] for profile in response.data], ["user1", "user5"])
+
+        response = self.client.get(reverse("customer-profiles-list"), {"location": "Berlin"})
+        self.assertEqual([profile["user"]["username"] for profile in response.data], ["user0", "user4"])
+
+        response = self.client.get(reverse("userprofile-list"), {"type": "admin"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ProfileListQueryCountTests(APITestCase):
+    """
+    The profile lists load the user with a JOIN, so the number of queries does not depend on the number
+    of profiles: one aggregate for the conditional GET validators, one COUNT for the page and one SELECT.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_profiles(10_000)
+        cls.user = User.objects.get(username="user0")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_lists_cost_constant_queries(self):
+        for url in ("userprofile-list", "business-profiles-list", "customer-profiles-list"):
+            with self.subTest(url=url), self.assertNumQueries(3):
+                response = self.client.get(reverse(url), {"page": 2, "page_size": 100})
+            self.assertEqual(len(response.data["results"]), 100)
+
+    def test_filtered_and_cursor_lists_cost_constant_queries(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("userprofile-list"), {"location": "Köln", "page_size": 50})
+        self.assertEqual(response.data["count"], 2500)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("business-profiles-list"), {"pagination": "cursor", "page_size": 100}
+            )
+        self.assertEqual(len(response.data["results"]), 100)
+
+    def test_cursor_walk_over_profiles_sharing_updated_at(self):
+        # Migration 0002 gives every existing profile the same `updated_at`.
+        UserProfile.objects.update(updated_at=timezone.now())
+        url, params, ids = reverse("customer-profiles-list"), {"pagination": "cursor", "page_size": 100}, []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(profile["user"]["pk"] for profile in response.data["results"])
+            self.assertLessEqual(len(ids), 5000, "the cursor walk does not end")
+            url, params = response.data["next"], None
+
+        expected = UserProfile.objects.filter(type="customer").order_by("-updated_at", "-id")
+        self.assertEqual(ids, list(expected.values_list("user_id", flat=True)))
+
+
+class ProfileSparseFieldsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_profiles(6)
+        cls.user = User.objects.get(username="user0")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_lists_return_and_load_requested_fields_only(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("business-profiles-list"), {"fields": "user,rating_summary"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data[0]), ["user", "rating_summary"])
+        self.assertEqual(response.data[0]["user"]["username"], "user1")
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("description", queries[-1]["sql"])
+        self.assertNotIn("working_hours", queries[-1]["sql"])
+
+        params = {"fields": "username,file", "location": "Berlin"}
+        response = self.client.get(reverse("userprofile-list"), params)
+        self.assertEqual(
+            response.data, [{"username": "user0", "file": None}, {"username": "user4", "file": None}]
+        )
+
+        response = self.client.get(reverse("customer-profiles-list"), {"fields": "type,phone"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_returns_requested_fields_only(self):
+        response = self.client.get(reverse("userprofile-detail", args=[self.user.pk]), {"fields": "user,type"})
+        self.assertEqual(response.data, {"user": str(self.user.pk), "type": "customer"})
@@ -0,0 +1,42 @@
+from django.views.decorators.http import require_GET
+from base.api.async_support import (
+    api_errors,
+    authenticate,
+    filter_queryset,
+    json_response,
+    paginate,
+)
+from .models import BusinessRatingSummary
+from .serializers import BusinessRatingSummarySerializer, ReviewSerializer
+from .views import ReviewListCreateView, ReviewPagination
+
+
+@require_GET
+@api_errors
+async def review_list(request):
+    """
+    Asynchrone Variante von `GET /reviews/` mit denselben Filtern, derselben Paginierung und
+    `rating_summary`. Die Token-Authentifizierung läuft in einem Worker-Thread, die Bewertungen werden
+    asynchron geladen.
+    """
+    await authenticate(request)
+    drf_request, queryset = await filter_queryset(ReviewListCreateView, request)
+    context = {"request": drf_request}
+
+    page = await paginate(ReviewPagination(), queryset, drf_request)
+    if page is None:
+        reviews = [review async for review in queryset]
+        return json_response(ReviewSerializer(reviews, many=True, context=context).data)
+
+    data = page.get_data(ReviewSerializer(page.objects, many=True, context=context).data)
+    business_user_id = request.GET.get("business_user_id")
+    if business_user_id and business_user_id.isdigit():
+        summary = await BusinessRatingSummary.objects.filter(
+            business_user_id=business_user_id
+        ).afirst()
+        data["rating_summary"] = (
+            BusinessRatingSummarySerializer(summary).data
+            if summary
+            else BusinessRatingSummarySerializer.empty()
+        )
+    return json_response(data)
@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.db.models import Count, Q, Sum
 
 
 class Review(models.Model):
@@ -16,6 +17,73 @@ class Review(models.Model):
 
     class Meta:
         unique_together = ("business_user", "reviewer")
+        indexes = [
+            models.Index(
+                fields=["business_user", "updated_at"], name="review_business_updated_idx"
+            ),
+            models.Index(fields=["business_user", "rating"], name="review_business_rating_idx"),
+            models.Index(fields=["updated_at"], name="review_updated_idx"),
+        ]
 
     def __str__(self):
         return f"Review by {self.reviewer.username} for {self.business_user.username}"
+
+
+class BusinessRatingSummaryManager(models.Manager):
+    def refresh(self, business_user_ids):
+        """
+        Recomputes the summaries of the given business users from their reviews in one aggregation query.
+        Summaries of users without any reviews are removed.
+        """
+        business_user_ids = set(business_user_ids)
+        rows = (
+            Review.objects.filter(business_user_id__in=business_user_ids)
+            .values("business_user_id")
+            .annotate(
+                review_count=Count("id"),
+                rating_sum=Sum("rating"),
+                **{
+                    f"rating_{rating}_count": Count("id", filter=Q(rating=rating))
+                    for rating in BusinessRatingSummary.RATINGS
+                },
+            )
+        )
+
+        with transaction.atomic():
+            refreshed = set()
+            for row in rows:
+                business_user_id = row.pop("business_user_id")
+                row["average_rating"] = row["rating_sum"] / row["review_count"]
+                self.update_or_create(business_user_id=business_user_id, defaults=row)
+                refreshed.add(business_user_id)
+            self.filter(business_user_id__in=business_user_ids - refreshed).delete()
+
+
+class BusinessRatingSummary(models.Model):
+    """
+    Precomputed review statistics of a business user, kept in sync on every review write.
+    """
+
+    RATINGS = range(1, 6)
+
+    business_user = models.OneToOneField(
+        User, primary_key=True, related_name="rating_summary", on_delete=models.CASCADE
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BusinessRatingSummaryManager()
+
+    def __str__(self):
+        return f"{self.business_user_id} - {self.average_rating:.1f} ({self.review_count})"
+
+    @property
+    def histogram(self):
+        return {str(rating): getattr(self, f"rating_{rating}_count") for rating in self.RATINGS}
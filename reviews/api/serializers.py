@@ -1,8 +1,11 @@
 from rest_framework import serializers
-from .models import Review
+from .models import BusinessRatingSummary, Review
+from user_auth_app.permissions import get_user_type
+from base.api.fields import SparseFieldsMixin
+from base.api.values import ValuesSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = [
@@ -17,8 +20,9 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ["reviewer", "created_at", "updated_at"]
 
     def validate(self, data):
-        user = self.context["request"].user
-        if user.profile.type != "customer":
+        request = self.context["request"]
+        user = request.user
+        if get_user_type(request) != "customer":
             raise serializers.ValidationError(
                 {"detail": "Nur Kunden können Bewertungen erstellen."}
             )
@@ -34,3 +38,30 @@ class ReviewSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data["reviewer"] = self.context["request"].user
         return super().create(validated_data)
+
+
+class BusinessRatingSummarySerializer(serializers.ModelSerializer):
+    average_rating = serializers.SerializerMethodField()
+    histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        model = BusinessRatingSummary
+        fields = ["review_count", "average_rating", "histogram"]
+
+    def get_average_rating(self, obj):
+        return round(obj.average_rating, 1)
+
+    @staticmethod
+    def empty():
+        """
+        Representation for business users without any reviews.
+        """
+        return {
+            "review_count": 0,
+            "average_rating": 0,
+            "histogram": {str(rating): 0 for rating in BusinessRatingSummary.RATINGS},
+        }
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    serializer_class = ReviewSerializer
@@ -1,7 +1,9 @@
 from django.urls import path
 from .views import ReviewListCreateView, ReviewDetailView
+from . import async_views
 
 urlpatterns = [
     path("reviews/", ReviewListCreateView.as_view(), name="review-list-create"),
     path("reviews/<int:pk>/", ReviewDetailView.as_view(), name="review-detail"),
+    path("async/reviews/", async_views.review_list, name="async-review-list"),
 ]
@@ -2,42 +2,76 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.exceptions import PermissionDenied
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Review
-from .serializers import ReviewSerializer
+from .models import BusinessRatingSummary, Review
+from .serializers import BusinessRatingSummarySerializer, ReviewSerializer, ReviewValuesSerializer
 from rest_framework.response import Response
 from rest_framework import status
+from base.api.conditional import ConditionalGetMixin
+from base.api.fields import SparseQuerysetMixin
+from base.api.pagination import HybridPagination
+from base.api.timing import SerializeTimingMixin
+from base.api.values import ValuesListMixin
+from user_auth_app.permissions import get_user_type
 
 
-class ReviewListCreateView(ListCreateAPIView):
+class ReviewPagination(HybridPagination):
+    """
+    Paginiert Bewertungen nur, wenn `page`, `page_size`, `pagination` oder `cursor` angegeben ist.
+    Der Cursor-Modus ist nach `(updated_at, id)` geordnet.
+    """
+    page_size = 20
+    cursor_ordering = ("-updated_at", "-id")
+    paginate_by_default = False
+
+
+class ReviewListCreateView(ConditionalGetMixin, SparseQuerysetMixin, ValuesListMixin, ListCreateAPIView):
     """
     API-Endpoint zur Auflistung aller Bewertungen oder zur Erstellung neuer Bewertungen.
-    - `GET`: Listet alle Bewertungen auf. Unterstützt Filterung nach `business_user_id` und `reviewer_id`.
+    - `GET`: Listet alle Bewertungen auf, die zuletzt geänderten zuerst. Unterstützt Filterung nach `business_user_id` und `reviewer_id`.
+      Auf Wunsch paginiert, siehe `ReviewPagination`. Paginierte Antworten enthalten bei Filterung nach
+      `business_user_id` zusätzlich `rating_summary` (Anzahl, Durchschnitt und Verteilung der Bewertungen).
     - `POST`: Ermöglicht Kunden das Erstellen neuer Bewertungen.
     Die Erstellung ist auf Nutzer beschränkt, die als 'customer' im Profil typisiert sind.
+    GET-Anfragen unterstützen ETag (304, wenn sich nichts geändert hat).
+    Die Liste wird von `ReviewValuesSerializer` direkt aus `.values()`-Zeilen aufgebaut.
+    Mit `?fields=` werden nur die angegebenen Felder geliefert und geladen.
     """    
-    queryset = Review.objects.all()
+    queryset = Review.objects.order_by("-updated_at", "-id")
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
+    pagination_class = ReviewPagination
 
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["business_user_id", "reviewer_id"]
-    ordering = ["updated_at", "rating"]
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        business_user_id = request.query_params.get("business_user_id")
+        if isinstance(response.data, dict) and business_user_id and business_user_id.isdigit():
+            summary = BusinessRatingSummary.objects.filter(business_user_id=business_user_id).first()
+            response.data["rating_summary"] = (
+                BusinessRatingSummarySerializer(summary).data
+                if summary
+                else BusinessRatingSummarySerializer.empty()
+            )
+        return response
 
     def perform_create(self, serializer):
         user = self.request.user
-        if user.profile.type != "customer":
+        if get_user_type(self.request) != "customer":
             raise PermissionDenied(
                 {"detail": "Nur Kunden können Bewertungen erstellen."}
             )
         serializer.save(reviewer=user)
 
 
-class ReviewDetailView(RetrieveUpdateDestroyAPIView):
+class ReviewDetailView(SparseQuerysetMixin, SerializeTimingMixin, RetrieveUpdateDestroyAPIView):
     """
     API-Endpoint für den Zugriff auf spezifische Bewertungen und deren Bearbeitung oder Löschung.
     - `GET`: Ruft eine spezifische Bewertung ab.
     - `PATCH`: Erlaubt die Aktualisierung einer Bewertung, sofern der Nutzer der ursprüngliche Verfasser oder ein Admin ist.
     - `DELETE`: Erlaubt das Löschen einer Bewertung unter denselben Bedingungen.
-    Zugriff ist auf authentifizierte Nutzer beschränkt.
+    Zugriff ist auf authentifizierte Nutzer beschränkt. `GET` unterstützt `?fields=`.
     """    
     permission_classes = [IsAuthenticated]
     queryset = Review.objects.all()
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from reviews.api.models import BusinessRatingSummary, Review
+
+
+class Command(BaseCommand):
+    help = "Recomputes the rating summaries of all business users from their reviews."
+
+    def handle(self, *args, **options):
+        business_user_ids = set(
+            Review.objects.values_list("business_user_id", flat=True).distinct()
+        )
+        business_user_ids |= set(
+            BusinessRatingSummary.objects.values_list("business_user_id", flat=True)
+        )
+        BusinessRatingSummary.objects.refresh(business_user_ids)
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(business_user_ids)} rating summaries rebuilt.")
+        )
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def build_rating_summaries(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    BusinessRatingSummary = apps.get_model("reviews", "BusinessRatingSummary")
+    rows = (
+        Review.objects.values("business_user_id")
+        .annotate(
+            review_count=Count("id"),
+            rating_sum=Sum("rating"),
+            **{
+                f"rating_{rating}_count": Count("id", filter=Q(rating=rating))
+                for rating in range(1, 6)
+            },
+        )
+        .order_by()
+    )
+    BusinessRatingSummary.objects.bulk_create(
+        BusinessRatingSummary(average_rating=row["rating_sum"] / row["review_count"], **row)
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("reviews", "0002_review_review_business_updated_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BusinessRatingSummary",
+            fields=[
+                (
+                    "business_user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating_summary",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("rating_sum", models.PositiveIntegerField(default=0)),
+                ("average_rating", models.FloatField(default=0)),
+                ("rating_1_count", models.PositiveIntegerField(default=0)),
+                ("rating_2_count", models.PositiveIntegerField(default=0)),
+                ("rating_3_count", models.PositiveIntegerField(default=0)),
+                ("rating_4_count", models.PositiveIntegerField(default=0)),
+                ("rating_5_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(build_rating_summaries, migrations.RunPython.noop),
+    ]
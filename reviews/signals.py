@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from reviews.api.models import BusinessRatingSummary, Review
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_business_user(sender, instance, raw=False, **kwargs):
+    """
+    Stores the persisted business user, so a review moved to another business user updates both summaries.
+    """
+    if raw or instance.pk is None:
+        return
+    instance._summary_previous_business_user_id = (
+        Review.objects.filter(pk=instance.pk).values_list("business_user_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_rating_summary(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    business_user_ids = {instance.business_user_id}
+    previous_business_user_id = getattr(instance, "_summary_previous_business_user_id", None)
+    if previous_business_user_id:
+        business_user_ids.add(previous_business_user_id)
+    BusinessRatingSummary.objects.refresh(business_user_ids)
@@ -1,3 +1,163 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from profiles.api.models import UserProfile
+from reviews.api.models import BusinessRatingSummary, Review
 
-# Create your tests here.
+
+def create_user(username, type):
+    user = User.objects.create_user(username=username, password="secret")
+    UserProfile.objects.create(user=user, type=type)
+    return user
+
+
+class BusinessRatingSummaryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_user("business", "business")
+        cls.other_business = create_user("other", "business")
+        cls.customers = [create_user(f"customer{index}", "customer") for index in range(3)]
+
+    def review(self, reviewer, rating, business_user=None):
+        return Review.objects.create(
+            business_user=business_user or self.business,
+            reviewer=reviewer,
+            rating=rating,
+            description="Text",
+        )
+
+    def test_summary_follows_create_update_and_delete(self):
+        self.review(self.customers[0], 5)
+        review = self.review(self.customers[1], 2)
+
+        summary = BusinessRatingSummary.objects.get(business_user=self.business)
+        self.assertEqual(summary.review_count, 2)
+        self.assertEqual(summary.rating_sum, 7)
+        self.assertEqual(summary.average_rating, 3.5)
+        self.assertEqual(summary.histogram, {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1})
+
+        review.rating = 4
+        review.save()
+        summary.refresh_from_db()
+        self.assertEqual(summary.average_rating, 4.5)
+        self.assertEqual(summary.histogram["2"], 0)
+
+        review.delete()
+        summary.refresh_from_db()
+        self.assertEqual(summary.review_count, 1)
+
+    def test_review_moved_to_other_business_user(self):
+        review = self.review(self.customers[0], 3)
+        review.business_user = self.other_business
+        review.save()
+
+        self.assertFalse(BusinessRatingSummary.objects.filter(business_user=self.business).exists())
+        self.assertEqual(
+            BusinessRatingSummary.objects.get(business_user=self.other_business).review_count, 1
+        )
+
+    def test_summary_on_paginated_review_list(self):
+        self.review(self.customers[0], 4)
+        self.review(self.customers[1], 5)
+        self.client.force_authenticate(self.customers[2])
+
+        response = self.client.get(
+            reverse("review-list-create"),
+            {"business_user_id": self.business.pk, "page_size": 10},
+        )
+        self.assertEqual(
+            response.data["rating_summary"],
+            {
+                "review_count": 2,
+                "average_rating": 4.5,
+                "histogram": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1},
+            },
+        )
+
+        response = self.client.get(reverse("review-list-create"), {"business_user_id": self.business.pk})
+        self.assertIsInstance(response.data, list)
+
+    def test_summary_on_business_profile_list(self):
+        self.review(self.customers[0], 3)
+        self.client.force_authenticate(self.customers[0])
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("business-profiles-list"))
+
+        summaries = {profile["user"]["pk"]: profile["rating_summary"] for profile in response.data}
+        self.assertEqual(summaries[self.business.pk]["average_rating"], 3.0)
+        self.assertEqual(summaries[self.other_business.pk]["review_count"], 0)
+
+
+class ReviewListOrderingTests(APITestCase):
+    def test_pages_list_every_review_once_newest_first(self):
+        business = create_user("business", "business")
+        customers = [create_user(f"customer{index}", "customer") for index in range(5)]
+        reviews = [
+            Review.objects.create(business_user=business, reviewer=customer, rating=3, description="Text")
+            for customer in customers
+        ]
+        Review.objects.update(updated_at=reviews[0].updated_at)
+        self.client.force_authenticate(customers[0])
+
+        ids = []
+        for page in (1, 2, 3):
+            response = self.client.get(reverse("review-list-create"), {"page_size": 2, "page": page})
+            ids += [review["id"] for review in response.data["results"]]
+        self.assertEqual(ids, sorted((review.pk for review in reviews), reverse=True))
+
+
+class AsyncReviewListTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_user("business", "business")
+        cls.other_business = create_user("other", "business")
+        cls.customers = [create_user(f"customer{index}", "customer") for index in range(3)]
+
+    def review(self, reviewer, rating, business_user=None):
+        return Review.objects.create(
+            business_user=business_user or self.business,
+            reviewer=reviewer,
+            rating=rating,
+            description="Text",
+        )
+
+    def test_review_list_matches_sync_view(self):
+        self.review(self.customers[0], 4)
+        self.review(self.customers[1], 2)
+        self.review(self.customers[2], 5, business_user=self.other_business)
+        token = Token.objects.create(user=self.customers[0])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        for params in (
+            {},
+            {"business_user_id": self.business.pk, "page_size": 1, "page": 2},
+            {"reviewer_id": self.customers[2].pk},
+            {"business_user_id": "abc"},
+        ):
+            expected = self.client.get(reverse("review-list-create"), params)
+            response = self.client.get(reverse("async-review-list"), params)
+            self.assertEqual(response.status_code, expected.status_code)
+            self.assertEqual(
+                response.content.replace(b"/api/async/", b"/api/"), expected.content
+            )
+
+    def test_sparse_fields_match_sync_view(self):
+        self.review(self.customers[0], 4)
+        token = Token.objects.create(user=self.customers[0])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        params = {"fields": "rating,business_user"}
+        expected = self.client.get(reverse("review-list-create"), params)
+        self.assertEqual(expected.data, [{"business_user": self.business.pk, "rating": 4}])
+        response = self.client.get(reverse("async-review-list"), params)
+        self.assertEqual(response.content, expected.content)
+
+    def test_review_list_requires_authentication(self):
+        for credentials in ({}, {"HTTP_AUTHORIZATION": "Token invalid"}):
+            self.client.credentials(**credentials)
+            expected = self.client.get(reverse("review-list-create"))
+            response = self.client.get(reverse("async-review-list"))
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.content, expected.content)
+            self.assertEqual(response["WWW-Authenticate"], expected["WWW-Authenticate"])
@@ -0,0 +1,25 @@
+from django.contrib import admin
+from django.utils import timezone
+from .api.models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "run_after", "locked_by", "finished_at")
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+    ordering = ("-created_at",)
+    actions = ["requeue"]
+
+    @admin.action(description="Queue selected tasks again")
+    def requeue(self, request, queryset):
+        now = timezone.now()
+        queryset.exclude(status=Task.RUNNING).update(
+            status=Task.QUEUED,
+            attempts=0,
+            run_after=now,
+            locked_by="",
+            locked_until=None,
+            finished_at=None,
+            updated_at=now,
+        )
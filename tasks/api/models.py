@@ -0,0 +1,107 @@
+from django.db import models
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+
+class TaskQuerySet(models.QuerySet):
+    def claimable(self, now):
+        """
+        Queued tasks that are due, and running tasks whose worker let the lease expire.
+        """
+        return self.filter(
+            Q(status=Task.QUEUED, run_after__lte=now)
+            | Q(status=Task.RUNNING, locked_until__lt=now)
+        )
+
+    def claim(self, worker, lease_until, limit=1):
+        """
+        Marks up to `limit` due tasks as running for `worker` and returns them.
+        Each task is taken with a conditional UPDATE, so concurrent workers never claim the same task
+        and no row locks or broker are needed.
+        """
+        now = timezone.now()
+        candidates = list(
+            self.claimable(now).order_by("run_after", "pk").values_list("pk", flat=True)[:limit]
+        )
+        claimed = [
+            pk
+            for pk in candidates
+            if self.claimable(now)
+            .filter(pk=pk)
+            .update(
+                status=Task.RUNNING,
+                locked_by=worker,
+                locked_until=lease_until,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+        ]
+        return list(self.filter(pk__in=claimed).order_by("run_after", "pk"))
+
+    def stats(self):
+        """
+        Queue depth per status and task name, the number of due tasks and the age of the oldest one.
+        """
+        now = timezone.now()
+        due = Q(status=Task.QUEUED, run_after__lte=now)
+        summary = self.aggregate(
+            due=Count("pk", filter=due), oldest_due=Min("run_after", filter=due)
+        )
+        totals = {status: 0 for status, _ in Task.STATUS_CHOICES}
+        by_name = {}
+        for row in self.order_by().values("name", "status").annotate(count=Count("pk")):
+            totals[row["status"]] += row["count"]
+            counts = by_name.setdefault(row["name"], {status: 0 for status in totals})
+            counts[row["status"]] = row["count"]
+        oldest_due = summary["oldest_due"]
+        return {
+            **totals,
+            "due": summary["due"],
+            "oldest_due_age_seconds": (
+                round((now - oldest_due).total_seconds(), 3) if oldest_due else None
+            ),
+            "tasks": dict(sorted(by_name.items())),
+        }
+
+
+class Task(models.Model):
+    """
+    A unit of deferred work executed by `run_task_worker`. `name` refers to a function registered
+    with `tasks.queue.task`, which is called with `args` and `kwargs`.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="task_status_run_after_idx"),
+            models.Index(fields=["status", "finished_at"], name="task_status_finished_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.id} - {self.name} ({self.status})"
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import TaskQueueView
+
+urlpatterns = [
+    path("task-queue/", TaskQueueView.as_view(), name="task-queue"),
+]
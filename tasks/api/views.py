@@ -0,0 +1,15 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from tasks.api.models import Task
+
+
+class TaskQueueView(APIView):
+    """
+    Admin-only view of the background task queue: the number of tasks per status and task name,
+    how many queued tasks are due and how long the oldest due task has been waiting.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(Task.objects.stats())
@@ -0,0 +1,54 @@
+import signal
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from tasks.queue import default_worker_id, get_setting, purge_finished, run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs queued background tasks. Any number of workers can run in parallel, "
+        "each task is claimed by exactly one of them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run all due tasks and exit instead of polling for new ones.",
+        )
+        parser.add_argument(
+            "--worker-id",
+            default=None,
+            help="Name stored on claimed tasks. Defaults to <hostname>:<pid>.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=None,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        worker = options["worker_id"] or default_worker_id()
+        poll_interval = options["poll_interval"] or get_setting("POLL_INTERVAL")
+        self.stopping = False
+
+        if options["once"]:
+            count = run_pending(worker)
+            self.stdout.write(self.style.SUCCESS(f"{count} tasks run."))
+            return
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.stdout.write(f"Task worker {worker} started.")
+        while not self.stopping:
+            close_old_connections()
+            # One batch at a time, so a stop signal is honoured between batches.
+            if not run_pending(worker, limit=get_setting("BATCH_SIZE")):
+                purge_finished()
+                time.sleep(poll_interval)
+        self.stdout.write(f"Task worker {worker} stopped.")
+
+    def stop(self, signum, frame):
+        self.stopping = True
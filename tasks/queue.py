@@ -0,0 +1,150 @@
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from tasks.api.models import Task
+
+DEFAULTS = {
+    "EAGER": False,
+    "MAX_ATTEMPTS": 5,
+    "RETRY_DELAY": 10,
+    "MAX_RETRY_DELAY": 60 * 60,
+    "LEASE": 5 * 60,
+    "BATCH_SIZE": 10,
+    "POLL_INTERVAL": 1,
+    "RETENTION": 24 * 60 * 60,
+}
+
+logger = logging.getLogger(__name__)
+
+# Task functions by name, filled by the `task` decorator when their modules are imported.
+registry = {}
+
+
+def get_setting(name):
+    return getattr(settings, "TASK_QUEUE", {}).get(name, DEFAULTS[name])
+
+
+def task(name=None, max_attempts=None):
+    """
+    Registers a function as a task. The function gets an `enqueue(*args, **kwargs)` attribute that queues
+    a call with JSON-serializable arguments:
+
+        @task()
+        def release_files(names): ...
+
+        release_files.enqueue([name])
+    """
+
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        registry[task_name] = func
+        func.task_name = task_name
+        func.enqueue = lambda *args, **kwargs: enqueue(
+            task_name, args, kwargs, max_attempts=max_attempts
+        )
+        return func
+
+    return decorator
+
+
+def enqueue(name, args=(), kwargs=None, delay=0, max_attempts=None):
+    """
+    Queues a call of the task `name`. The task row is written in the current transaction, so the task
+    only becomes visible to workers if the surrounding write commits. With `TASK_QUEUE["EAGER"]` the task
+    runs immediately instead and nothing is stored.
+    """
+    if name not in registry:
+        raise LookupError(f"Unknown task {name!r}.")
+    if get_setting("EAGER"):
+        registry[name](*args, **(kwargs or {}))
+        return None
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs or {},
+        run_after=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or get_setting("MAX_ATTEMPTS"),
+    )
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff: RETRY_DELAY seconds after the first failure, doubling up to MAX_RETRY_DELAY.
+    """
+    return min(get_setting("RETRY_DELAY") * 2 ** (attempts - 1), get_setting("MAX_RETRY_DELAY"))
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_task(task):
+    """
+    Runs a claimed task in its own transaction. Failed tasks are queued again with backoff until
+    `max_attempts` is reached and then marked as failed. Returns whether the task succeeded.
+    """
+    owned = Task.objects.filter(pk=task.pk, status=Task.RUNNING, locked_by=task.locked_by)
+    try:
+        func = registry.get(task.name)
+        if func is None:
+            raise LookupError(f"Unknown task {task.name!r}.")
+        with transaction.atomic():
+            func(*task.args, **task.kwargs)
+    except Exception:
+        logger.exception("Task %s (%s) failed on attempt %s.", task.pk, task.name, task.attempts)
+        now = timezone.now()
+        if task.attempts < task.max_attempts:
+            owned.update(
+                status=Task.QUEUED,
+                run_after=now + timedelta(seconds=retry_delay(task.attempts)),
+                locked_by="",
+                locked_until=None,
+                last_error=traceback.format_exc(),
+                updated_at=now,
+            )
+        else:
+            owned.update(
+                status=Task.FAILED,
+                locked_until=None,
+                last_error=traceback.format_exc(),
+                updated_at=now,
+                finished_at=now,
+            )
+        return False
+
+    now = timezone.now()
+    owned.update(status=Task.DONE, locked_until=None, updated_at=now, finished_at=now)
+    return True
+
+
+def run_pending(worker=None, limit=None):
+    """
+    Claims and runs due tasks until none are left or `limit` tasks ran. Returns the number of tasks run.
+    """
+    worker = worker or default_worker_id()
+    batch_size = get_setting("BATCH_SIZE")
+    count = 0
+    while limit is None or count < limit:
+        size = batch_size if limit is None else min(batch_size, limit - count)
+        lease_until = timezone.now() + timedelta(seconds=get_setting("LEASE"))
+        tasks = Task.objects.claim(worker, lease_until, limit=size)
+        if not tasks:
+            break
+        for task in tasks:
+            run_task(task)
+            count += 1
+    return count
+
+
+def purge_finished():
+    """
+    Deletes completed tasks older than RETENTION seconds. Failed tasks are kept for inspection.
+    """
+    cutoff = timezone.now() - timedelta(seconds=get_setting("RETENTION"))
+    deleted, _ = Task.objects.filter(status=Task.DONE, finished_at__lt=cutoff).delete()
+    return deleted
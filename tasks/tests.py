@@ -0,0 +1,116 @@
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from tasks.api.models import Task
+from tasks.queue import enqueue, run_pending, task
+
+calls = []
+
+
+@task()
+def record(value, suffix=""):
+    calls.append(f"{value}{suffix}")
+
+
+@task(max_attempts=2)
+def fail(message):
+    raise ValueError(message)
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueued_tasks_run_once_with_their_arguments(self):
+        record.enqueue("a", suffix="!")
+        enqueue(record.task_name, ["b"])
+
+        self.assertEqual(calls, [])
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(calls, ["a!", "b"])
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(Task.objects.filter(status=Task.DONE).count(), 2)
+
+    def test_tasks_of_rolled_back_transactions_are_discarded(self):
+        with transaction.atomic():
+            record.enqueue("a")
+            transaction.set_rollback(True)
+        self.assertFalse(Task.objects.exists())
+
+    def test_delayed_tasks_wait_until_due(self):
+        enqueue(record.task_name, ["later"], delay=60)
+        self.assertEqual(run_pending(), 0)
+        Task.objects.update(run_after=timezone.now())
+        self.assertEqual(run_pending(), 1)
+
+    def test_failures_are_retried_with_backoff_then_marked_failed(self):
+        fail.enqueue("boom")
+        started = timezone.now()
+
+        with self.assertLogs("tasks.queue", "ERROR"):
+            self.assertEqual(run_pending(), 1)
+        queued = Task.objects.get()
+        self.assertEqual(queued.status, Task.QUEUED)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn("ValueError: boom", queued.last_error)
+        self.assertGreaterEqual(queued.run_after, started + timedelta(seconds=10))
+
+        Task.objects.update(run_after=timezone.now())
+        with self.assertLogs("tasks.queue", "ERROR"):
+            run_pending()
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+        self.assertEqual(run_pending(), 0)
+
+    def test_a_task_is_claimed_by_one_worker_only(self):
+        record.enqueue("a")
+        lease_until = timezone.now() + timedelta(minutes=5)
+        self.assertEqual(len(Task.objects.claim("worker-1", lease_until)), 1)
+        self.assertEqual(Task.objects.claim("worker-2", lease_until), [])
+
+    def test_expired_leases_are_claimed_again(self):
+        record.enqueue("a")
+        Task.objects.claim("crashed", timezone.now() - timedelta(seconds=1))
+        self.assertEqual(run_pending("worker"), 1)
+        self.assertEqual(calls, ["a"])
+        self.assertEqual(Task.objects.get().attempts, 2)
+
+    @override_settings(TASK_QUEUE={"EAGER": True})
+    def test_eager_mode_runs_inline(self):
+        record.enqueue("a")
+        self.assertEqual(calls, ["a"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_unknown_tasks_cannot_be_queued(self):
+        with self.assertRaises(LookupError):
+            enqueue("tasks.tests.missing")
+
+    def test_worker_command_runs_due_tasks(self):
+        record.enqueue("a")
+        out = StringIO()
+        call_command("run_task_worker", "--once", stdout=out)
+        self.assertIn("1 tasks run", out.getvalue())
+        self.assertEqual(calls, ["a"])
+
+
+class TaskQueueViewTests(APITestCase):
+    def test_reports_queue_depth_to_admins(self):
+        record.enqueue("a")
+        record.enqueue("b")
+        enqueue(fail.task_name, ["x"], delay=60)
+
+        self.client.force_authenticate(User.objects.create_user(username="user"))
+        self.assertEqual(self.client.get(reverse("task-queue")).status_code, 403)
+
+        self.client.force_authenticate(User.objects.create_superuser(username="admin"))
+        response = self.client.get(reverse("task-queue"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["queued"], 3)
+        self.assertEqual(response.data["due"], 2)
+        self.assertEqual(response.data["tasks"][record.task_name]["queued"], 2)
+        self.assertIsNotNone(response.data["oldest_due_age_seconds"])
@@ -0,0 +1,116 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+DEFAULTS = {
+    "LOCAL_TTL": 10,
+    "LOCAL_MAX_SIZE": 1024,
+    "SHARED_TTL": 300,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "AUTH_TOKEN_CACHE", {}).get(name, DEFAULTS[name])
+
+
+class LocalTTLCache:
+    """
+    A small thread-safe in-process LRU cache whose entries expire after `ttl` seconds.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + get_setting("LOCAL_TTL"), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > get_setting("LOCAL_MAX_SIZE"):
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_cache = LocalTTLCache()
+
+
+def cache_key(token_key):
+    return "auth-token:" + hashlib.sha256(token_key.encode()).hexdigest()
+
+
+def invalidate_token(token_key):
+    key = cache_key(token_key)
+    local_cache.delete(key)
+    cache.delete(key)
+
+
+def invalidate_user(user_id):
+    for token_key in Token.objects.filter(user_id=user_id).values_list("key", flat=True):
+        invalidate_token(token_key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that resolves token → user → profile from an in-process LRU cache with a short TTL,
+    backed by Django's cache. On a miss the token, the user and the profile are loaded with one query.
+    Entries are dropped when the token is deleted or the user or profile changes (see `user_auth_app.signals`);
+    other processes see such changes once their local entry expires after `AUTH_TOKEN_CACHE["LOCAL_TTL"]` seconds.
+    Cached tokens are stored pickled, so every request works on its own copy of the user.
+    """
+
+    def authenticate_credentials(self, key):
+        token = self.get_cached_token(key)
+        if token is None:
+            try:
+                token = Token.objects.select_related("user", "user__profile").get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            self.cache_token(token)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
+
+    def get_cached_token(self, key):
+        hashed_key = cache_key(key)
+        data = local_cache.get(hashed_key)
+        if data is None:
+            data = cache.get(hashed_key)
+            if data is None:
+                return None
+            local_cache.set(hashed_key, data)
+        return pickle.loads(data)
+
+    def cache_token(self, token):
+        hashed_key = cache_key(token.key)
+        data = pickle.dumps(token)
+        cache.set(hashed_key, data, timeout=get_setting("SHARED_TTL"))
+        local_cache.set(hashed_key, data)
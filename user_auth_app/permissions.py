@@ -1,13 +1,44 @@
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
 
+
+def get_user_profile(request):
+    """
+    Returns the profile of the authenticated user or None. The profile is resolved once per request
+    and stored as `request.user_profile`; `CachedTokenAuthentication` already loads it together with the token.
+    """
+    try:
+        return request.user_profile
+    except AttributeError:
+        pass
+
+    profile = None
+    if request.user and request.user.is_authenticated:
+        try:
+            profile = request.user.profile
+        except ObjectDoesNotExist:
+            profile = None
+
+    request.user_profile = profile
+    return profile
+
+
+def get_user_type(request):
+    """
+    Returns the profile type ('customer' or 'business') of the authenticated user or None.
+    """
+    profile = get_user_profile(request)
+    return profile.type if profile else None
+
+
 class OrderPermission(BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
         
         if request.method == "POST":
-            return getattr(request.user.profile, "type", None) == "customer"
+            return get_user_type(request) == "customer"
 
         return True
 
@@ -17,7 +48,7 @@ class OrderPermission(BasePermission):
             return True
         
         if request.method == 'PATCH':
-            return getattr(request.user.profile, "type", None) == 'business'
+            return get_user_type(request) == 'business'
         
         if request.method == 'DELETE':
             return request.user.is_staff or obj.customer_user == request.user
@@ -29,12 +60,10 @@ class IsBusinessUser(BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        profile = getattr(request.user, 'profile', None)
-        return bool(profile and profile.type == "business")
+        return get_user_type(request) == "business"
 
 class IsCustomerUser(BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
-        profile = getattr(request.user, 'profile', None)
-        return bool(profile and profile.type == "customer") 
\ No newline at end of file
+        return get_user_type(request) == "customer"
@@ -0,0 +1,26 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from profiles.api.models import UserProfile
+from .authentication import invalidate_token, invalidate_user
+
+
+@receiver(post_delete, sender=Token)
+def drop_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def drop_tokens_of_changed_user(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def drop_tokens_of_changed_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_user(instance.user_id)
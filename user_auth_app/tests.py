@@ -1,3 +1,97 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from base import counters
+from profiles.api.models import UserProfile
+from user_auth_app.authentication import local_cache
 
-# Create your tests here.
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.user = User.objects.create_user(username="customer", password="secret")
+        self.profile = UserProfile.objects.create(user=self.user, type="customer")
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        counters.reconcile()
+
+    def test_warm_cache_runs_no_auth_queries(self):
+        self.client.get(reverse("base-info"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("base-info"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_shared_cache_fills_local_cache(self):
+        self.client.get(reverse("base-info"))
+        local_cache.clear()
+        with self.assertNumQueries(0):
+            self.client.get(reverse("base-info"))
+
+    def test_profile_is_loaded_with_the_token(self):
+        self.client.get(reverse("base-info"))
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse("order-create"), {}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(reverse("base-info"))
+        self.token.delete()
+        response = self.client.get(reverse("base-info"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_inactive_user_is_rejected(self):
+        self.client.get(reverse("base-info"))
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse("base-info"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_profile_type_change_is_picked_up(self):
+        self.client.get(reverse("base-info"))
+        self.profile.type = "business"
+        self.profile.save()
+
+        response = self.client.post(reverse("order-create"), {}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        response = self.client.get(reverse("base-info"))
+        self.assertEqual(response.status_code, 401)
+
+
+class UserRoleResolverTests(APITestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username="customer", password="secret")
+        UserProfile.objects.create(user=self.customer, type="customer")
+        self.business = User.objects.create_user(username="business", password="secret")
+        UserProfile.objects.create(user=self.business, type="business")
+
+    def profile_queries(self, queries):
+        return [query for query in queries if 'FROM "profiles_userprofile"' in query["sql"]]
+
+    def test_review_creation_loads_profile_once(self):
+        self.client.force_authenticate(User.objects.get(pk=self.customer.pk))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("review-list-create"),
+                {"business_user": self.business.pk, "rating": 5, "description": "Top"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.profile_queries(queries)), 1)
+
+    def test_user_without_profile_has_no_role(self):
+        admin = User.objects.create_user(username="admin", password="secret")
+        self.client.force_authenticate(admin)
+        response = self.client.post(reverse("order-create"), {}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_anonymous_user_has_no_role(self):
+        response = self.client.post(reverse("offer-list-create"), {}, format="json")
+        self.assertEqual(response.status_code, 401)